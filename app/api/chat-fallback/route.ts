@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { characters } from '@/lib/characters';
+import fallbackData from '@/public/data/fallback-responses.json';
 
 export async function OPTIONS(request: NextRequest) {
   return new NextResponse(null, {
@@ -34,58 +35,24 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    // Generate fallback responses based on character personality
-    const fallbackResponses = {
-      'james-blackwood': [
-        "I... I don't know what you're talking about. Victoria and I had our differences, but I would never hurt her.",
-        "The family business has been struggling, but that doesn't make me a killer.",
-        "I was in my study all night. You can ask the staff if you don't believe me.",
-        "Victoria always had secrets. Maybe you should look into her business dealings instead."
-      ],
-      'marcus-reynolds': [
-        "I have nothing to hide. Victoria and I had a professional relationship, nothing more.",
-        "The company's financial troubles are well-documented. I had no reason to harm Victoria.",
-        "I was working late in the office. The security cameras will confirm that.",
-        "Victoria was a shrewd businesswoman. Her enemies were in the corporate world, not here."
-      ],
-      'elena-rodriguez': [
-        "As Victoria's doctor, I can only say that she was in good health until... until this happened.",
-        "Medical confidentiality prevents me from discussing Victoria's condition in detail.",
-        "I was at the hospital all night. You can verify that with the staff.",
-        "Victoria trusted me with her health. I would never betray that trust."
-      ],
-      'lily-chen': [
-        "Aunt Victoria was always kind to me. I can't imagine who would want to hurt her.",
-        "I was working on my art in the studio. Art helps me process difficult emotions.",
-        "Victoria understood my struggles. She was one of the few people who did.",
-        "The family dynamics were complicated, but I never wished harm on anyone."
-      ],
-      'thompson-butler': [
-        "I've served the Blackwood family for decades. I would never harm Miss Victoria.",
-        "I was in the kitchen preparing for the next day. The staff can confirm this.",
-        "Miss Victoria was like family to me. This whole situation is devastating.",
-        "I know the house better than anyone. If there were any irregularities, I would have noticed."
-      ]
-    };
+    // Character reply tables and topic rules are shared with the Python
+    // integration's offline responder (public/data/fallback-responses.json)
+    const fallbackResponses: Record<string, string[]> = fallbackData.characters;
 
     // Get character responses
-    const responses = fallbackResponses[character as keyof typeof fallbackResponses] || [
-      "I'm not sure what you're asking about.",
-      "That's an interesting question.",
-      "I don't have much to say about that.",
-      "You'll have to ask someone else about that."
-    ];
+    const responses = fallbackResponses[character] || fallbackData.default;
 
     // Select response based on message content or random
     let selectedResponse;
     const messageLower = message.toLowerCase();
-    
-    if (messageLower.includes('alibi') || messageLower.includes('where were you')) {
-      selectedResponse = responses.find(r => r.includes('night') || r.includes('evening')) || responses[0];
-    } else if (messageLower.includes('motive') || messageLower.includes('why')) {
-      selectedResponse = responses.find(r => r.includes('reason') || r.includes('never')) || responses[1];
-    } else if (messageLower.includes('relationship') || messageLower.includes('victoria')) {
-      selectedResponse = responses.find(r => r.includes('Victoria')) || responses[2];
+    const topic = fallbackData.topics.find(t =>
+      t.triggers.some(trigger => messageLower.includes(trigger))
+    );
+
+    if (topic) {
+      selectedResponse = responses.find(r =>
+        topic.replyKeywords.some(keyword => r.includes(keyword))
+      ) || responses[topic.defaultIndex];
     } else {
       // Random response
       selectedResponse = responses[Math.floor(Math.random() * responses.length)];
@@ -0,0 +1,114 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { ClaudeAPI } from '@/lib/api';
+import { characters } from '@/lib/characters';
+import { Message } from '@/lib/types';
+
+const CORS_HEADERS = {
+  'Access-Control-Allow-Origin': '*',
+  'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+  'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With',
+  'Access-Control-Allow-Credentials': 'false',
+};
+
+const MAX_BATCH_SIZE = 20;
+
+interface BatchItem {
+  character: string;
+  message: string;
+  conversationHistory?: Message[];
+}
+
+interface BatchResult {
+  success: boolean;
+  response?: string;
+  error?: string;
+}
+
+export async function OPTIONS(request: NextRequest) {
+  return new NextResponse(null, { status: 200, headers: CORS_HEADERS });
+}
+
+async function answer(item: BatchItem): Promise<BatchResult> {
+  const selectedCharacter = characters.find(c => c.id === item.character);
+  if (!selectedCharacter) {
+    return { success: false, error: 'Character not found' };
+  }
+
+  const response = await ClaudeAPI.generateCharacterResponse(
+    selectedCharacter,
+    item.message,
+    item.conversationHistory || [],
+    {
+      currentTopic: 'general',
+      investigationProgress: 0,
+      relationshipScore: 0,
+      revealedInformation: []
+    }
+  );
+
+  const content = response.data?.choices?.[0]?.message?.content;
+  return response.success && content
+    ? { success: true, response: content }
+    : { success: false, error: 'Failed to generate response' };
+}
+
+/**
+ * Answer up to MAX_BATCH_SIZE chat requests in one HTTP call.
+ * Body: { requests: [{ character, message, conversationHistory }] }
+ * Response: newline-delimited JSON, one `{ index, success, response | error }`
+ * line per item, written as soon as that item finishes. Identical items
+ * in a batch share a single upstream call.
+ */
+export async function POST(request: NextRequest) {
+  try {
+    const { requests } = await request.json();
+
+    if (!Array.isArray(requests) || requests.length === 0 || requests.length > MAX_BATCH_SIZE) {
+      return NextResponse.json(
+        { success: false, error: `requests must be an array of 1-${MAX_BATCH_SIZE} items` },
+        { status: 400, headers: CORS_HEADERS }
+      );
+    }
+
+    const encoder = new TextEncoder();
+    const inFlight = new Map<string, Promise<BatchResult>>();
+
+    const body = new ReadableStream({
+      async start(controller) {
+        await Promise.all(requests.map(async (item: BatchItem, index: number) => {
+          const key = JSON.stringify([
+            item.character,
+            String(item.message || '').trim().toLowerCase(),
+            item.conversationHistory || []
+          ]);
+          let pending = inFlight.get(key);
+          if (!pending) {
+            pending = answer(item).catch((error) => {
+              console.error('Batch chat item error:', error);
+              return { success: false, error: 'Internal server error' };
+            });
+            inFlight.set(key, pending);
+          }
+
+          const result = await pending;
+          controller.enqueue(encoder.encode(JSON.stringify({ index, ...result }) + '\n'));
+        }));
+        controller.close();
+      }
+    });
+
+    return new Response(body, {
+      headers: {
+        ...CORS_HEADERS,
+        'Content-Type': 'application/x-ndjson; charset=utf-8',
+        'Cache-Control': 'no-cache',
+      },
+    });
+  } catch (error) {
+    console.error('Batch chat API error:', error);
+    return NextResponse.json(
+      { success: false, error: 'Internal server error' },
+      { status: 500, headers: CORS_HEADERS }
+    );
+  }
+}
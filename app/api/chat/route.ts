@@ -1,6 +1,77 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { ClaudeAPI } from '@/lib/api';
 import { characters } from '@/lib/characters';
+import { Character, Message } from '@/lib/types';
+
+const CORS_HEADERS = {
+  'Access-Control-Allow-Origin': '*',
+  'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+  'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With',
+  'Access-Control-Allow-Credentials': 'false',
+};
+
+const DEFAULT_CONTEXT = {
+  currentTopic: 'general',
+  investigationProgress: 0,
+  relationshipScore: 0,
+  revealedInformation: []
+};
+
+/**
+ * Stream a character reply as Server-Sent Events.
+ * Emits `start` immediately, then word-sized `chunk` events, then `done`
+ * (or `error`). Clients render chunks as they arrive.
+ */
+function streamCharacterResponse(
+  character: Character,
+  message: string,
+  conversationHistory: Message[]
+): Response {
+  const encoder = new TextEncoder();
+
+  const body = new ReadableStream({
+    async start(controller) {
+      const send = (event: string, data: unknown) => {
+        controller.enqueue(encoder.encode(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`));
+      };
+
+      send('start', { character: character.id });
+
+      try {
+        const response = await ClaudeAPI.generateCharacterResponse(
+          character,
+          message,
+          conversationHistory,
+          DEFAULT_CONTEXT
+        );
+        const content = response.data?.choices?.[0]?.message?.content;
+
+        if (response.success && content) {
+          for (const chunk of content.match(/\S+\s*/g) || [content]) {
+            send('chunk', { text: chunk });
+          }
+          send('done', { success: true });
+        } else {
+          send('error', { success: false, error: 'Failed to generate response' });
+        }
+      } catch (error) {
+        console.error('Chat stream error:', error);
+        send('error', { success: false, error: 'Internal server error' });
+      }
+
+      controller.close();
+    }
+  });
+
+  return new Response(body, {
+    headers: {
+      ...CORS_HEADERS,
+      'Content-Type': 'text/event-stream; charset=utf-8',
+      'Cache-Control': 'no-cache, no-transform',
+      'Connection': 'keep-alive',
+    },
+  });
+}
 
 export async function OPTIONS(request: NextRequest) {
   return new NextResponse(null, {
@@ -16,7 +87,7 @@ export async function OPTIONS(request: NextRequest) {
 
 export async function POST(request: NextRequest) {
   try {
-    const { character, message, conversationHistory } = await request.json();
+    const { character, message, conversationHistory, stream } = await request.json();
 
     // Find the character
     const selectedCharacter = characters.find(c => c.id === character);
@@ -27,17 +98,16 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    if (stream) {
+      return streamCharacterResponse(selectedCharacter, message, conversationHistory || []);
+    }
+
     // Generate response using the existing API
     const response = await ClaudeAPI.generateCharacterResponse(
       selectedCharacter,
       message,
       conversationHistory || [],
-      {
-        currentTopic: 'general',
-        investigationProgress: 0,
-        relationshipScore: 0,
-        revealedInformation: []
-      }
+      DEFAULT_CONTEXT
     );
 
     if (response.success && response.data?.choices?.[0]?.message?.content) {
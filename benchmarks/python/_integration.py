@@ -0,0 +1,18 @@
+"""Import the blackwood_integration package from public/ for the benchmarks"""
+
+import importlib
+import logging
+import os
+import sys
+
+MODULE_NAME = "blackwood_integration"
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "public"))
+
+
+def load():
+    """Import the integration package once and silence its INFO logging"""
+    if PACKAGE_DIR not in sys.path:
+        sys.path.insert(0, PACKAGE_DIR)
+    module = importlib.import_module(MODULE_NAME)
+    logging.disable(logging.INFO)
+    return module
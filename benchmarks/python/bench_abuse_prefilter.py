@@ -0,0 +1,110 @@
+"""Benchmark: Aho-Corasick abuse pre-filter vs a naive per-phrase scan.
+
+The naive scan is a direct port of SimpleAbuseDetection.detectAbuse in
+lib/simpleAbuseDetection.ts. Both classify the same synthetic corpus and
+their verdicts are cross-checked before timings are reported.
+
+Usage: python benchmarks/python/bench_abuse_prefilter.py [--messages 100000] [--seed 7]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from _integration import load
+
+bw = load()
+
+INVESTIGATION_LINES = [
+    "Where were you at nine o'clock last night?",
+    "Tell me about the study and the locked door.",
+    "Did you see anyone near the library after dinner?",
+    "What was your relationship with Lord Blackwood?",
+    "I found a torn letter in the garden, can you explain it?",
+    "Who had access to the wine cellar keys?",
+    "Your alibi doesn't match what the butler said.",
+    "Why were the curtains drawn in the drawing room?",
+]
+
+
+def naive_classify(message, abusive, irrelevant):
+    """Per-phrase scan with the same rules as the TypeScript detector"""
+    text = message.lower().strip()
+    for phrase in abusive:
+        lower = phrase.lower()
+        if len(lower) < 10:
+            if lower in text and (text == lower or
+                                  text.startswith(lower + ' ') or
+                                  text.endswith(' ' + lower) or
+                                  (' ' + lower + ' ') in text):
+                return 'abusive', phrase
+        elif lower in text:
+            return 'abusive', phrase
+    for topic in irrelevant:
+        if topic.lower() in text:
+            return 'irrelevant', topic
+    return 'clean', None
+
+
+def build_corpus(count, abusive, irrelevant, seed):
+    """Mostly in-game questions with a share of obvious hits, like live traffic"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        line = rng.choice(INVESTIGATION_LINES)
+        roll = rng.random()
+        if roll < 0.08:
+            line = f"{line} {rng.choice(abusive)} {rng.choice(INVESTIGATION_LINES)}"
+        elif roll < 0.14:
+            line = f"{rng.choice(abusive)}!"
+        elif roll < 0.22:
+            line = f"By the way, {rng.choice(irrelevant)}?"
+        corpus.append(line)
+    return corpus
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    results = [fn(message) for message in corpus]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    prefilter = bw.AbusePrefilter.from_file()
+    build = time.perf_counter() - start
+    phrases = prefilter.matcher.phrases
+    abusive = phrases[:prefilter._abusive_count]
+    irrelevant = phrases[prefilter._abusive_count:]
+
+    corpus = build_corpus(args.messages, abusive, irrelevant, args.seed)
+    naive_time, naive = timed(lambda m: naive_classify(m, abusive, irrelevant), corpus)
+    ac_time, local = timed(prefilter.classify, corpus)
+
+    # Every decided verdict must match the TypeScript rules exactly
+    verdicts = {}
+    for (expected, _), result in zip(naive, local):
+        verdicts[result.verdict] = verdicts.get(result.verdict, 0) + 1
+        if result.verdict != 'ambiguous':
+            assert result.verdict == expected, (expected, result)
+
+    print(f"phrases: {len(phrases)}  automaton states: {len(prefilter.matcher._delta)}  "
+          f"build: {build * 1000:.1f} ms")
+    print(f"messages: {len(corpus)}  verdicts: " +
+          ", ".join(f"{k}={v}" for k, v in sorted(verdicts.items())))
+    escalated = verdicts.get('ambiguous', 0)
+    print(f"escalated to /api/abuse-detection: {escalated} ({escalated / len(corpus):.1%})")
+    print(f"{'scan':>14} {'total (s)':>10} {'per msg (us)':>13}")
+    for name, elapsed in (('naive', naive_time), ('aho-corasick', ac_time)):
+        print(f"{name:>14} {elapsed:>10.3f} {elapsed / len(corpus) * 1e6:>13.2f}")
+    print(f"speedup: {naive_time / ac_time:.1f}x")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Benchmark: coalescing of identical concurrent chat requests.
+
+Each round, --callers threads ask the same character the same question at
+once against the local stub API, first on the client's managed history and
+then on one caller-owned history per player (as SessionManager does).
+Reports upstream requests against calls made, and fails if coalescing
+records an exchange more than once in a shared history or skips it in a
+player's own history.
+
+Usage: python benchmarks/python/bench_chat_coalescing.py [--callers 8] [--rounds 5] [--latency 0.05]
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from _integration import load
+from stub_server import StubConfig, StubServer
+
+bw = load()
+
+QUESTIONS = [
+    "Where were you at nine o'clock last night?",
+    "What was your relationship with Victoria?",
+    "Who had access to the wine cellar?",
+    "Why were you arguing in the study?",
+    "What did you see in the library?",
+]
+
+
+def concurrently(callers, fn):
+    barrier = threading.Barrier(callers)
+    results = [None] * callers
+
+    def run(i):
+        barrier.wait()
+        results[i] = fn(i)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--callers', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    with StubServer(config=StubConfig(latency=args.latency)) as server:
+        config = bw.WidgetConfig(api_url=server.url)
+        client = bw.BlackwoodChatClient(config, max_connections=args.callers)
+        histories = [bw.ConversationHistory('lily-chen', client.history_policy)
+                     for _ in range(args.callers)]
+        start = time.perf_counter()
+        for n in range(args.rounds):
+            question = QUESTIONS[n % len(QUESTIONS)]
+            concurrently(args.callers, lambda i: client.chat('lily-chen', question))
+            concurrently(args.callers, lambda i: client.chat('lily-chen', question,
+                                                             history=histories[i]))
+        elapsed = time.perf_counter() - start
+        client.close()
+        upstream = server.requests.get('/api/chat', 0)
+
+    calls = 2 * args.callers * args.rounds
+    shared = len(client.history('lily-chen'))
+    owned = sorted({len(history) for history in histories})
+    print(f"{args.callers} callers x {args.rounds} rounds, {calls} chat calls in {elapsed:.2f}s")
+    print(f"  upstream requests        {upstream:>8}")
+    print(f"  coalesced                {client.single_flight.coalesced:>8}")
+    print(f"  managed history          {shared:>8} messages")
+    print(f"  per-player histories     {', '.join(map(str, owned)):>8} messages")
+    expected = 2 * args.rounds
+    if shared != expected or owned != [expected]:
+        print(f"FAIL: expected {expected} messages in every history")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Benchmark: Resilience.call through an outage and back.
+
+A simulated endpoint fails with OSError for --outage calls, then recovers.
+Reports how many calls reached the endpoint vs were refused by the open
+breaker, the cost of a refused call, and how many calls it takes to close
+again after reset_timeout. The half-open probe that follows the outage
+raises a non-retryable RuntimeError (as a closed connection pool does);
+fails if that leaves the breaker refusing calls.
+
+Usage: python benchmarks/python/bench_circuit_breaker.py [--outage 100000] [--reset-timeout 0.2]
+"""
+
+import argparse
+import sys
+import time
+
+from _integration import load
+
+bw = load()
+
+
+class Endpoint:
+    def __init__(self):
+        self.down = True
+        self.calls = 0
+        self.raise_next = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.raise_next is not None:
+            error, self.raise_next = self.raise_next, None
+            raise error
+        if self.down:
+            raise OSError("connection refused")
+        return 'ok'
+
+
+def call(resilience, endpoint, policy):
+    try:
+        return resilience.call('http://stub/api/chat', endpoint, policy)
+    except bw.CircuitOpenError:
+        return 'refused'
+    except (OSError, RuntimeError):
+        return 'error'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--outage', type=int, default=100_000)
+    parser.add_argument('--reset-timeout', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    resilience = bw.Resilience(failure_threshold=5, reset_timeout=args.reset_timeout)
+    policy = bw.RetryPolicy(max_retries=0, base_delay=0.0)
+    endpoint = Endpoint()
+
+    start = time.perf_counter()
+    outcomes = [call(resilience, endpoint, policy) for _ in range(args.outage)]
+    elapsed = time.perf_counter() - start
+    refused = outcomes.count('refused')
+    print(f"{args.outage:,} calls during the outage in {elapsed * 1000:.1f} ms")
+    print(f"  reached the endpoint     {endpoint.calls:>10,}")
+    print(f"  refused by the breaker   {refused:>10,}")
+    print(f"  per call                 {elapsed / args.outage * 1e6:>10.2f} us")
+
+    # Half-open probe dies with a non-retryable error, then the backend is back
+    time.sleep(args.reset_timeout)
+    endpoint.down = False
+    endpoint.raise_next = RuntimeError("Connection pool is closed")
+    probe = call(resilience, endpoint, policy)
+    recovered = None
+    for n in range(1, 11):
+        if call(resilience, endpoint, policy) == 'ok':
+            recovered = n
+            break
+    state = resilience.breaker('http://stub/api/chat').state.value
+    print(f"  probe outcome            {probe:>10}")
+    print(f"  calls to recover         {recovered if recovered else 'never':>10}")
+    print(f"  breaker state            {state:>10}")
+    if probe != 'error' or recovered != 1 or state != 'closed':
+        print("FAIL: a non-retryable error during the half-open probe left the breaker stuck")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
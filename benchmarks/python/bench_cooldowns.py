@@ -0,0 +1,129 @@
+"""Benchmark: CooldownManager with 100k concurrent player sessions.
+
+Drives a simulated clock: every simulated second a share of the players
+send a message (allow), a few of those messages are abusive (set_offline),
+and the game polls for expiries. Reports allow() throughput, poll cost per
+call for the timing wheel against a full sweep over every bucket and
+cooldown (what dicts of expiry times checked lazily, as in
+lib/characterStatus.ts, need to stay bounded), and memory while busy and
+once every player has gone quiet.
+
+Usage: python benchmarks/python/bench_cooldowns.py [--sessions 100000] [--seconds 30]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from _integration import load
+
+bw = load()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def sweep(expiries, now):
+    """Baseline: scan every bucket and cooldown expiry time"""
+    expired = [key for key, until in expiries.items() if until <= now]
+    for key in expired:
+        del expiries[key]
+    return len(expired)
+
+
+def simulate(args, track_memory=False):
+    rng = random.Random(args.seed)
+    clock = Clock()
+    manager = bw.CooldownManager(rate=0.5, burst=5, clock=clock)
+    online = []
+    manager.add_listener(lambda session_id, character_id: online.append(character_id))
+    players = [f"player-{i}" for i in range(args.sessions)]
+    characters = list(bw.CHARACTER_NAMES)
+    baseline = {}
+
+    allow_time = poll_time = sweep_time = 0.0
+    allows = polls = peak = 0
+    active = int(args.sessions * args.active)
+    for second in range(args.seconds):
+        clock.now = float(second)
+        senders = rng.sample(players, active)
+        start = time.perf_counter()
+        for player in senders:
+            manager.allow(player, characters[hash(player) % len(characters)])
+        allow_time += time.perf_counter() - start
+        allows += len(senders)
+        for player in senders:
+            baseline[player] = clock.now + manager.burst / manager.rate
+        for player in senders[:int(active * args.abusive)]:
+            character = characters[hash(player) % len(characters)]
+            duration = rng.choice((40.0, 45.0, 60.0))
+            manager.set_offline(player, character, 'abusive', duration=duration)
+            baseline[(player, character)] = clock.now + duration
+        # Two polls per simulated second, as a 2 Hz server loop would
+        for half in (0.0, 0.5):
+            clock.now = second + half
+            start = time.perf_counter()
+            manager.poll()
+            poll_time += time.perf_counter() - start
+            start = time.perf_counter()
+            sweep(baseline, clock.now)
+            sweep_time += time.perf_counter() - start
+            polls += 1
+        if track_memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[0])
+    busy = len(manager)
+
+    # Everyone goes quiet: buckets refill and cooldowns expire
+    clock.now = args.seconds + 120.0
+    manager.poll()
+    return {
+        'manager': manager, 'allow_time': allow_time, 'allows': allows,
+        'poll_time': poll_time, 'sweep_time': sweep_time, 'polls': polls,
+        'busy': busy, 'quiet': len(manager), 'online': len(online), 'peak': peak,
+        'throttled': manager.throttled
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=100_000)
+    parser.add_argument('--seconds', type=int, default=30)
+    parser.add_argument('--active', type=float, default=0.2,
+                        help='share of players sending a message each second')
+    parser.add_argument('--abusive', type=float, default=0.01,
+                        help='share of messages that send the character offline')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    result = simulate(args)
+    print(f"{args.sessions:,} sessions, {args.seconds} simulated seconds, "
+          f"{result['allows']:,} messages, {result['throttled']:,} throttled")
+    print(f"  allow()                  {result['allows'] / result['allow_time']:>12,.0f} ops/s")
+    print(f"  poll (timing wheel)      {result['poll_time'] / result['polls'] * 1e6:>12.1f} us/call")
+    print(f"  poll (full sweep)        {result['sweep_time'] / result['polls'] * 1e6:>12.1f} us/call")
+    print(f"  back online              {result['online']:>12,}")
+    print(f"  tracked while busy       {result['busy']:>12,}")
+    print(f"  tracked once quiet       {result['quiet']:>12,}")
+
+    # Memory pass, kept apart from timing because tracemalloc slows allocation
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = simulate(args, track_memory=True)
+    gc.collect()
+    quiet = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"  peak memory              {(result['peak'] - baseline) / 2**20:>12.1f} MiB")
+    print(f"  memory once quiet        {quiet / 2**20:>12.1f} MiB")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Benchmark: per-item evidence callbacks vs add_evidence_many + coalesced events.
+
+Each frame a puzzle awards --items pieces of evidence, then the game drains
+callbacks as its frame loop would. The progress listener stands in for a UI
+redraw (--redraw-us of busy work per call). Reports listener calls and time
+per frame for both paths.
+
+Usage: python benchmarks/python/bench_event_bus.py [--frames 2000] [--items 50] [--redraw-us 20]
+"""
+
+import argparse
+import sys
+import time
+
+from _integration import load
+
+bw = load()
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def run(frames, items, redraw, bulk):
+    config = bw.WidgetConfig(non_blocking=True, coalesce_events=bulk)
+    counts = {'progress': 0, 'evidence': 0}
+
+    def on_progress(progress):
+        counts['progress'] += 1
+        busy(redraw)
+
+    def on_evidence(evidence):
+        counts['evidence'] += 1
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Fresh widget per frame so progress moves every time instead of capping at 100
+        widget = bw.BlackwoodWidget(config)
+        widget.events.subscribe(bw.EventBus.INVESTIGATION_PROGRESS, on_progress)
+        if bulk:
+            widget.events.subscribe(bw.EventBus.EVIDENCE_BATCH, on_evidence)
+            widget.add_evidence_many(f"clue-{frame}-{i}" for i in range(items))
+        else:
+            widget.events.subscribe(bw.EventBus.EVIDENCE_FOUND, on_evidence)
+            for i in range(items):
+                widget.add_evidence(f"clue-{frame}-{i}")
+        widget.process_callbacks()
+    elapsed = time.perf_counter() - start
+    return elapsed, counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--items', type=int, default=50)
+    parser.add_argument('--redraw-us', type=float, default=20.0)
+    args = parser.parse_args(argv)
+    redraw = args.redraw_us / 1e6
+
+    print(f"{'dispatch':>12} {'progress/frame':>15} {'evidence/frame':>15} {'per frame (us)':>15}")
+    results = {}
+    for name, bulk in (('per-item', False), ('coalesced', True)):
+        elapsed, counts = run(args.frames, args.items, redraw, bulk)
+        results[name] = elapsed
+        print(f"{name:>12} {counts['progress'] / args.frames:>15.1f} "
+              f"{counts['evidence'] / args.frames:>15.1f} {elapsed / args.frames * 1e6:>15.1f}")
+    print(f"speedup: {results['per-item'] / results['coalesced']:.1f}x per frame")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Benchmark: import cost of the blackwood_integration package core.
+
+Runs ``python -X importtime -c "import blackwood_integration"`` in fresh
+interpreters and reports the median cumulative time of the package plus
+the slowest modules it pulled in. Fails (exit 1) when the median exceeds
+--budget-ms or when the core import loads any module in HEAVY, so the
+headless fast path cannot silently regress.
+
+Usage: python benchmarks/python/bench_import_time.py [--runs 15] [--budget-ms 100] [--top 10]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from _integration import PACKAGE_DIR
+
+PACKAGE = "blackwood_integration"
+
+# Must stay out of the core import; each belongs to a lazily loaded part
+HEAVY = ('asyncio', 'sqlite3', 'http.client', 'ssl', 'multiprocessing',
+         'tkinter', 'kivy', 'pygame', 'webview')
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_once():
+    env = dict(os.environ, PYTHONPATH=PACKAGE_DIR)
+    code = (f"import sys, {PACKAGE}; "
+            f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, env=env, check=True)
+    modules = {}
+    total = None
+    for match in LINE.finditer(proc.stderr):
+        self_us, cumulative_us, _, name = match.groups()
+        modules[name] = (int(self_us), int(cumulative_us))
+        if name == PACKAGE:
+            total = int(cumulative_us)
+    heavy = [m for m in proc.stdout.strip().split(',') if m]
+    return total, modules, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=100.0)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    run_once()  # warm the bytecode cache
+    totals = []
+    self_times = {}
+    heavy = set()
+    for _ in range(args.runs):
+        total, modules, loaded = run_once()
+        totals.append(total)
+        heavy.update(loaded)
+        for name, (self_us, _) in modules.items():
+            self_times.setdefault(name, []).append(self_us)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"import {PACKAGE}: median {median_ms:.1f} ms, "
+          f"min {min(totals) / 1000:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print(f"{'module':<40} {'self (ms)':>10}")
+    slowest = sorted(self_times.items(), key=lambda item: -statistics.median(item[1]))
+    for name, samples in slowest[:args.top]:
+        print(f"{name:<40} {statistics.median(samples) / 1000:>10.2f}")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: core import loaded {', '.join(sorted(heavy))}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: {median_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Micro-benchmark: list-backed vs set-backed InvestigationState.
+
+Usage: python benchmarks/python/bench_investigation_state.py [--items 10000 50000]
+"""
+
+import argparse
+import sys
+import time
+
+from _integration import load
+
+bw = load()
+
+
+class ListInvestigationState:
+    """The original list-backed state and full progress recompute, for comparison"""
+
+    def __init__(self):
+        self.progress = 0
+        self.suspects_interviewed = []
+        self.rooms_investigated = []
+        self.evidence_collected = []
+
+    def add_evidence(self, evidence):
+        if evidence in self.evidence_collected:
+            return False
+        self.evidence_collected.append(evidence)
+        progress = (len(self.suspects_interviewed) * 15 +
+                    len(self.rooms_investigated) * 10 +
+                    len(self.evidence_collected) * 5)
+        self.progress = min(progress, 100)
+        return True
+
+
+def run(state, items):
+    start = time.perf_counter()
+    for item in items:
+        state.add_evidence(item)
+    # Second pass: every add is a duplicate and must be rejected
+    for item in items:
+        state.add_evidence(item)
+    return time.perf_counter() - start
+
+
+def run_widget(items):
+    widget = bw.BlackwoodWidget()
+    start = time.perf_counter()
+    for item in items:
+        widget.add_evidence(item)
+    summary = widget.get_investigation_summary()
+    elapsed = time.perf_counter() - start
+    assert len(summary['evidence_collected']) == len(items)
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, nargs='+', default=[10_000, 50_000])
+    args = parser.parse_args(argv)
+
+    print(f"{'items':>8} {'list (s)':>10} {'set (s)':>10} {'speedup':>9} {'widget (s)':>11}")
+    for count in args.items:
+        items = [f"evidence-{i}" for i in range(count)]
+        legacy = run(ListInvestigationState(), items)
+        current = run(bw.InvestigationState(), items)
+        widget = run_widget(items)
+        print(f"{count:>8} {legacy:>10.4f} {current:>10.4f} {legacy / current:>8.0f}x {widget:>11.4f}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
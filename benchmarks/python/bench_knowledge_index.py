@@ -0,0 +1,102 @@
+"""Benchmark: linear timeline scan vs KnowledgeIndex for reveal and phase checks.
+
+The scan is a line-for-line port of ``TimelineManager.canCharacterReveal``
+and ``updateProgress`` from lib/timeline.ts. Every query is answered by
+both and must agree; reports time per query for each.
+
+Usage: python benchmarks/python/bench_knowledge_index.py [--queries 200000] [--seed 7]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from _integration import load
+
+bw = load()
+
+
+def scan_can_reveal(data, character_id, information, trust_level):
+    constraints = data['characterConstraints'].get(character_id)
+    if not constraints:
+        return False
+    if information in constraints['knowledgeLimits']['forbiddenTopics']:
+        return False
+    event = next((e for e in data['events']
+                  if information in (e.get('evidence') or ()) or information in (e.get('secrets') or ())),
+                 None)
+    if event:
+        knowledge = event['characterKnowledge'].get(character_id)
+        if not knowledge:
+            return False
+        return knowledge['canReveal'] and trust_level >= knowledge['trustRequired']
+    return True
+
+
+def scan_phase(data, progress):
+    phases = data['phases']
+    for phase in phases:
+        later = next((p['requiredProgress'] for p in phases
+                      if p['requiredProgress'] > phase['requiredProgress']), 100)
+        if phase['requiredProgress'] <= progress < later:
+            return phase['id']
+    return phases[-1]['id']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--queries', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with open(bw.TIMELINE_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    start = time.perf_counter()
+    index = bw.KnowledgeIndex.from_file()
+    build = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    characters = list(data['characterConstraints']) + ['unknown-character']
+    topics = sorted({item for event in data['events']
+                     for item in (event.get('evidence') or []) + (event.get('secrets') or [])})
+    topics += sorted({topic for c in data['characterConstraints'].values()
+                      for topic in c['knowledgeLimits']['forbiddenTopics']})
+    topics.append('weather')
+    reveal = [(rng.choice(characters), rng.choice(topics), rng.randint(0, 100))
+              for _ in range(args.queries)]
+    progress = [rng.randint(0, 99) for _ in range(args.queries)]
+
+    print(f"index built in {build * 1000:.2f} ms "
+          f"({len(data['events'])} events, {len(topics)} topics)")
+    print(f"{'query':>12} {'scan (us)':>10} {'index (us)':>11} {'speedup':>8}")
+
+    start = time.perf_counter()
+    expected = [scan_can_reveal(data, c, t, trust) for c, t, trust in reveal]
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    got = [index.can_reveal(c, t, trust) for c, t, trust in reveal]
+    indexed = time.perf_counter() - start
+    if got != expected:
+        print("FAIL: can_reveal disagrees with the timeline scan")
+        return 1
+    print(f"{'can_reveal':>12} {scan / args.queries * 1e6:>10.2f} "
+          f"{indexed / args.queries * 1e6:>11.2f} {scan / indexed:>7.1f}x")
+
+    start = time.perf_counter()
+    expected = [scan_phase(data, p) for p in progress]
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    got = [index.phase_for(p)['id'] for p in progress]
+    indexed = time.perf_counter() - start
+    if got != expected:
+        print("FAIL: phase_for disagrees with the timeline scan")
+        return 1
+    print(f"{'phase_for':>12} {scan / args.queries * 1e6:>10.2f} "
+          f"{indexed / args.queries * 1e6:>11.2f} {scan / indexed:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
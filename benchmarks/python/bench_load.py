@@ -0,0 +1,185 @@
+"""Load test: N concurrent investigations against a local stub API.
+
+Each simulated investigation drives its own BlackwoodWidget (room
+enters, suspect selections, evidence, save/load) and chats through one
+shared BlackwoodChatClient. Widget launches fetch the widget page from
+the stub instead of opening a browser, so the run is fully offline.
+Reports p50/p95/p99 latency per operation, throughput and memory.
+
+Usage: python benchmarks/python/bench_load.py [--investigations 200] [--concurrency 32]
+           [--latency 0.02] [--jitter 0.03] [--error-rate 0.02] [--stream] [--trace-memory]
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from _integration import load
+from stub_server import StubConfig, StubServer
+
+bw = load()
+
+QUESTIONS = [
+    "Where were you at nine o'clock last night?",
+    "What was your relationship with Victoria?",
+    "Who had access to the wine cellar?",
+    "Why were you arguing in the study?",
+    "You are stupid, just answer the question!",
+    "Oh, shut up!",
+]
+
+
+class LoadTestWidget(bw.BlackwoodWidget):
+    """Fetches the widget page over HTTP where the real widget opens a browser"""
+
+    def _launch_browser(self, url):
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                response.read()
+                return response.status == 200
+        except OSError:
+            return False
+
+
+class Recorder:
+    """Raw latency samples per operation, for exact percentiles"""
+
+    def __init__(self):
+        self.samples = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def time(self, op, fn, *args):
+        start = time.perf_counter()
+        ok = fn(*args)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.samples.setdefault(op, []).append(elapsed)
+            if ok is False or getattr(ok, 'success', True) is False:
+                self.failures[op] = self.failures.get(op, 0) + 1
+        return ok
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def investigation(index, args, client, resilience, recorder, workdir):
+    rng = random.Random(args.seed + index)
+    widget = LoadTestWidget(bw.WidgetConfig(api_url=client.config.api_url,
+                                            retry_delay=args.retry_delay))
+    widget.resilience = resilience
+    rooms = rng.sample(list(bw.ROOM_CHARACTERS), args.rooms)
+    histories = {}
+    path = os.path.join(workdir, f"investigation-{index}.json")
+
+    for room in rooms:
+        recorder.time('room_enter', widget.start_room_investigation, room)
+        character = bw.ROOM_CHARACTERS[room]
+        if character not in widget.investigation_state.suspects_interviewed:
+            recorder.time('select_suspect', widget.select_suspect, character)
+        for e in range(args.evidence):
+            recorder.time('add_evidence', widget.add_evidence, f"{room}-clue-{e}")
+        history = histories.setdefault(character, bw.ConversationHistory(character, client.history_policy))
+        for _ in range(args.messages):
+            question = rng.choice(QUESTIONS)
+            recorder.time('moderate', client.moderate, question)
+            if args.stream:
+                def streamed():
+                    chat_stream = client.stream(character, question)
+                    for _ in chat_stream:
+                        pass
+                    return chat_stream.result
+                recorder.time('chat_stream', streamed)
+            else:
+                recorder.time('chat', client.chat, character, question, None, widget.investigation_state,
+                              history)
+    recorder.time('save_state', widget.save_state, path)
+    recorder.time('load_state', widget.load_state, path)
+    widget.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--investigations', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--rooms', type=int, default=3)
+    parser.add_argument('--evidence', type=int, default=4, help='evidence items per room')
+    parser.add_argument('--messages', type=int, default=3, help='chat turns per room')
+    parser.add_argument('--latency', type=float, default=0.02, help='stub base latency (s)')
+    parser.add_argument('--jitter', type=float, default=0.03, help='stub extra random latency (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of stub requests answering 503')
+    parser.add_argument('--retry-delay', type=float, default=0.05)
+    parser.add_argument('--stream', action='store_true', help='use SSE streaming for chat')
+    parser.add_argument('--trace-memory', action='store_true', help='report tracemalloc peak (slower)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    # Launches are HTTP fetches here, but _safe_open_url refuses to run without a display
+    os.environ.setdefault('DISPLAY', ':0')
+
+    stub_config = StubConfig(args.latency, args.jitter, args.error_rate, seed=args.seed)
+    recorder = Recorder()
+    bw.DEFAULT_METRICS.reset()
+    if args.trace_memory:
+        tracemalloc.start()
+
+    with StubServer(config=stub_config) as server, tempfile.TemporaryDirectory() as workdir:
+        config = bw.WidgetConfig(api_url=server.url, retry_delay=args.retry_delay)
+        resilience = bw.Resilience(max_concurrent_retries=args.concurrency)
+        client = bw.BlackwoodChatClient(config, max_connections=args.concurrency,
+                                        resilience=resilience, coalesce=False)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [executor.submit(investigation, i, args, client, resilience, recorder, workdir)
+                       for i in range(args.investigations)]
+            for future in futures:
+                future.result()
+        wall = time.perf_counter() - start
+        client.close()
+        requests = server.requests
+
+    total_ops = sum(len(v) for v in recorder.samples.values())
+    print(f"investigations: {args.investigations}  concurrency: {args.concurrency}  "
+          f"stub latency: {args.latency * 1000:.0f}+U(0,{args.jitter * 1000:.0f}) ms  "
+          f"error rate: {args.error_rate:.1%}")
+    print(f"{'operation':<15} {'count':>7} {'failed':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for op, values in recorder.samples.items():
+        values.sort()
+        print(f"{op:<15} {len(values):>7} {recorder.failures.get(op, 0):>7} "
+              f"{percentile(values, 0.50) * 1000:>9.2f} {percentile(values, 0.95) * 1000:>9.2f} "
+              f"{percentile(values, 0.99) * 1000:>9.2f} {values[-1] * 1000:>9.2f}")
+    print(f"wall: {wall:.2f}s  throughput: {total_ops / wall:,.0f} ops/s, "
+          f"{args.investigations / wall:,.1f} investigations/s")
+
+    counters = bw.DEFAULT_METRICS.snapshot()['counters']
+    interesting = ('chat_retries_total', 'chat_errors_total', 'chat_fallback_total',
+                   'widget_launch_retries_total', 'circuit_opened_total', 'moderation_escalations_total')
+    print("counters: " + ", ".join(f"{name}={counters.get(name, 0)}" for name in interesting))
+    print("stub requests: " + ", ".join(f"{path.split('?')[0]}={count}"
+                                         for path, count in sorted(requests.items())))
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    maxrss_mb = maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+    line = f"memory: max RSS {maxrss_mb:.1f} MB"
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f", traced peak {peak / (1024 * 1024):.1f} MB"
+    print(line)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Benchmark: bulk analytics over saved investigations (needs numpy).
+
+Writes --saves save files the way BlackwoodWidget.save_state does (JSON plus
+.bin twin, spread over player directories), then compares:
+  load_state   one widget load per save, aggregates in Python (the old way)
+  scan (cold)  SaveTable.scan on a thread pool, writing the .npz cache
+  scan (warm)  SaveTable.scan again with nothing changed (cache only)
+then appends one journal record and checks the rescan picks it up (fails
+if not), and reports the aggregate queries on the resulting columns.
+
+Usage: python benchmarks/python/bench_save_analytics.py [--saves 20000] [--players 2000] [--workers 8]
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from _integration import load
+
+bw = load()
+
+
+def write_saves(directory, saves, players, seed):
+    rng = random.Random(seed)
+    rooms = list(bw.ROOM_CHARACTERS)
+    suspects = list(bw.CHARACTER_NAMES)
+    start = time.time() - 86400
+    for i in range(saves):
+        player = f"player-{i % players}"
+        os.makedirs(os.path.join(directory, player), exist_ok=True)
+        progress = min(100, rng.randint(0, 130))
+        state_data = {
+            'investigation_state': {
+                'progress': progress,
+                'suspects_interviewed': rng.sample(suspects, rng.randint(0, len(suspects))),
+                'rooms_investigated': rng.sample(rooms, rng.randint(0, len(rooms))),
+                'evidence_collected': [f"clue-{n}" for n in range(rng.randint(0, 20))],
+                'current_character': rng.choice(suspects),
+                'widget_open': False
+            },
+            'widget_state': {},
+            'timestamp': start + i + rng.random() * 3600
+        }
+        bw.StatePersistence.write_snapshot(os.path.join(directory, player, f"save-{i}.json"),
+                                           state_data, fsync=False)
+
+
+def load_state_baseline(directory):
+    """What analysing saves looked like before: one widget load per file"""
+    widget = bw.BlackwoodWidget()
+    progress, evidence = [], []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith('.json') and widget.load_state(os.path.join(root, name)):
+                progress.append(widget.investigation_state.progress)
+                evidence.append(len(widget.investigation_state.evidence_collected))
+    return statistics.mean(progress), statistics.median(evidence), len(progress)
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:>10.1f} ms")
+    return result, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--saves', type=int, default=20_000)
+    parser.add_argument('--players', type=int, default=2_000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if importlib.util.find_spec('numpy') is None:
+        print("numpy is required: pip install numpy")
+        return 1
+
+    directory = tempfile.mkdtemp(prefix='blackwood-saves-')
+    cache = os.path.join(directory, 'analytics.npz')
+    try:
+        write_saves(directory, args.saves, args.players, args.seed)
+        player = lambda path: os.path.basename(os.path.dirname(path))
+        print(f"{args.saves:,} saves from {args.players:,} players")
+
+        _, baseline = timed('load_state one by one', lambda: load_state_baseline(directory))
+        table, cold = timed('scan (cold, writes cache)', lambda: bw.SaveTable.scan(
+            directory, workers=args.workers, cache=cache, group=player))
+        _, warm = timed('scan (warm, cache only)', lambda: bw.SaveTable.scan(
+            directory, workers=args.workers, cache=cache, group=player))
+
+        # A journaled save changes only its .journal; the next scan must see it
+        path = table.paths[0]
+        journal = bw.StatePersistence(path)
+        journal.append(bw.JournalOp.EVIDENCE, b'late-clue')
+        journal.close()
+        rescan, _ = timed('scan (one journal grew)', lambda: bw.SaveTable.scan(
+            directory, workers=args.workers, cache=cache, group=player))
+        if rescan.evidence[0] != table.evidence[0] + 1:
+            print("FAIL: the cached row ignored a journal append")
+            return 1
+
+        timed('progress histogram', table.progress_histogram)
+        timed('room funnel', table.room_funnel)
+        timed('time to completion', table.time_to_completion)
+        summary, _ = timed('summary', table.summary)
+
+        print(f"  cache size {os.path.getsize(cache) / 1024:.0f} KiB, "
+              f"speedup cold {baseline / cold:.1f}x, warm {baseline / warm:.1f}x")
+        median = summary['median_time_to_completion']
+        print(f"  mean progress {summary['mean_progress']:.1f}%, "
+              f"completion rate {summary['completion_rate']:.1%}, "
+              f"median time to completion {'n/a (no journals)' if median is None else f'{median:.0f} s'}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
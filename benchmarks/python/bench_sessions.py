@@ -0,0 +1,96 @@
+"""Benchmark: SessionManager hosting many investigations in one process.
+
+Reports resident memory per session (tracemalloc) and ops/sec for
+add_evidence / select_suspect / start_room_investigation, plus the cost of
+parking idle sessions to disk and restoring them.
+
+Usage: python benchmarks/python/bench_sessions.py [--sessions 10000] [--evidence 20]
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _integration import load
+
+bw = load()
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {count / elapsed:>12,.0f} ops/s  ({elapsed:.3f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=10_000)
+    parser.add_argument('--evidence', type=int, default=20,
+                        help='evidence items added per session')
+    args = parser.parse_args(argv)
+
+    suspects = list(bw.CHARACTER_NAMES)
+    rooms = list(bw.ROOM_CHARACTERS)
+    evidence = [f"evidence-{i}" for i in range(args.evidence)]
+    players = [f"player-{i}" for i in range(args.sessions)]
+
+    def populate(manager):
+        for player in players:
+            manager.get(player)
+            for item in evidence:
+                manager.add_evidence(player, item)
+            for suspect in suspects:
+                manager.select_suspect(player, suspect)
+
+    # Memory pass, kept apart from timing because tracemalloc slows allocation
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    manager = bw.SessionManager()
+    populate(manager)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    manager.close(park=False)
+    del manager
+
+    print(f"{args.sessions:,} sessions, {args.evidence} evidence items each")
+    print(f"  {'memory per session':<28} {used / args.sessions:>12,.0f} bytes")
+
+    with tempfile.TemporaryDirectory() as storage:
+        manager = bw.SessionManager(storage_dir=storage)
+        timed("create sessions", args.sessions,
+              lambda: [manager.get(p) for p in players])
+
+        def add_all_evidence():
+            for item in evidence:
+                for player in players:
+                    manager.add_evidence(player, item)
+        timed("add_evidence", args.sessions * len(evidence), add_all_evidence)
+
+        def select_all():
+            for suspect in suspects:
+                for player in players:
+                    manager.select_suspect(player, suspect)
+        timed("select_suspect", args.sessions * len(suspects), select_all)
+
+        def investigate_all():
+            for room in rooms:
+                for player in players:
+                    manager.start_room_investigation(player, room)
+        timed("start_room_investigation", args.sessions * len(rooms), investigate_all)
+
+        timed("evict_idle (park to disk)", args.sessions, lambda: manager.evict_idle(0))
+        assert len(manager) == 0
+        timed("restore on access", args.sessions,
+              lambda: [manager.get(p) for p in players])
+        assert manager.get_investigation_summary(players[-1])['progress'] == 100
+        manager.close(park=False)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Benchmark: per-call urlencode vs the precompiled WidgetUrlBuilder.
+
+The baseline is the params-dict + urlencode code show_widget used before
+the builder. Every generated URL is checked for byte equality.
+
+Usage: python benchmarks/python/bench_url_builder.py [--urls 100000] [--sessions 10000]
+"""
+
+import argparse
+import itertools
+import sys
+import time
+import urllib.parse
+
+from _integration import load
+
+bw = load()
+
+
+def legacy_url(widget_url, config, character_id, state, interrogation):
+    params = {
+        'embed': 'true',
+        'theme': config.theme.value,
+        'position': config.position.value,
+        'interrogation': str(interrogation).lower(),
+        'width': config.width,
+        'height': config.height
+    }
+    if character_id:
+        params['character'] = character_id
+    params['progress'] = state.progress
+    params['evidence_count'] = len(state.evidence_collected)
+    params['suspects_count'] = len(state.suspects_interviewed)
+    return f"{widget_url}?{urllib.parse.urlencode(params)}"
+
+
+def make_states(count):
+    characters = list(bw.CHARACTER_NAMES) + [None]
+    items = []
+    for i in range(count):
+        state = bw.InvestigationState()
+        for e in range(i % 7):
+            state.add_evidence(f"evidence-{e}")
+        for s in bw.CHARACTER_NAMES if i % 3 == 0 else ():
+            state.add_suspect(s)
+        state.current_character = characters[i % len(characters)]
+        items.append((state.current_character, state))
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--urls', type=int, default=100_000)
+    parser.add_argument('--sessions', type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    config = bw.WidgetConfig()
+    widget_url = f"{config.api_url}/widget-demo"
+    builder = bw.WidgetUrlBuilder.for_config(config)
+    items = make_states(64)
+    calls = list(itertools.islice(itertools.cycle(items), args.urls))
+
+    start = time.perf_counter()
+    legacy = [legacy_url(widget_url, config, c, s, i % 2 == 0) for i, (c, s) in enumerate(calls)]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [builder.for_state(c, s, i % 2 == 0) for i, (c, s) in enumerate(calls)]
+    compiled_time = time.perf_counter() - start
+    assert compiled == legacy
+
+    sessions = make_states(args.sessions)
+    start = time.perf_counter()
+    links = builder.build_many(sessions)
+    bulk_time = time.perf_counter() - start
+    assert links == [legacy_url(widget_url, config, c, s, False) for c, s in sessions]
+
+    print(f"{'builder':>12} {'urls':>8} {'total (s)':>10} {'per url (us)':>13}")
+    for name, count, elapsed in (('urlencode', args.urls, legacy_time),
+                                 ('compiled', args.urls, compiled_time),
+                                 ('build_many', args.sessions, bulk_time)):
+        print(f"{name:>12} {count:>8} {elapsed:>10.4f} {elapsed / count * 1e6:>13.2f}")
+    print(f"speedup: {legacy_time / compiled_time:.1f}x per call")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""Local stand-in for the Blackwood API, for offline load tests.
+
+Serves /api/chat (JSON or SSE when the body asks for "stream"),
+/api/chat-fallback, /api/abuse-detection, GET /api/health and the
+/widget-demo page with configurable latency and error rates. Replies
+are canned, so no model or network access is needed.
+
+Run stand-alone: python benchmarks/python/stub_server.py --port 3000 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WIDGET_PAGE = b"<!DOCTYPE html><html><body><div id=\"detective-widget-root\"></div></body></html>"
+
+
+class StubConfig:
+    """Latency is base + U(0, jitter) seconds; error_rate of requests answer 503"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, stream_chunks=4, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stream_chunks = stream_chunks
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def delay(self):
+        with self.lock:
+            return self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def fails(self):
+        if not self.error_rate:
+            return False
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    # Default backlog of 5 makes concurrent clients hit SYN retransmits (1s stalls)
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, payload):
+        self._send(status, json.dumps(payload).encode('utf-8'))
+
+    def _count(self):
+        server = self.server
+        path = self.path.split('?', 1)[0]
+        with server.config.lock:
+            server.requests[path] = server.requests.get(path, 0) + 1
+
+    def _simulate(self):
+        """Apply latency; True if this request should fail"""
+        config = self.server.config
+        delay = config.delay()
+        if delay:
+            time.sleep(delay)
+        if config.fails():
+            self._json(503, {'success': False, 'error': 'Service unavailable'})
+            return True
+        return False
+
+    def do_GET(self):
+        self._count()
+        if self._simulate():
+            return
+        path = self.path.split('?', 1)[0]
+        if path == '/api/health':
+            self._json(200, {'status': 'ok', 'message': 'stub', 'version': '1.0.0'})
+        elif path == '/widget-demo':
+            self._send(200, WIDGET_PAGE, 'text/html')
+        else:
+            self._json(404, {'success': False, 'error': 'Not found'})
+
+    def do_POST(self):
+        self._count()
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._json(400, {'success': False, 'error': 'Invalid JSON'})
+            return
+        if self._simulate():
+            return
+
+        if self.path == '/api/chat':
+            reply = f"[{body.get('character')}] I was in the library, Detective. ({body.get('message', '')[:40]})"
+            if body.get('stream'):
+                self._stream(reply)
+            else:
+                self._json(200, {'success': True, 'response': reply})
+        elif self.path == '/api/chat-fallback':
+            self._json(200, {'success': True, 'response': "I don't have much to say about that."})
+        elif self.path == '/api/abuse-detection':
+            message = (body.get('message') or '').lower()
+            abusive = any(word in message for word in ('idiot', 'stupid', 'shut up'))
+            self._json(200, {'success': True, 'data': {
+                'isAbusive': abusive,
+                'isIrrelevant': False,
+                'severity': 'medium' if abusive else 'low',
+                'confidence': 80 if abusive else 60,
+                'reason': 'stub',
+                'detectedIntent': 'stub'
+            }})
+        else:
+            self._json(404, {'success': False, 'error': 'Not found'})
+
+    def _stream(self, reply):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        words = reply.split(' ')
+        size = max(1, len(words) // max(1, self.server.config.stream_chunks))
+        events = [('start', {})]
+        events += [('chunk', {'text': ' '.join(words[i:i + size]) + ' '})
+                   for i in range(0, len(words), size)]
+        events.append(('done', {}))
+        for event, data in events:
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+        self.close_connection = True
+
+
+class StubServer:
+    """Threaded stub server on 127.0.0.1; use as a context manager"""
+
+    def __init__(self, port=0, config=None):
+        self.httpd = StubHTTPServer(('127.0.0.1', port), StubHandler)
+        self.httpd.config = config or StubConfig()
+        self.httpd.requests = {}
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    @property
+    def requests(self):
+        return dict(self.httpd.requests)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-server",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    server = StubServer(args.port, StubConfig(args.latency, args.jitter, args.error_rate))
+    print(f"Stub API listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
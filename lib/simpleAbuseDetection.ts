@@ -3,6 +3,8 @@
  * Reliable and fast detection without LLM dependencies
  */
 
+import abusePhrases from '@/public/data/abuse-phrases.json';
+
 export interface AbuseDetectionResult {
   isAbusive: boolean;
   isIrrelevant: boolean;
@@ -14,108 +16,14 @@ export interface AbuseDetectionResult {
 }
 
 export class SimpleAbuseDetection {
-  private static readonly ABUSIVE_PHRASES = [
-    // Direct insults
-    'you are an idiot', 'you\'re an idiot', 'you are stupid', 'you\'re stupid',
-    'you are dumb', 'you\'re dumb', 'you are a moron', 'you\'re a moron',
-    'you are pathetic', 'you\'re pathetic', 'you are worthless', 'you\'re worthless',
-    'you are useless', 'you\'re useless', 'you are a fool', 'you\'re a fool',
-    'you are incompetent', 'you\'re incompetent', 'you are ridiculous', 'you\'re ridiculous',
-    'you are annoying', 'you\'re annoying', 'you are irritating', 'you\'re irritating',
-    'you are insufferable', 'you\'re insufferable', 'you are unbearable', 'you\'re unbearable',
-    
-    // Commands and disrespect
-    'shut up', 'shut your mouth', 'be quiet', 'stop talking', 'go away',
-    'leave me alone', 'get lost', 'piss off', 'bugger off', 'get out of here',
-    'get away from me', 'stop bothering me', 'don\'t talk to me', 'leave me be',
-    'shut your trap', 'close your mouth', 'keep quiet', 'zip it',
-    
-    // Profanity and strong abuse
-    'fuck you', 'damn you', 'you bitch', 'you bastard', 'you asshole',
-    'you dickhead', 'you wanker', 'you twat', 'you cunt', 'you whore',
-    'you slut', 'you tramp', 'you harlot', 'you prostitute',
-    'go to hell', 'screw you', 'you suck', 'you\'re shit', 'you\'re garbage',
-    'you\'re trash', 'you\'re filth', 'you\'re scum', 'you\'re dirt',
-    
-    // Threats and aggressive language
-    'i hate you', 'i despise you', 'i loathe you', 'you disgust me',
-    'kill yourself', 'drop dead', 'you should die', 'i wish you were dead',
-    'i hope you die', 'i want you dead', 'you deserve to die',
-    'go kill yourself', 'end your life', 'off yourself',
-    
-    // 1947 inappropriate (period-specific)
-    'you swine', 'you cad', 'you bounder', 'you blackguard',
-    'you scoundrel', 'you villain', 'you knave', 'you rogue',
-    'you rascal', 'you scamp', 'you wretch', 'you cur',
-    'you vermin', 'you rat', 'you snake', 'you weasel',
-    'you coward', 'you yellow-belly', 'you chicken',
-    
-    // Additional modern inappropriate terms
-    'you\'re retarded', 'you\'re autistic', 'you\'re handicapped',
-    'you\'re disabled', 'you\'re crippled', 'you\'re deformed',
-    'you\'re ugly', 'you\'re hideous', 'you\'re repulsive',
-    'you\'re fat', 'you\'re obese', 'you\'re gross',
-    'you\'re weird', 'you\'re creepy', 'you\'re psycho',
-    'you\'re crazy', 'you\'re insane', 'you\'re mental',
-    
-    // Racial and discriminatory terms
-    'you nigger', 'you kike', 'you chink', 'you spic', 'you wetback',
-    'you camel jockey', 'you sand nigger', 'you towel head',
-    'you gook', 'you jap', 'you chink', 'you slope',
-    
-    // Additional profanity
-    'bullshit', 'horseshit', 'crap', 'damn', 'hell', 'bloody hell',
-    'what the hell', 'what the fuck', 'what the damn',
-    'son of a bitch', 'motherfucker', 'asshole', 'dickhead',
-    'prick', 'cock', 'dick', 'pussy', 'twat', 'cunt'
-  ];
+  // Phrase lists are shared with the Python integration (public/blackwood_integration/moderation.py)
+  private static readonly ABUSIVE_PHRASES: string[] = ([] as string[]).concat(
+    ...Object.values(abusePhrases.abusivePhrases)
+  );
 
-  private static readonly IRRELEVANT_TOPICS = [
-    // Technology questions (shouldn't exist in 1947)
-    'what is your ip address', 'what is your phone number', 'what is your email',
-    'do you have internet', 'do you use social media', 'what is your website',
-    'can you access the internet', 'do you have a computer', 'what software do you use',
-    'do you have a smartphone', 'do you have an iphone', 'do you have an android',
-    'what is your wifi password', 'do you have wifi', 'what is your password',
-    'can you hack', 'are you a hacker', 'can you code', 'do you program',
-    
-    // Personal questions unrelated to investigation
-    'what is your favorite color', 'what is your favorite food', 'what is your hobby',
-    'do you have a boyfriend', 'do you have a girlfriend', 'are you married',
-    'how old are you', 'what is your age', 'where do you live',
-    'what is your real name', 'what do you look like', 'send me a photo',
-    'what is your zodiac sign', 'what is your horoscope', 'what is your birth sign',
-    'do you have children', 'do you have siblings', 'what is your family like',
-    'what is your job', 'what do you do for work', 'what is your salary',
-    'what is your income', 'how much money do you make', 'are you rich',
-    'what is your address', 'where is your house', 'can i come over',
-    
-    // Modern topics and events
-    'covid', 'pandemic', 'vaccine', 'climate change', 'global warming',
-    'smartphone', 'iphone', 'android', 'facebook', 'twitter', 'instagram',
-    'youtube', 'netflix', 'spotify', 'uber', 'airbnb', 'amazon', 'google',
-    'tiktok', 'snapchat', 'discord', 'zoom', 'teams', 'slack',
-    'bitcoin', 'cryptocurrency', 'blockchain', 'nft', 'metaverse',
-    'artificial intelligence', 'machine learning', 'robots', 'automation',
-    'spacex', 'tesla', 'elon musk', 'jeff bezos', 'mark zuckerberg',
-    
-    // Modern entertainment and media
-    'netflix show', 'hulu', 'disney plus', 'hbo max', 'prime video',
-    'video games', 'xbox', 'playstation', 'nintendo', 'steam',
-    'marvel', 'dc comics', 'superheroes', 'avengers', 'batman',
-    'star wars', 'harry potter', 'game of thrones', 'stranger things',
-    
-    // Modern politics and current events
-    'trump', 'biden', 'election', 'president', 'congress', 'senate',
-    'brexit', 'ukraine', 'russia', 'china', 'north korea',
-    'isis', 'terrorism', 'war on terror', '9/11', 'september 11',
-    
-    // Modern lifestyle and trends
-    'vegan', 'vegetarian', 'gluten free', 'organic', 'sustainability',
-    'yoga', 'meditation', 'mindfulness', 'therapy', 'counseling',
-    'gym', 'fitness', 'workout', 'diet', 'weight loss',
-    'fashion', 'trends', 'influencer', 'social media star'
-  ];
+  private static readonly IRRELEVANT_TOPICS: string[] = ([] as string[]).concat(
+    ...Object.values(abusePhrases.irrelevantTopics)
+  );
 
   /**
    * Check if message should be analyzed for abuse
@@ -191,8 +99,8 @@ export class SimpleAbuseDetection {
    * Determine severity based on the abusive phrase
    */
   private static getAbuseSeverity(phrase: string): 'low' | 'medium' | 'high' {
-    const highSeverity = ['fuck you', 'you cunt', 'kill yourself', 'you should die', 'i wish you were dead'];
-    const mediumSeverity = ['you are stupid', 'you\'re stupid', 'you are an idiot', 'you\'re an idiot', 'shut up', 'go to hell'];
+    const highSeverity = abusePhrases.highSeverity;
+    const mediumSeverity = abusePhrases.mediumSeverity;
     
     if (highSeverity.some(high => phrase.includes(high))) {
       return 'high';
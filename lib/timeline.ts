@@ -3,6 +3,8 @@
  * Based on script.rpy timeline and character knowledge constraints
  */
 
+import timelineData from '@/public/data/timeline.json';
+
 export interface TimelineEvent {
   id: string;
   time: string;
@@ -66,483 +68,18 @@ export interface CharacterConstraints {
   };
 }
 
+// Timeline, phases and character constraints live in public/data/timeline.json
+// so the Python integration (blackwood_integration.knowledge) indexes the same data
+
 // Timeline Events based on script.rpy
-export const INVESTIGATION_TIMELINE: TimelineEvent[] = [
-  {
-    id: 'victoria_death',
-    time: '9:27 PM',
-    location: 'study',
-    participants: ['Victoria Blackwood', 'unknown_killer'],
-    description: 'Victoria Blackwood found dead in her study',
-    evidence: ['stopped_clock', 'wine_glass', 'blood_pattern'],
-    secrets: ['will_changes', 'secret_project'],
-    characterKnowledge: {
-      'james-blackwood': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: false,
-        trustRequired: 80
-      },
-      'marcus-reynolds': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: false,
-        trustRequired: 70
-      },
-      'elena-rodriguez': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: false,
-        trustRequired: 75
-      },
-      'lily-chen': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: false,
-        trustRequired: 85
-      },
-      'thompson-butler': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: true,
-        trustRequired: 30
-      }
-    }
-  },
-  {
-    id: 'lily_visit',
-    time: '9:20 PM - 9:25 PM',
-    location: 'study',
-    participants: ['Victoria Blackwood', 'Lily Chen'],
-    description: 'Lily Chen visits Victoria in the study',
-    evidence: ['emotional_distress'],
-    secrets: ['disinheritance_plan'],
-    characterKnowledge: {
-      'lily-chen': {
-        knowsAbout: true,
-        witnessed: true,
-        canReveal: true,
-        trustRequired: 40
-      },
-      'thompson-butler': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: true,
-        trustRequired: 20
-      }
-    }
-  },
-  {
-    id: 'james_visit',
-    time: '9:05 PM - 9:15 PM',
-    location: 'study',
-    participants: ['Victoria Blackwood', 'James Blackwood'],
-    description: 'James Blackwood visits Victoria in the study',
-    evidence: ['emotional_distress'],
-    secrets: ['gambling_debts', 'will_changes'],
-    characterKnowledge: {
-      'james-blackwood': {
-        knowsAbout: true,
-        witnessed: true,
-        canReveal: true,
-        trustRequired: 50
-      },
-      'thompson-butler': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: true,
-        trustRequired: 20
-      }
-    }
-  },
-  {
-    id: 'elena_visit',
-    time: '8:55 PM - 9:00 PM',
-    location: 'study',
-    participants: ['Victoria Blackwood', 'Dr. Elena Rodriguez'],
-    description: 'Dr. Elena Rodriguez visits Victoria in the study',
-    evidence: ['medical_bag'],
-    secrets: ['medical_malpractice', 'medication_interactions'],
-    characterKnowledge: {
-      'elena-rodriguez': {
-        knowsAbout: true,
-        witnessed: true,
-        canReveal: false,
-        trustRequired: 90
-      },
-      'thompson-butler': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: true,
-        trustRequired: 20
-      }
-    }
-  },
-  {
-    id: 'marcus_visit',
-    time: '8:40 PM - 8:50 PM',
-    location: 'study',
-    participants: ['Victoria Blackwood', 'Marcus Reynolds'],
-    description: 'Marcus Reynolds visits Victoria in the study',
-    evidence: ['financial_documents', 'raised_voices'],
-    secrets: ['embezzlement', 'financial_irregularities'],
-    characterKnowledge: {
-      'marcus-reynolds': {
-        knowsAbout: true,
-        witnessed: true,
-        canReveal: false,
-        trustRequired: 85
-      },
-      'thompson-butler': {
-        knowsAbout: true,
-        witnessed: false,
-        canReveal: true,
-        trustRequired: 20
-      }
-    }
-  },
-  {
-    id: 'wine_delivery',
-    time: '8:35 PM',
-    location: 'study',
-    participants: ['Victoria Blackwood', 'Mr. Thompson'],
-    description: 'Mr. Thompson delivers wine to Victoria',
-    evidence: ['wine_glass', 'wine_source'],
-    secrets: [],
-    characterKnowledge: {
-      'thompson-butler': {
-        knowsAbout: true,
-        witnessed: true,
-        canReveal: true,
-        trustRequired: 10
-      }
-    }
-  },
-  {
-    id: 'victoria_work',
-    time: '8:30 PM',
-    location: 'study',
-    participants: ['Victoria Blackwood'],
-    description: 'Victoria working on papers in the study',
-    evidence: ['financial_documents', 'will_changes'],
-    secrets: ['secret_project', 'planned_exposures'],
-    characterKnowledge: {
-      'thompson-butler': {
-        knowsAbout: true,
-        witnessed: true,
-        canReveal: true,
-        trustRequired: 10
-      }
-    }
-  }
-];
+export const INVESTIGATION_TIMELINE: TimelineEvent[] = timelineData.events as TimelineEvent[];
 
 // Investigation Phases based on script.rpy progression
-export const INVESTIGATION_PHASES: InvestigationPhase[] = [
-  {
-    id: 'initial_arrival',
-    name: 'Initial Arrival',
-    description: 'Detective arrives at Blackwood Manor',
-    startTime: '9:30 PM',
-    endTime: '10:00 PM',
-    requiredProgress: 0,
-    availableCharacters: ['thompson-butler', 'james-blackwood', 'marcus-reynolds', 'elena-rodriguez', 'lily-chen'],
-    availableLocations: ['mansion_entrance', 'study', 'dining_room', 'library', 'kitchen', 'garden', 'basement', 'bedroom', 'hallway', 'conservatory'],
-    context: {
-      currentLocation: 'mansion_entrance',
-      timeOfDay: 'evening',
-      investigationStyle: 'methodical',
-      playerAttributes: {
-        intelligence: 0,
-        emotionalBalance: 50,
-        empathy: 50,
-        courage: 50,
-        fear: 0
-      }
-    }
-  },
-  {
-    id: 'crime_scene_investigation',
-    name: 'Crime Scene Investigation',
-    description: 'Examining the study where Victoria was found',
-    startTime: '10:00 PM',
-    endTime: '11:00 PM',
-    requiredProgress: 10,
-    availableCharacters: ['thompson-butler', 'james-blackwood', 'marcus-reynolds', 'elena-rodriguez', 'lily-chen'],
-    availableLocations: ['study', 'mansion_entrance', 'dining_room', 'library', 'kitchen', 'garden', 'basement', 'bedroom', 'hallway', 'conservatory'],
-    context: {
-      currentLocation: 'study',
-      timeOfDay: 'evening',
-      investigationStyle: 'methodical',
-      playerAttributes: {
-        intelligence: 10,
-        emotionalBalance: 50,
-        empathy: 50,
-        courage: 60,
-        fear: 5
-      }
-    }
-  },
-  {
-    id: 'initial_interviews',
-    name: 'Initial Interviews',
-    description: 'Interviewing key witnesses and suspects',
-    startTime: '11:00 PM',
-    endTime: '12:00 AM',
-    requiredProgress: 25,
-    availableCharacters: ['thompson-butler', 'james-blackwood', 'marcus-reynolds', 'elena-rodriguez', 'lily-chen'],
-    availableLocations: ['study', 'dining_room', 'library', 'kitchen', 'garden', 'basement', 'bedroom', 'hallway', 'conservatory'],
-    context: {
-      currentLocation: 'dining_room',
-      timeOfDay: 'night',
-      investigationStyle: 'methodical',
-      playerAttributes: {
-        intelligence: 25,
-        emotionalBalance: 55,
-        empathy: 60,
-        courage: 65,
-        fear: 10
-      }
-    }
-  },
-  {
-    id: 'deep_investigation',
-    name: 'Deep Investigation',
-    description: 'Gathering evidence and re-interviewing suspects',
-    startTime: '12:00 AM',
-    endTime: '2:00 AM',
-    requiredProgress: 50,
-    availableCharacters: ['thompson-butler', 'james-blackwood', 'marcus-reynolds', 'elena-rodriguez', 'lily-chen'],
-    availableLocations: ['study', 'dining_room', 'library', 'kitchen', 'garden', 'basement', 'bedroom', 'hallway', 'conservatory'],
-    context: {
-      currentLocation: 'library',
-      timeOfDay: 'night',
-      investigationStyle: 'methodical',
-      playerAttributes: {
-        intelligence: 50,
-        emotionalBalance: 60,
-        empathy: 70,
-        courage: 70,
-        fear: 15
-      }
-    }
-  },
-  {
-    id: 'final_confrontation',
-    name: 'Final Confrontation',
-    description: 'Final interviews and accusation phase',
-    startTime: '2:00 AM',
-    endTime: '4:00 AM',
-    requiredProgress: 75,
-    availableCharacters: ['thompson-butler', 'james-blackwood', 'marcus-reynolds', 'elena-rodriguez', 'lily-chen'],
-    availableLocations: ['study', 'dining_room', 'library', 'kitchen', 'garden', 'basement', 'bedroom', 'hallway', 'conservatory'],
-    context: {
-      currentLocation: 'conservatory',
-      timeOfDay: 'night',
-      investigationStyle: 'methodical',
-      playerAttributes: {
-        intelligence: 75,
-        emotionalBalance: 65,
-        empathy: 80,
-        courage: 80,
-        fear: 20
-      }
-    }
-  }
-];
+export const INVESTIGATION_PHASES: InvestigationPhase[] = timelineData.phases as InvestigationPhase[];
 
 // Character Constraints based on timeline and investigation progress
-export const CHARACTER_CONSTRAINTS: Record<string, CharacterConstraints> = {
-  'thompson-butler': {
-    characterId: 'thompson-butler',
-    currentPhase: 'initial_arrival',
-    knowledgeLimits: {
-      maxRevealedSecrets: 5,
-      maxTrustLevel: 100,
-      availableInformation: [
-        'wine_delivery_timing',
-        'victoria_work_schedule',
-        'visitor_timeline',
-        'household_routine',
-        'victoria_personality',
-        'family_dynamics',
-        'household_staff',
-        'mansion_history'
-      ],
-      forbiddenTopics: []
-    },
-    behavioralConstraints: {
-      emotionalState: 'neutral',
-      responseStyle: 'cooperative',
-      informationSharing: 'open'
-    },
-    timelineConstraints: {
-      canMentionFutureEvents: false,
-      canRevealPastSecrets: true,
-      currentKnowledge: [
-        'victoria_death',
-        'wine_delivery',
-        'victoria_work',
-        'marcus_visit',
-        'elena_visit',
-        'james_visit',
-        'lily_visit'
-      ],
-      forbiddenKnowledge: []
-    }
-  },
-  'james-blackwood': {
-    characterId: 'james-blackwood',
-    currentPhase: 'initial_arrival',
-    knowledgeLimits: {
-      maxRevealedSecrets: 3,
-      maxTrustLevel: 80,
-      availableInformation: [
-        'family_history',
-        'gambling_problems',
-        'financial_situation',
-        'relationship_with_victoria',
-        'childhood_memories',
-        'family_business',
-        'sister_relationship'
-      ],
-      forbiddenTopics: ['embezzlement_details', 'murder_weapon', 'other_suspects_secrets']
-    },
-    behavioralConstraints: {
-      emotionalState: 'defensive',
-      responseStyle: 'evasive',
-      informationSharing: 'guarded'
-    },
-    timelineConstraints: {
-      canMentionFutureEvents: false,
-      canRevealPastSecrets: false,
-      currentKnowledge: [
-        'victoria_death',
-        'james_visit',
-        'family_history',
-        'childhood_memories'
-      ],
-      forbiddenKnowledge: [
-        'marcus_visit_details',
-        'elena_visit_details',
-        'lily_visit_details'
-      ]
-    }
-  },
-  'marcus-reynolds': {
-    characterId: 'marcus-reynolds',
-    currentPhase: 'initial_arrival',
-    knowledgeLimits: {
-      maxRevealedSecrets: 2,
-      maxTrustLevel: 70,
-      availableInformation: [
-        'business_relationship',
-        'financial_documents',
-        'victoria_personality',
-        'business_operations',
-        'partnership_history',
-        'financial_strategy'
-      ],
-      forbiddenTopics: ['embezzlement', 'financial_irregularities', 'murder_weapon', 'other_suspects_secrets']
-    },
-    behavioralConstraints: {
-      emotionalState: 'defensive',
-      responseStyle: 'evasive',
-      informationSharing: 'secretive'
-    },
-    timelineConstraints: {
-      canMentionFutureEvents: false,
-      canRevealPastSecrets: false,
-      currentKnowledge: [
-        'victoria_death',
-        'marcus_visit',
-        'business_relationship',
-        'partnership_history'
-      ],
-      forbiddenKnowledge: [
-        'james_visit_details',
-        'elena_visit_details',
-        'lily_visit_details'
-      ]
-    }
-  },
-  'elena-rodriguez': {
-    characterId: 'elena-rodriguez',
-    currentPhase: 'initial_arrival',
-    knowledgeLimits: {
-      maxRevealedSecrets: 2,
-      maxTrustLevel: 75,
-      availableInformation: [
-        'medical_relationship',
-        'victoria_health',
-        'medication_history',
-        'medical_practice',
-        'patient_care',
-        'health_concerns'
-      ],
-      forbiddenTopics: ['medical_malpractice', 'medication_interactions', 'murder_weapon', 'other_suspects_secrets']
-    },
-    behavioralConstraints: {
-      emotionalState: 'neutral',
-      responseStyle: 'cooperative',
-      informationSharing: 'guarded'
-    },
-    timelineConstraints: {
-      canMentionFutureEvents: false,
-      canRevealPastSecrets: false,
-      currentKnowledge: [
-        'victoria_death',
-        'elena_visit',
-        'medical_relationship',
-        'health_concerns'
-      ],
-      forbiddenKnowledge: [
-        'james_visit_details',
-        'marcus_visit_details',
-        'lily_visit_details'
-      ]
-    }
-  },
-  'lily-chen': {
-    characterId: 'lily-chen',
-    currentPhase: 'initial_arrival',
-    knowledgeLimits: {
-      maxRevealedSecrets: 4,
-      maxTrustLevel: 85,
-      availableInformation: [
-        'family_relationship',
-        'victoria_personality',
-        'emotional_state',
-        'disinheritance_plan',
-        'artistic_pursuits',
-        'family_memories',
-        'aunt_relationship'
-      ],
-      forbiddenTopics: ['murder_weapon', 'financial_details', 'other_suspects_secrets']
-    },
-    behavioralConstraints: {
-      emotionalState: 'vulnerable',
-      responseStyle: 'cooperative',
-      informationSharing: 'open'
-    },
-    timelineConstraints: {
-      canMentionFutureEvents: false,
-      canRevealPastSecrets: true,
-      currentKnowledge: [
-        'victoria_death',
-        'lily_visit',
-        'family_relationship',
-        'artistic_pursuits',
-        'family_memories'
-      ],
-      forbiddenKnowledge: [
-        'james_visit_details',
-        'marcus_visit_details',
-        'elena_visit_details'
-      ]
-    }
-  }
-};
+export const CHARACTER_CONSTRAINTS: Record<string, CharacterConstraints> =
+  timelineData.characterConstraints as Record<string, CharacterConstraints>;
 
 /**
  * Timeline and Context Management Functions
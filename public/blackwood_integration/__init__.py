@@ -0,0 +1,96 @@
+"""Blackwood Manor Detective Widget - Python integration.
+
+The core (config, investigation state, events and BlackwoodWidget) needs
+only the standard library and is imported eagerly. The chat client,
+moderation, the timeline knowledge index, sessions, save analytics
+(SaveTable, needs numpy) and the framework adapters (PygameGame, KivyGame,
+DetectiveGameApp, TkinterGame) load on first attribute access, so a
+headless server never pays for asyncio, sqlite3, numpy, Kivy or Tk until
+it uses them.
+
+The package never configures logging; call ``logging.basicConfig`` in
+your game if you want its INFO messages.
+"""
+
+import importlib
+
+from .config import (
+    CHARACTER_NAMES, DATA_DIR, ROOM_CHARACTERS, WidgetConfig, WidgetHost, WidgetPosition, WidgetTheme
+)
+from .state import InvestigationState, OrderedSet
+from .events import CallbackQueue, EventBus
+from .metrics import (
+    DEFAULT_METRICS, Histogram, Metrics, profile_session, prometheus_file_exporter, serve_prometheus
+)
+from .persistence import JournalOp, StatePersistence, decode_state_snapshot, encode_state_snapshot
+from .resilience import (
+    DEFAULT_RESILIENCE, HEALTH_PATH, BreakerState, CircuitBreaker, CircuitOpenError, Resilience,
+    RetryPolicy
+)
+from .widget import BlackwoodWidget, WidgetResult, WidgetUrlBuilder
+
+# name -> submodule, imported on first access (PEP 562)
+_LAZY = {
+    'SharedStateStore': 'shared_state',
+    'WebviewHost': 'webview',
+    'run_webview_host': 'webview',
+    'ChatResponse': 'chat',
+    'ConnectionPool': 'chat',
+    'HistoryPolicy': 'chat',
+    'ConversationHistory': 'chat',
+    'ResponseCache': 'chat',
+    'ChatStream': 'chat',
+    'SingleFlight': 'chat',
+    'BlackwoodChatClient': 'chat',
+    'ABUSE_PHRASES_PATH': 'moderation',
+    'PhraseMatcher': 'moderation',
+    'ModerationResult': 'moderation',
+    'AbusePrefilter': 'moderation',
+    'default_prefilter': 'moderation',
+    'FALLBACK_RESPONSES_PATH': 'fallback',
+    'FallbackResponder': 'fallback',
+    'default_fallback': 'fallback',
+    'TIMELINE_PATH': 'knowledge',
+    'KnowledgeIndex': 'knowledge',
+    'default_knowledge': 'knowledge',
+    'TimerWheel': 'cooldowns',
+    'OfflineEvent': 'cooldowns',
+    'CooldownManager': 'cooldowns',
+    'PREFETCH_QUESTIONS': 'prefetch',
+    'Prefetcher': 'prefetch',
+    'InvestigationSession': 'sessions',
+    'SessionManager': 'sessions',
+    # Needs numpy
+    'SaveTable': 'analytics',
+    # Framework adapters: importing these needs the framework installed
+    'PygameGame': 'pygame_adapter',
+    'KivyGame': 'kivy_adapter',
+    'DetectiveGameApp': 'kivy_adapter',
+    'TkinterGame': 'tkinter_adapter',
+}
+
+# Need a third-party package installed
+_OPTIONAL = frozenset({'SaveTable', 'PygameGame', 'KivyGame', 'DetectiveGameApp', 'TkinterGame'})
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+# Star-imports stay headless and stdlib-only: the adapters and analytics are left out
+__all__ = [
+    'CHARACTER_NAMES', 'DATA_DIR', 'ROOM_CHARACTERS', 'WidgetConfig', 'WidgetHost',
+    'WidgetPosition', 'WidgetTheme', 'InvestigationState', 'OrderedSet', 'CallbackQueue',
+    'EventBus', 'DEFAULT_METRICS', 'Histogram', 'Metrics', 'profile_session',
+    'prometheus_file_exporter', 'serve_prometheus', 'JournalOp', 'StatePersistence',
+    'decode_state_snapshot', 'encode_state_snapshot', 'DEFAULT_RESILIENCE', 'HEALTH_PATH',
+    'BreakerState', 'CircuitBreaker', 'CircuitOpenError', 'Resilience', 'RetryPolicy',
+    'BlackwoodWidget', 'WidgetResult', 'WidgetUrlBuilder',
+    *(name for name in _LAZY if name not in _OPTIONAL)
+]
@@ -0,0 +1,63 @@
+"""Command-line demo and the webview helper entry point"""
+
+import logging
+import sys
+from typing import List, Optional
+
+from .config import WidgetConfig, WidgetPosition, WidgetTheme
+from .webview import run_webview_host
+from .widget import BlackwoodWidget
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--webview-host']:
+        return run_webview_host(argv[1:])
+    
+    # The library never configures logging itself; the demo does
+    logging.basicConfig(level=logging.INFO)
+    
+    # Example usage
+    config = WidgetConfig(
+        theme=WidgetTheme.SEPIA,
+        position=WidgetPosition.BOTTOM_RIGHT,
+        enable_voice=True
+    )
+    
+    widget = BlackwoodWidget(config)
+    
+    # Set up callbacks
+    def on_character_selected(character_id):
+        print(f"Character selected: {character_id}")
+    
+    def on_evidence_found(evidence):
+        print(f"Evidence found: {evidence}")
+    
+    def on_investigation_progress(progress):
+        print(f"Investigation progress: {progress}%")
+    
+    widget.on_character_selected = on_character_selected
+    widget.on_evidence_found = on_evidence_found
+    widget.on_investigation_progress = on_investigation_progress
+    
+    # Example interactions
+    print("Starting investigation...")
+    
+    # Start room investigation
+    widget.start_room_investigation("study")
+    
+    # Add evidence
+    widget.add_evidence("Mysterious letter")
+    
+    # Get summary
+    summary = widget.get_investigation_summary()
+    print(f"Investigation summary: {summary}")
+    
+    # Save state
+    widget.save_state("my_investigation.json")
+    
+    # Load state
+    widget.load_state("my_investigation.json")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
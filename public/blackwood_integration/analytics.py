@@ -0,0 +1,373 @@
+"""Read-only columnar analytics over many saved investigations (requires numpy)"""
+
+import fnmatch
+import io
+import logging
+import math
+import os
+import struct
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Callable, Iterable, Tuple
+
+import numpy as np
+
+from .config import CHARACTER_NAMES, ROOM_CHARACTERS
+from .persistence import JournalOp, StatePersistence, _I32, _atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Flag column order
+SUSPECTS = tuple(CHARACTER_NAMES)
+ROOMS = tuple(ROOM_CHARACTERS)
+_SUSPECT_INDEX = {cid: i for i, cid in enumerate(SUSPECTS)}
+_ROOM_INDEX = {room: i for i, room in enumerate(ROOMS)}
+
+_CACHE_VERSION = 2
+_CHUNK = 256
+
+# Files _read_save reads for one save, fingerprinted together for the cache
+_SAVE_FILES = ('', '.bin', '.journal', '.journal.old')
+
+def _read_save(path: str) -> Tuple:
+    """One row: progress, suspect bits, room bits, evidence count, timestamp, started, completed"""
+    filename = path[:-4] if path.endswith('.bin') else path
+    
+    # Only the journal says when play started and when progress hit 100;
+    # collected during read's own replay
+    started = completed = float('nan')
+    
+    def on_record(op: int, record_time: float, payload: bytes) -> None:
+        nonlocal started, completed
+        if not started <= record_time:
+            started = record_time
+        if (op == JournalOp.PROGRESS and not completed <= record_time
+                and _I32.unpack(payload)[0] >= 100):
+            completed = record_time
+    
+    state_data = StatePersistence.read(filename, on_record)
+    inv = state_data['investigation_state']
+    progress = inv.get('progress', 0)
+    timestamp = float(state_data.get('timestamp', 0.0))
+    
+    suspects = 0
+    for cid in inv.get('suspects_interviewed') or ():
+        index = _SUSPECT_INDEX.get(cid)
+        if index is not None:
+            suspects |= 1 << index
+    rooms = 0
+    for room in inv.get('rooms_investigated') or ():
+        index = _ROOM_INDEX.get(room)
+        if index is not None:
+            rooms |= 1 << index
+    
+    # Completed before the last compaction: the snapshot time is the best bound
+    if progress >= 100 and math.isnan(completed):
+        completed = timestamp
+    return (progress, suspects, rooms, len(inv.get('evidence_collected') or ()),
+            timestamp, started, completed)
+
+def _read_chunk(paths: List[str]) -> List[Optional[Tuple]]:
+    rows = []
+    for path in paths:
+        try:
+            rows.append(_read_save(path))
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            logger.warning("Skipping unreadable save %s: %s", path, e)
+            rows.append(None)
+    return rows
+
+def _find_saves(directory: str, pattern: str) -> List[Tuple[str, List[float], List[int]]]:
+    """(path, mtimes, sizes) of every file under directory matching pattern.
+    
+    mtimes and sizes cover the snapshot, its .bin twin and both journals
+    (0.0 and -1 when missing): a journaled save changes only its journal.
+    Siblings are looked up in the directory listing, so missing ones cost
+    no stat call.
+    """
+    found = []
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as listing:
+            entries = {entry.name: entry for entry in listing}
+        for name, entry in entries.items():
+            if entry.is_dir(follow_symlinks=False):
+                pending.append(entry.path)
+            elif fnmatch.fnmatch(name, pattern):
+                base = name[:-4] if name.endswith('.bin') else name
+                mtimes, sizes = [], []
+                for suffix in _SAVE_FILES:
+                    sibling = entries.get(base + suffix)
+                    if sibling is None:
+                        mtimes.append(0.0)
+                        sizes.append(-1)
+                    else:
+                        stat = sibling.stat()
+                        mtimes.append(stat.st_mtime)
+                        sizes.append(stat.st_size)
+                found.append((entry.path, mtimes, sizes))
+    found.sort()
+    return found
+
+def _pack_strings(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """UTF-8 blob plus end offsets: far smaller than a fixed-width unicode array"""
+    encoded = [value.encode('utf-8') for value in values]
+    ends = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), ends
+
+def _unpack_strings(blob: np.ndarray, ends: np.ndarray) -> List[str]:
+    data = blob.tobytes()
+    starts = np.concatenate(([0], ends[:-1])).tolist()
+    return [data[start:end].decode('utf-8') for start, end in zip(starts, ends.tolist())]
+
+class SaveTable:
+    """Many save files decoded into NumPy columns, one row per save.
+    
+    Columns: ``progress`` (int16), ``suspects`` and ``rooms`` (bool, one
+    column per entry in SUSPECTS / ROOMS), ``evidence`` (count, int32),
+    ``timestamp`` (last save), ``started`` and ``completed`` (epoch
+    seconds; completed is NaN until progress reaches 100, started is NaN
+    unless the save has a journal, the only record of when play began),
+    ``group`` (int32 code into ``groups``) and ``paths``.
+    
+    Scanning only reads files; it never touches a widget, so stale saves
+    are reported as they are instead of being reset. Aggregates are whole
+    column operations.
+    """
+    
+    def __init__(self, paths: List[str], progress: np.ndarray, suspects: np.ndarray,
+                 rooms: np.ndarray, evidence: np.ndarray, timestamp: np.ndarray,
+                 started: np.ndarray, completed: np.ndarray,
+                 group: Optional[np.ndarray] = None, groups: Optional[List[str]] = None):
+        self.paths = paths
+        self.progress = progress
+        self.suspects = suspects
+        self.rooms = rooms
+        self.evidence = evidence
+        self.timestamp = timestamp
+        self.started = started
+        self.completed = completed
+        if group is None:
+            group = np.arange(len(paths), dtype=np.int32)
+            groups = list(paths)
+        self.group = group
+        self.groups = groups
+    
+    @classmethod
+    def _from_rows(cls, paths: List[str], rows: List[Tuple]) -> 'SaveTable':
+        if rows:
+            progress, suspects, rooms, evidence, timestamp, started, completed = zip(*rows)
+        else:
+            progress = suspects = rooms = evidence = timestamp = started = completed = ()
+        suspect_bits = np.array(suspects, dtype=np.int64)
+        room_bits = np.array(rooms, dtype=np.int64)
+        return cls(
+            paths,
+            np.array(progress, dtype=np.int16),
+            (suspect_bits[:, None] >> np.arange(len(SUSPECTS))) & 1 == 1,
+            (room_bits[:, None] >> np.arange(len(ROOMS))) & 1 == 1,
+            np.array(evidence, dtype=np.int32),
+            np.array(timestamp, dtype=np.float64),
+            np.array(started, dtype=np.float64),
+            np.array(completed, dtype=np.float64)
+        )
+    
+    @classmethod
+    def scan(cls, directory: str, pattern: str = '*.json', workers: Optional[int] = None,
+             cache: Optional[str] = None,
+             group: Optional[Callable[[str], str]] = None) -> 'SaveTable':
+        """Decode every save under directory on a thread pool.
+        
+        With cache set, rows for saves whose files (snapshot, .bin and
+        journals) all have unchanged mtimes and sizes are taken from that .npz and the cache is rewritten afterwards, so
+        repeat scans only decode new or modified saves. group(path) names
+        the player a save belongs to (default: each save on its own); it
+        is used by time_to_completion.
+        """
+        found = _find_saves(directory, pattern)
+        paths = [path for path, _, _ in found]
+        cached = cls._load_cache(cache) if cache and os.path.exists(cache) else None
+        
+        # Rows still valid in the cache, as (index into found, index into cache)
+        reused: List[int] = []
+        reused_from: List[int] = []
+        todo = list(range(len(paths)))
+        if cached is not None:
+            previous, mtimes, sizes = cached
+            mtimes, sizes = mtimes.tolist(), sizes.tolist()
+            known = {path: j for j, path in enumerate(previous.paths)}
+            todo = []
+            for i, (path, mtime, size) in enumerate(found):
+                j = known.get(path)
+                if j is not None and mtimes[j] == mtime and sizes[j] == size:
+                    reused.append(i)
+                    reused_from.append(j)
+                else:
+                    todo.append(i)
+        
+        decoded: List[int] = []
+        rows: List[Tuple] = []
+        if todo:
+            chunks = [todo[i:i + _CHUNK] for i in range(0, len(todo), _CHUNK)]
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="blackwood-analytics") as executor:
+                results = executor.map(lambda chunk: _read_chunk([paths[i] for i in chunk]), chunks)
+                for chunk, chunk_rows in zip(chunks, results):
+                    for i, row in zip(chunk, chunk_rows):
+                        if row is not None:
+                            decoded.append(i)
+                            rows.append(row)
+            if len(decoded) < len(todo):
+                logger.warning("Skipped %d unreadable saves", len(todo) - len(decoded))
+        
+        table = cls._from_rows([paths[i] for i in decoded], rows)
+        if reused:
+            table = cls._concat(previous._take(np.array(reused_from, dtype=np.int64)), table)
+            order = np.argsort(np.array(reused + decoded, dtype=np.int64), kind='stable')
+            table = table._take(order)
+        if group is not None:
+            table.set_groups(group)
+        # Rewrite the cache only if a save was added, changed or removed
+        if cache and (todo or cached is None or len(previous.paths) != len(reused)):
+            kept = sorted(reused + decoded)
+            try:
+                table._write_cache(cache, np.array([found[i][1] for i in kept], dtype=np.float64),
+                                   np.array([found[i][2] for i in kept], dtype=np.int64))
+            except OSError as e:
+                logger.error("Could not write analytics cache %s: %s", cache, e)
+        logger.info("Scanned %d saves (%d decoded) in %s", len(table), len(todo), directory)
+        return table
+    
+    _COLUMNS = ('progress', 'suspects', 'rooms', 'evidence', 'timestamp', 'started', 'completed')
+    
+    def _take(self, indices: np.ndarray) -> 'SaveTable':
+        """Rows at indices, each save in its own group"""
+        return SaveTable([self.paths[i] for i in indices.tolist()],
+                         *(getattr(self, name)[indices] for name in self._COLUMNS))
+    
+    @classmethod
+    def _concat(cls, first: 'SaveTable', second: 'SaveTable') -> 'SaveTable':
+        return cls(first.paths + second.paths,
+                   *(np.concatenate((getattr(first, name), getattr(second, name)))
+                     for name in cls._COLUMNS))
+    
+    def set_groups(self, group: Callable[[str], str]) -> None:
+        """Assign each save to a player: group(path) -> player id"""
+        codes: Dict[str, int] = {}
+        self.group = np.fromiter((codes.setdefault(group(path), len(codes)) for path in self.paths),
+                                 dtype=np.int32, count=len(self.paths))
+        self.groups = list(codes)
+    
+    # Cache
+    
+    def _write_cache(self, path: str, mtimes: np.ndarray, sizes: np.ndarray) -> None:
+        blob, ends = _pack_strings(self.paths)
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, version=np.int32(_CACHE_VERSION), suspect_ids=np.array(SUSPECTS),
+            room_ids=np.array(ROOMS), path_blob=blob, path_ends=ends, mtimes=mtimes, sizes=sizes,
+            progress=self.progress, suspects=np.packbits(self.suspects, axis=1),
+            rooms=np.packbits(self.rooms, axis=1), evidence=self.evidence,
+            timestamp=self.timestamp, started=self.started, completed=self.completed
+        )
+        _atomic_write(path, buffer.getvalue(), fsync=False)
+    
+    @classmethod
+    def _load_cache(cls, path: str) -> Optional[Tuple['SaveTable', np.ndarray, np.ndarray]]:
+        try:
+            with np.load(path) as data:
+                if (int(data['version']) != _CACHE_VERSION
+                        or tuple(data['suspect_ids']) != SUSPECTS
+                        or tuple(data['room_ids']) != ROOMS):
+                    logger.info("Analytics cache %s is outdated, rescanning", path)
+                    return None
+                table = cls(
+                    _unpack_strings(data['path_blob'], data['path_ends']),
+                    data['progress'],
+                    np.unpackbits(data['suspects'], axis=1, count=len(SUSPECTS)).astype(bool),
+                    np.unpackbits(data['rooms'], axis=1, count=len(ROOMS)).astype(bool),
+                    data['evidence'], data['timestamp'], data['started'], data['completed']
+                )
+                return table, data['mtimes'], data['sizes']
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile, zlib.error) as e:
+            logger.warning("Ignoring unreadable analytics cache %s: %s", path, e)
+            return None
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['SaveTable']:
+        """Table from a cache written by scan(cache=...), without touching the saves"""
+        cached = cls._load_cache(path)
+        return None if cached is None else cached[0]
+    
+    # Aggregates
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def progress_histogram(self, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """(counts, edges) of progress over 0-100"""
+        return np.histogram(self.progress, bins=bins, range=(0, 100))
+    
+    def progress_percentiles(self, q: Iterable[float] = (25, 50, 75, 90, 99)) -> Dict[float, float]:
+        if not len(self):
+            return {}
+        q = list(q)
+        return dict(zip(q, np.percentile(self.progress, q).tolist()))
+    
+    def suspect_rates(self) -> Dict[str, float]:
+        """Share of saves that interviewed each suspect"""
+        if not len(self):
+            return {cid: 0.0 for cid in SUSPECTS}
+        return dict(zip(SUSPECTS, self.suspects.mean(axis=0).tolist()))
+    
+    def room_funnel(self, order: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Saves still in the funnel after each room, in order.
+        
+        A save stays in at step k if it investigated every room up to and
+        including step k. The default order is most to least visited.
+        """
+        if order is None:
+            order = [ROOMS[i] for i in np.argsort(-self.rooms.sum(axis=0), kind='stable')]
+        columns = [_ROOM_INDEX[room] for room in order]
+        reached = np.logical_and.accumulate(self.rooms[:, columns], axis=1).sum(axis=0)
+        previous = np.concatenate(([len(self)], reached[:-1]))
+        funnel = []
+        for room, count, before in zip(order, reached.tolist(), previous.tolist()):
+            funnel.append({
+                'room': room,
+                'reached': count,
+                'share': count / len(self) if len(self) else 0.0,
+                'drop_off': 1.0 - count / before if before else 0.0
+            })
+        return funnel
+    
+    def time_to_completion(self) -> np.ndarray:
+        """Seconds from first start to first completion per group that completed.
+        
+        Groups with no journaled start (plain snapshots only) are left out
+        rather than reported as 0 s.
+        """
+        count = len(self.groups)
+        started = np.full(count, np.inf)
+        completed = np.full(count, np.inf)
+        # fmin skips the NaNs of saves without a start or a completion
+        np.fmin.at(started, self.group, self.started)
+        np.fmin.at(completed, self.group, self.completed)
+        done = np.isfinite(started) & np.isfinite(completed)
+        return completed[done] - started[done]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Headline numbers in one dict, ready for JSON"""
+        durations = self.time_to_completion()
+        return {
+            'saves': len(self),
+            'players': len(self.groups),
+            'mean_progress': float(self.progress.mean()) if len(self) else 0.0,
+            'completion_rate': float((self.progress >= 100).mean()) if len(self) else 0.0,
+            'median_evidence': float(np.median(self.evidence)) if len(self) else 0.0,
+            'median_time_to_completion': float(np.median(durations)) if len(durations) else None,
+            'latest_save': float(self.timestamp.max()) if len(self) else None,
+            'generated_at': time.time()
+        }
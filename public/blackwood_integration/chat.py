@@ -0,0 +1,1044 @@
+"""In-process /api/chat client: pooled connections, history, caching and streaming"""
+
+import threading
+import time
+import json
+import urllib.parse
+import logging
+import re
+import hashlib
+import sqlite3
+import asyncio
+import collections
+import http.client
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, List, Any, Callable, Iterator, AsyncIterator, Tuple, Hashable
+from dataclasses import dataclass
+
+from .config import WidgetConfig
+from .state import InvestigationState
+from .metrics import DEFAULT_METRICS, Metrics
+from .resilience import DEFAULT_RESILIENCE, HEALTH_PATH, Resilience, RetryPolicy
+from .moderation import ModerationResult, default_prefilter
+from .fallback import FallbackResponder, default_fallback
+
+logger = logging.getLogger(__name__)
+
+# Errors that Resilience.call retries for HTTP requests
+_HTTP_ERRORS = (http.client.HTTPException, OSError, ValueError)
+
+@dataclass
+class ChatResponse:
+    """Result of a /api/chat call"""
+    success: bool
+    response: Optional[str] = None
+    error: Optional[str] = None
+    status: int = 0
+    fallback: bool = False  # True for offline replies from FallbackResponder
+
+class ConnectionPool:
+    """Bounded pool of persistent HTTP/1.1 connections to a single host"""
+    
+    def __init__(self, base_url: str, max_connections: int = 4, timeout: float = 15.0):
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {parsed.scheme}")
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip('/')
+        self.timeout = timeout
+        self.max_connections = max_connections
+        
+        self._idle = collections.deque()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._closed = False
+        
+        # Counters
+        self.connections_created = 0
+        self.connections_reused = 0
+    
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.connections_created += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+    
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a connection, returns (connection, reused)"""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Timed out waiting for a pooled connection")
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("Connection pool is closed")
+            if self._idle:
+                self.connections_reused += 1
+                return self._idle.pop(), True
+        return self._new_connection(), False
+    
+    def release(self, conn: http.client.HTTPConnection, reusable: bool = True) -> None:
+        """Return a connection; broken or server-closed ones are discarded"""
+        with self._lock:
+            if reusable and not self._closed:
+                self._idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+        self._slots.release()
+    
+    def close(self) -> None:
+        """Close all idle connections and refuse new ones"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, collections.deque()
+        for conn in idle:
+            conn.close()
+
+def _encode_json(value: Any) -> bytes:
+    """Compact UTF-8 JSON encoding used for request fragments"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+@dataclass
+class HistoryPolicy:
+    """Caps how much conversation history is resent per character.
+    
+    Oldest messages are dropped once either limit is exceeded. If summarize
+    is set it is called as summarize(previous_summary, dropped_messages) and
+    the returned text is kept as a single leading 'system' message.
+    """
+    max_messages: int = 20
+    max_bytes: int = 16 * 1024
+    summarize: Optional[Callable[[Optional[str], List[Dict[str, str]]], str]] = None
+
+class ConversationHistory:
+    """Append-only per-character history that caches each message's JSON bytes.
+    
+    Building a request joins the cached fragments instead of re-encoding the
+    whole list, so per-turn cost is linear in the window, not the session.
+    Request sizes are running totals, so a long session adds no per-turn memory.
+    """
+    
+    def __init__(self, character_id: str, policy: HistoryPolicy = None):
+        self.character_id = character_id
+        self.policy = policy or HistoryPolicy()
+        self._messages = collections.deque()
+        self._fragments = collections.deque()
+        self._fragment_bytes = 0
+        self._summary: Optional[str] = None
+        self._summary_fragment: Optional[bytes] = None
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.turns = 0
+        self.bytes_sent = 0
+        self.messages_evicted = 0
+    
+    def append(self, message_type: str, content: str) -> None:
+        """Append a 'user' or 'character' message and enforce the policy"""
+        message = {'type': message_type, 'content': content}
+        fragment = _encode_json(message)
+        with self._lock:
+            self._messages.append(message)
+            self._fragments.append(fragment)
+            self._fragment_bytes += len(fragment) + 1
+            self._enforce_policy()
+    
+    def _enforce_policy(self) -> None:
+        evicted = []
+        summary_bytes = len(self._summary_fragment) if self._summary_fragment else 0
+        while self._fragments and (
+                len(self._fragments) > self.policy.max_messages or
+                self._fragment_bytes + summary_bytes > self.policy.max_bytes):
+            self._fragment_bytes -= len(self._fragments.popleft()) + 1
+            evicted.append(self._messages.popleft())
+        if not evicted:
+            return
+        self.messages_evicted += len(evicted)
+        if self.policy.summarize:
+            try:
+                self._summary = self.policy.summarize(self._summary, evicted)
+                self._summary_fragment = _encode_json({'type': 'system', 'content': self._summary})
+            except Exception as e:
+                logger.error("History summarisation failed: %s", e)
+    
+    def encoded(self) -> bytes:
+        """JSON array bytes for conversationHistory, built from cached fragments"""
+        with self._lock:
+            if self._summary_fragment is not None:
+                return b'[' + b','.join([self._summary_fragment, *self._fragments]) + b']'
+            return b'[' + b','.join(self._fragments) + b']'
+    
+    def messages(self) -> List[Dict[str, str]]:
+        """Current window as plain dicts (summary first, if any)"""
+        with self._lock:
+            window = [dict(m) for m in self._messages]
+            if self._summary is not None:
+                window.insert(0, {'type': 'system', 'content': self._summary})
+            return window
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary and window as plain data, for parking; see restore()"""
+        with self._lock:
+            return {'summary': self._summary, 'messages': [dict(m) for m in self._messages]}
+    
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Replace the history with to_dict() output"""
+        self.clear()
+        summary = data.get('summary')
+        if summary is not None:
+            with self._lock:
+                self._summary = summary
+                self._summary_fragment = _encode_json({'type': 'system', 'content': summary})
+        for message in data.get('messages', ()):
+            self.append(message['type'], message['content'])
+    
+    @property
+    def bytes_per_turn(self) -> float:
+        """Mean request body bytes per turn; cache hits count as zero"""
+        return self.bytes_sent / self.turns if self.turns else 0.0
+    
+    def record_turn(self, body_bytes: int) -> None:
+        self.turns += 1
+        self.bytes_sent += body_bytes
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._messages.clear()
+            self._fragments.clear()
+            self._fragment_bytes = 0
+            self._summary = None
+            self._summary_fragment = None
+    
+    def __len__(self) -> int:
+        return len(self._messages)
+
+_PROMPT_PUNCTUATION = re.compile(r"[^\w\s']+")
+
+class ResponseCache:
+    """In-process LRU+TTL cache of character replies with an optional SQLite tier.
+    
+    Keys combine character id, normalized prompt text and a fingerprint of
+    the investigation state, so the same canned question only hits the
+    network again once progress or evidence changes.
+    """
+    
+    def __init__(self, max_entries: int = 512, ttl: float = 300.0,
+                 persist_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        
+        # Counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        if persist_path:
+            self._open_db(persist_path)
+    
+    def _open_db(self, path: str) -> None:
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.error("Response cache database unavailable: %s", e)
+            self._db = None
+    
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace"""
+        return ' '.join(_PROMPT_PUNCTUATION.sub(' ', message.lower()).split())
+    
+    @staticmethod
+    def state_fingerprint(state: Optional["InvestigationState"]) -> str:
+        """Short hash of the parts of the investigation state replies depend on"""
+        if state is None:
+            return ''
+        return state.fingerprint
+    
+    def make_key(self, character_id: str, message: str,
+                 state: Optional["InvestigationState"] = None) -> str:
+        return f"{character_id}\x1f{self.normalize(message)}\x1f{self.state_fingerprint(state)}"
+    
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.error("Response cache read error: %s", e)
+                    row = None
+                if row is not None and row[1] > now:
+                    self._store(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return row[0]
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, response: str) -> None:
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, response, expires_at)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                        (key, response, expires_at)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.error("Response cache write error: %s", e)
+    
+    def _store(self, key: str, response: str, expires_at: float) -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def __contains__(self, key: str) -> bool:
+        """Fresh in-memory entry for key; leaves hit/miss counters and LRU order alone"""
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.time()
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class ChatStream:
+    """Iterator over reply text chunks from a streaming /api/chat call.
+    
+    Parses Server-Sent Events line by line with bounded buffers, and falls
+    back to a single chunk if the server answers with plain JSON. Once
+    iteration ends, ``result`` holds the ChatResponse for the whole reply.
+    Breaking out early discards the connection instead of returning it.
+    """
+    
+    MAX_LINE_BYTES = 64 * 1024
+    MAX_EVENT_BYTES = 256 * 1024
+    
+    def __init__(self, client: "BlackwoodChatClient", body: bytes, timeout: Optional[float],
+                 on_complete: Optional[Callable[[ChatResponse], None]] = None,
+                 cached: Optional[str] = None):
+        self._client = client
+        self._body = body
+        self._timeout = timeout
+        self._on_complete = on_complete
+        self._cached = cached
+        self._chunks = self._run()
+        self.result: Optional[ChatResponse] = None
+    
+    def __iter__(self) -> Iterator[str]:
+        return self
+    
+    def __next__(self) -> str:
+        return next(self._chunks)
+    
+    def close(self) -> None:
+        self._chunks.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _events(self, response):
+        """Yield (event, data bytes) pairs from an SSE body"""
+        event, data, size = 'message', [], 0
+        while True:
+            line = response.readline(self.MAX_LINE_BYTES + 1)
+            if not line:
+                return
+            if len(line) > self.MAX_LINE_BYTES:
+                raise ValueError("SSE line exceeds buffer limit")
+            line = line.rstrip(b'\r\n')
+            if not line:
+                if data:
+                    yield event, b'\n'.join(data)
+                event, data, size = 'message', [], 0
+                continue
+            if line.startswith(b':'):
+                continue
+            field, _, value = line.partition(b':')
+            if value.startswith(b' '):
+                value = value[1:]
+            if field == b'event':
+                event = value.decode('utf-8', 'replace')
+            elif field == b'data':
+                size += len(value)
+                if size > self.MAX_EVENT_BYTES:
+                    raise ValueError("SSE event exceeds buffer limit")
+                data.append(value)
+    
+    def _run(self) -> Iterator[str]:
+        parts: List[str] = []
+        result = ChatResponse(success=False, error='Stream ended before completion')
+        conn = None
+        reusable = False
+        try:
+            if self._cached is not None:
+                parts.append(self._cached)
+                result = ChatResponse(success=True, status=200)
+                yield self._cached
+                return
+            
+            started = time.perf_counter()
+            conn, response = self._client._open_stream(self._body, self._timeout)
+            if conn is None:
+                result = response
+                return
+            
+            result.status = response.status
+            if 'text/event-stream' not in (response.getheader('Content-Type') or ''):
+                # Server without streaming support: whole reply as one chunk
+                payload = response.read()
+                reusable = not response.will_close
+                data = json.loads(payload) if payload else {}
+                result = ChatResponse(
+                    success=bool(data.get('success')) and response.status < 400,
+                    error=data.get('error'),
+                    status=response.status
+                )
+                if result.success and data.get('response') is not None:
+                    parts.append(data['response'])
+                    yield data['response']
+                return
+            
+            for event, data in self._events(response):
+                payload = json.loads(data)
+                if event == 'chunk':
+                    text = payload.get('text', '')
+                    if text:
+                        if not parts:
+                            self._client.metrics.observe('chat_stream_first_chunk_seconds',
+                                                         time.perf_counter() - started)
+                        parts.append(text)
+                        yield text
+                elif event == 'done':
+                    result = ChatResponse(success=True, status=response.status)
+                elif event == 'error':
+                    result = ChatResponse(success=False, error=payload.get('error'),
+                                          status=response.status)
+            reusable = not response.will_close
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            logger.error("Chat stream error: %s", e)
+            result = ChatResponse(success=False, error=str(e), status=result.status)
+        finally:
+            if conn is not None:
+                self._client.pool.release(conn, reusable)
+            if result.success:
+                result.response = ''.join(parts)
+            self.result = result
+            if self._on_complete:
+                try:
+                    self._on_complete(result)
+                except Exception as e:
+                    logger.error("Stream completion callback error: %s", e)
+
+class SingleFlight:
+    """Collapses concurrent identical calls into one execution.
+    
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait on the same Future and get the same result.
+    """
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.executed = 0
+        self.coalesced = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]):
+        """Returns (result, shared) where shared is True for followers"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                future.set_running_or_notify_cancel()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+    
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+class BlackwoodChatClient:
+    """In-process dialogue client for /api/chat over keep-alive connections.
+    
+    Reuses WidgetConfig.max_retries/retry_delay for 5xx and network errors.
+    Sync calls block the calling thread; the *_async variants run on a
+    bounded executor sized to the connection pool.
+    """
+    
+    CHAT_PATH = "/api/chat"
+    BATCH_PATH = "/api/chat/batch"
+    ABUSE_PATH = "/api/abuse-detection"
+    HEALTH_PATH = HEALTH_PATH
+    MAX_BATCH_SIZE = 20
+    MAX_LINE_BYTES = 256 * 1024
+    
+    def __init__(self, config: WidgetConfig = None, max_connections: int = 4,
+                 timeout: float = 15.0, history_policy: HistoryPolicy = None,
+                 cache: Optional[ResponseCache] = None, coalesce: bool = True,
+                 metrics: Optional[Metrics] = None, offline_fallback: bool = True,
+                 resilience: Optional[Resilience] = None):
+        self.config = config or WidgetConfig()
+        self.timeout = timeout
+        self.pool = ConnectionPool(self.config.api_url, max_connections, timeout)
+        self.history_policy = history_policy or HistoryPolicy()
+        self.histories: Dict[str, ConversationHistory] = {}
+        self._histories_lock = threading.Lock()
+        self.bytes_sent = 0
+        self.cache = cache
+        self.metrics = metrics or DEFAULT_METRICS
+        # Identical in-flight requests share one upstream call
+        self.single_flight: Optional[SingleFlight] = SingleFlight() if coalesce else None
+        # Retries and breakers are shared with every client and widget on the same backend;
+        # while the chat or health breaker is open, chat is answered locally
+        self.resilience = resilience or DEFAULT_RESILIENCE
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.breaker = self.resilience.breaker(self.config.api_url + self.CHAT_PATH)
+        self.health_breaker = self.resilience.health_breaker(self.config.api_url)
+        self._health_probe = False
+        self.fallback: Optional[FallbackResponder] = self._load_fallback() if offline_fallback else None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Connection': 'keep-alive',
+            'User-Agent': 'BlackwoodManor-Python/1.0.0'
+        }
+        self._stream_headers = dict(self._headers, Accept='text/event-stream, application/json')
+        self._batch_headers = dict(self._headers, Accept='application/x-ndjson, application/json')
+    
+    @staticmethod
+    def _load_fallback() -> Optional[FallbackResponder]:
+        try:
+            return default_fallback()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Offline fallback unavailable: %s", e)
+            return None
+    
+    def _request(self, path: str, body: Optional[bytes], timeout: float, headers: Dict[str, str],
+                 method: str = 'POST'):
+        """Send body on a pooled connection, returns (connection, response).
+        
+        The caller must hand the connection back with pool.release().
+        """
+        conn, reused = self.pool.acquire(timeout)
+        try:
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            conn.timeout = timeout
+            try:
+                conn.request(method, self.pool.base_path + path, body=body, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # Server dropped an idle keep-alive connection: retry once on a fresh one
+                conn.close()
+                conn.request(method, self.pool.base_path + path, body=body, headers=headers)
+                response = conn.getresponse()
+            return conn, response
+        except BaseException:
+            self.pool.release(conn, False)
+            raise
+    
+    def _post(self, path: str, body: bytes, timeout: float):
+        """POST body once on a pooled connection, returns (status, payload bytes)"""
+        conn, response = self._request(path, body, timeout, self._headers)
+        reusable = False
+        try:
+            payload = response.read()
+            reusable = not response.will_close
+            return response.status, payload
+        finally:
+            self.pool.release(conn, reusable)
+    
+    def _post_with_retries(self, path: str, body: bytes, timeout: Optional[float]) -> ChatResponse:
+        timeout = self.timeout if timeout is None else timeout
+        self.metrics.increment('chat_requests_total')
+        
+        def attempt() -> Tuple[int, Dict[str, Any]]:
+            with self.metrics.timer('chat_http_round_trip_seconds'):
+                status, payload = self._post(path, body, timeout)
+            return status, json.loads(payload) if payload else {}
+        
+        try:
+            status, data = self.resilience.call(
+                self.config.api_url + path, attempt, self.retry_policy,
+                failed=lambda result: result[0] >= 500,
+                base_url=self.config.api_url, metric='chat', retry_on=_HTTP_ERRORS
+            )
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            logger.error("Chat request failed: %s", e)
+            self.metrics.increment('chat_errors_total')
+            return ChatResponse(success=False, error=str(e))
+        return ChatResponse(
+            success=bool(data.get('success')) and status < 400,
+            response=data.get('response'),
+            error=data.get('error'),
+            status=status
+        )
+    
+    def send_message(self, character_id: str, message: str,
+                     conversation_history: Optional[List[Dict[str, Any]]] = None,
+                     timeout: Optional[float] = None,
+                     state: Optional[InvestigationState] = None) -> ChatResponse:
+        """Send a message to a character and wait for the reply"""
+        cache_key, cached = self._cache_lookup(character_id, message, state)
+        if cached is not None:
+            return ChatResponse(success=True, response=cached, status=200)
+        
+        result, _, _ = self._send_chat(character_id, message,
+                                       _encode_json(conversation_history or []), timeout)
+        if (cache_key is not None and result.success and result.response is not None
+                and not result.fallback):
+            self.cache.put(cache_key, result.response)
+        return result
+    
+    def _probe_health(self, timeout: Optional[float] = None) -> bool:
+        """GET /api/health once; True if the backend reports ok"""
+        try:
+            conn, response = self._request(self.HEALTH_PATH, None,
+                                           self.timeout if timeout is None else timeout,
+                                           self._headers, method='GET')
+        except (http.client.HTTPException, OSError) as e:
+            logger.warning("Health check failed: %s", e)
+            return False
+        reusable = False
+        try:
+            payload = response.read()
+            reusable = not response.will_close
+            return response.status == 200 and json.loads(payload).get('status') == 'ok'
+        except (http.client.HTTPException, OSError, ValueError):
+            return False
+        finally:
+            self.pool.release(conn, reusable)
+    
+    def check_health(self, timeout: Optional[float] = None) -> bool:
+        """Probe /api/health now and feed the result to the shared health breaker"""
+        healthy = self._probe_health(timeout)
+        self.resilience.report_health(self.config.api_url, healthy)
+        return healthy
+    
+    def start_health_probe(self, interval: float = 15.0) -> None:
+        """Probe /api/health in the background so outages are detected before a chat call"""
+        self.resilience.start_health_probe(self.config.api_url, self._probe_health, interval)
+        self._health_probe = True
+    
+    def _offline(self) -> bool:
+        """True while the backend is considered down and chat should be answered locally"""
+        return self.resilience.is_down(self.config.api_url + self.CHAT_PATH, self.config.api_url)
+    
+    def _offline_response(self, character_id: str, message: str) -> ChatResponse:
+        if self.fallback is None:
+            return ChatResponse(success=False, error='Chat service unavailable')
+        self.metrics.increment('chat_fallback_total')
+        return ChatResponse(success=True, response=self.fallback.reply(character_id, message),
+                            fallback=True)
+    
+    def _cache_lookup(self, character_id: str, message: str,
+                      state: Optional[InvestigationState]) -> Tuple[Optional[str], Optional[str]]:
+        """Returns (cache key, cached reply); both None without a cache"""
+        if self.cache is None:
+            return None, None
+        cache_key = self.cache.make_key(character_id, message, state)
+        cached = self.cache.get(cache_key)
+        self.metrics.increment('chat_cache_hits_total' if cached is not None
+                               else 'chat_cache_misses_total')
+        return cache_key, cached
+    
+    def _send_chat(self, character_id: str, message: str, history_json: bytes,
+                   timeout: Optional[float], owner: Any = None) -> Tuple[ChatResponse, int, bool]:
+        """POST one chat turn, returns (result, request bytes sent, shared).
+        
+        With coalescing on, a request matching one already in flight (same
+        character, normalized message and history) waits for that call
+        instead and reports zero bytes sent. shared is True when that call
+        was made for the same owner (the history being extended), so the
+        exchange is already being recorded there and must not be again.
+        """
+        def send() -> Tuple[ChatResponse, int, Any]:
+            if self._offline():
+                return self._offline_response(character_id, message), 0, owner
+            body = self._encode_chat_body(character_id, message, history_json)
+            self.bytes_sent += len(body)
+            result = self._post_with_retries(self.CHAT_PATH, body, timeout)
+            if not result.success and self._offline():
+                # This failure tripped the breaker: answer locally rather than error out
+                return self._offline_response(character_id, message), len(body), owner
+            return result, len(body), owner
+        
+        if self.single_flight is None:
+            result, sent, _ = send()
+            return result, sent, False
+        key = (character_id, ResponseCache.normalize(message),
+               hashlib.blake2b(history_json, digest_size=16).digest())
+        (result, sent, leader_owner), coalesced = self.single_flight.do(key, send)
+        if coalesced:
+            self.metrics.increment('chat_coalesced_total')
+            return result, 0, owner is not None and owner is leader_owner
+        return result, sent, False
+    
+    @staticmethod
+    def _encode_chat_body(character_id: str, message: str, history_json: bytes,
+                          stream: bool = False) -> bytes:
+        return b''.join((
+            b'{"character":', _encode_json(character_id),
+            b',"message":', _encode_json(message),
+            b',"conversationHistory":', history_json,
+            b',"stream":true}' if stream else b'}'
+        ))
+    
+    def history(self, character_id: str) -> ConversationHistory:
+        """Managed conversation history for a character, created on first use"""
+        with self._histories_lock:
+            history = self.histories.get(character_id)
+            if history is None:
+                history = ConversationHistory(character_id, self.history_policy)
+                self.histories[character_id] = history
+            return history
+    
+    def reset_history(self, character_id: Optional[str] = None) -> None:
+        """Forget one character's history, or all of them"""
+        with self._histories_lock:
+            targets = [self.histories.get(character_id)] if character_id else list(self.histories.values())
+        for history in targets:
+            if history is not None:
+                history.clear()
+    
+    def chat(self, character_id: str, message: str, timeout: Optional[float] = None,
+             state: Optional[InvestigationState] = None,
+             history: Optional[ConversationHistory] = None) -> ChatResponse:
+        """Send a message using the managed per-character history.
+        
+        Pass history to use a caller-owned history instead (e.g. one per
+        player session). The exchange is appended to the history only if the
+        reply succeeds, and only once when identical concurrent calls on the
+        same history are coalesced. Cache hits skip the network and record a
+        zero-byte turn.
+        """
+        if history is None:
+            history = self.history(character_id)
+        cache_key, cached = self._cache_lookup(character_id, message, state)
+        shared = False
+        if cached is not None:
+            history.record_turn(0)
+            result = ChatResponse(success=True, response=cached, status=200)
+        else:
+            result, sent, shared = self._send_chat(character_id, message, history.encoded(),
+                                                   timeout, owner=history)
+            history.record_turn(sent)
+            if (cache_key is not None and result.success and result.response is not None
+                    and not result.fallback):
+                self.cache.put(cache_key, result.response)
+        
+        # Offline replies are not real context for the model, keep them out of history
+        if not shared and result.success and result.response is not None and not result.fallback:
+            history.append('user', message)
+            history.append('character', result.response)
+        return result
+    
+    def _open_stream(self, body: bytes, timeout: Optional[float], path: str = CHAT_PATH,
+                     headers: Optional[Dict[str, str]] = None):
+        """Start a streaming request, retrying until the first response byte.
+        
+        Returns (connection, response) or (None, failed ChatResponse).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        headers = headers or self._stream_headers
+        
+        def discard(result) -> None:
+            self.pool.release(result[0], False)
+        
+        try:
+            return self.resilience.call(
+                self.config.api_url + path,
+                lambda: self._request(path, body, timeout, headers),
+                self.retry_policy,
+                failed=lambda result: result[1].status >= 500,
+                discard=discard,
+                base_url=self.config.api_url, metric='chat', retry_on=_HTTP_ERRORS
+            )
+        except (http.client.HTTPException, OSError) as e:
+            logger.error("Chat stream failed: %s", e)
+            self.metrics.increment('chat_errors_total')
+            return None, ChatResponse(success=False, error=str(e))
+    
+    def stream(self, character_id: str, message: str, timeout: Optional[float] = None,
+               state: Optional[InvestigationState] = None) -> "ChatStream":
+        """Stream a reply chunk by chunk using the managed per-character history.
+        
+        Usage: ``for chunk in client.stream('lily-chen', 'Where were you?'): ...``
+        """
+        history = self.history(character_id)
+        cache_key, cached = self._cache_lookup(character_id, message, state)
+        
+        def on_complete(result: ChatResponse):
+            if not result.success or result.response is None:
+                return
+            if cache_key is not None and cached is None:
+                self.cache.put(cache_key, result.response)
+            history.append('user', message)
+            history.append('character', result.response)
+        
+        if cached is not None:
+            history.record_turn(0)
+            return ChatStream(self, b'', timeout, on_complete, cached=cached)
+        if self.fallback is not None and self._offline():
+            offline = self._offline_response(character_id, message)
+            return ChatStream(self, b'', timeout, cached=offline.response)
+        
+        body = self._encode_chat_body(character_id, message, history.encoded(), stream=True)
+        history.record_turn(len(body))
+        self.bytes_sent += len(body)
+        return ChatStream(self, body, timeout, on_complete)
+    
+    async def stream_async(self, character_id: str, message: str,
+                           timeout: Optional[float] = None,
+                           state: Optional[InvestigationState] = None) -> AsyncIterator[str]:
+        """asyncio variant of stream: ``async for chunk in client.stream_async(...)``"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        chat_stream = self.stream(character_id, message, timeout, state)
+        finished = object()
+        try:
+            while True:
+                chunk = await loop.run_in_executor(executor, next, chat_stream, finished)
+                if chunk is finished:
+                    break
+                yield chunk
+        finally:
+            await loop.run_in_executor(executor, chat_stream.close)
+    
+    def moderate(self, message: str, character_name: Optional[str] = None,
+                 timeout: Optional[float] = None) -> ModerationResult:
+        """Classify a player message, escalating to the server only when needed.
+        
+        Clear hits and passes are decided by the local pre-filter; ambiguous
+        messages go to /api/abuse-detection. If that call fails the local
+        ambiguous verdict is returned so the caller can decide.
+        """
+        local = default_prefilter().classify(message)
+        if not local.escalate or self.resilience.is_down(self.config.api_url + self.ABUSE_PATH,
+                                                           self.config.api_url):
+            return local
+        
+        self.metrics.increment('moderation_escalations_total')
+        body = _encode_json({'message': message, 'characterName': character_name})
+        try:
+            with self.metrics.timer('moderation_http_round_trip_seconds'):
+                status, payload = self.resilience.call(
+                    self.config.api_url + self.ABUSE_PATH,
+                    lambda: self._post(self.ABUSE_PATH, body,
+                                       self.timeout if timeout is None else timeout),
+                    RetryPolicy(max_retries=0),
+                    failed=lambda result: result[0] >= 500,
+                    base_url=self.config.api_url, metric='moderation', retry_on=_HTTP_ERRORS
+                )
+            data = json.loads(payload) if payload else {}
+            if status >= 400 or not data.get('success'):
+                raise ValueError(data.get('error') or f"Abuse detection failed ({status})")
+            verdict = data.get('data') or {}
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            logger.warning("Abuse detection escalation failed: %s", e)
+            return local
+        
+        is_abusive = bool(verdict.get('isAbusive'))
+        is_irrelevant = bool(verdict.get('isIrrelevant'))
+        return ModerationResult(
+            verdict='abusive' if is_abusive else 'irrelevant' if is_irrelevant else 'clean',
+            is_abusive=is_abusive,
+            is_irrelevant=is_irrelevant,
+            severity=verdict.get('severity', 'low'),
+            confidence=verdict.get('confidence', 0),
+            reason=verdict.get('reason', ''),
+            suggested_response=verdict.get('suggestedResponse'),
+            detected_intent=verdict.get('detectedIntent', ''),
+            source='server'
+        )
+    
+    def send_batch(self, items: List[Tuple], timeout: Optional[float] = None
+                   ) -> Iterator[Tuple[int, ChatResponse]]:
+        """Send many (character_id, message[, conversation_history]) items at once.
+        
+        Yields (index, ChatResponse) pairs in completion order. Uses the
+        /api/chat/batch endpoint in chunks of MAX_BATCH_SIZE; against a server
+        without it, falls back to concurrent single requests.
+        """
+        for start in range(0, len(items), self.MAX_BATCH_SIZE):
+            chunk = items[start:start + self.MAX_BATCH_SIZE]
+            for index, result in self._send_batch_chunk(chunk, timeout):
+                yield start + index, result
+    
+    def _send_batch_chunk(self, items: List[Tuple], timeout: Optional[float]):
+        body = b''.join((
+            b'{"requests":[',
+            b','.join(
+                b'{"character":' + _encode_json(item[0]) +
+                b',"message":' + _encode_json(item[1]) +
+                b',"conversationHistory":' + _encode_json(item[2] if len(item) > 2 and item[2] else []) +
+                b'}'
+                for item in items
+            ),
+            b']}'
+        ))
+        self.bytes_sent += len(body)
+        conn, response = self._open_stream(body, timeout, self.BATCH_PATH, self._batch_headers)
+        if conn is None:
+            for index in range(len(items)):
+                yield index, response
+            return
+        
+        if response.status == 404:
+            # Older deployment without the batch endpoint
+            response.read()
+            self.pool.release(conn, not response.will_close)
+            yield from self._send_individually(items, timeout)
+            return
+        
+        pending = set(range(len(items)))
+        reusable = False
+        try:
+            while pending:
+                line = response.readline(self.MAX_LINE_BYTES + 1)
+                if not line:
+                    break
+                if len(line) > self.MAX_LINE_BYTES:
+                    raise ValueError("Batch result line exceeds buffer limit")
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                index = data.get('index')
+                if index not in pending:
+                    # Non-streaming error body (e.g. 400) or unknown index
+                    error = data.get('error', 'Malformed batch response')
+                    for missing in sorted(pending):
+                        yield missing, ChatResponse(success=False, error=error, status=response.status)
+                    pending.clear()
+                    break
+                pending.discard(index)
+                yield index, ChatResponse(
+                    success=bool(data.get('success')),
+                    response=data.get('response'),
+                    error=data.get('error'),
+                    status=response.status
+                )
+            if not pending:
+                response.read()
+                reusable = not response.will_close
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            logger.error("Batch chat error: %s", e)
+        finally:
+            self.pool.release(conn, reusable)
+        
+        for index in sorted(pending):
+            yield index, ChatResponse(success=False, error='Missing from batch response')
+    
+    def _send_individually(self, items: List[Tuple], timeout: Optional[float]):
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self.send_message, item[0], item[1],
+                            item[2] if len(item) > 2 else None, timeout): index
+            for index, item in enumerate(items)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool.max_connections,
+                                                    thread_name_prefix="blackwood-chat")
+            return self._executor
+    
+    async def send_message_async(self, character_id: str, message: str,
+                                 conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                 timeout: Optional[float] = None,
+                                 state: Optional[InvestigationState] = None) -> ChatResponse:
+        """asyncio variant of send_message"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            lambda: self.send_message(character_id, message, conversation_history, timeout, state)
+        )
+    
+    async def chat_async(self, character_id: str, message: str, timeout: Optional[float] = None,
+                         state: Optional[InvestigationState] = None) -> ChatResponse:
+        """asyncio variant of chat"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), lambda: self.chat(character_id, message, timeout, state)
+        )
+    
+    def close(self) -> None:
+        """Close pooled connections and the async executor"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        if self._health_probe:
+            self.resilience.stop_health_probe(self.config.api_url)
+            self._health_probe = False
+        self.pool.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
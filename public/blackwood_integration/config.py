@@ -0,0 +1,63 @@
+"""Widget configuration enums, WidgetConfig and the shared character/room tables"""
+
+import os
+from types import MappingProxyType
+from dataclasses import dataclass
+from enum import Enum
+
+# JSON tables shared with the Next.js app (public/data)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+class WidgetTheme(Enum):
+    SEPIA = "sepia"
+    AGED = "aged"
+    CLASSIC = "classic"
+
+class WidgetPosition(Enum):
+    BOTTOM_RIGHT = "bottom-right"
+    BOTTOM_LEFT = "bottom-left"
+    TOP_RIGHT = "top-right"
+    TOP_LEFT = "top-left"
+
+class WidgetHost(Enum):
+    BROWSER = "browser"  # webbrowser.open per show_widget
+    WEBVIEW = "webview"  # one embedded window reused for the whole session
+
+@dataclass
+class WidgetConfig:
+    """Configuration for the detective widget"""
+    api_url: str = "https://blackwood-chat-app.vercel.app"
+    theme: WidgetTheme = WidgetTheme.SEPIA
+    position: WidgetPosition = WidgetPosition.BOTTOM_RIGHT
+    enable_voice: bool = True
+    show_character_selector: bool = True
+    is_interrogation_mode: bool = False
+    width: str = "400px"
+    height: str = "600px"
+    max_retries: int = 3
+    retry_delay: float = 1.0
+    non_blocking: bool = False  # Launch/retry on a worker thread, return Futures
+    host: WidgetHost = WidgetHost.BROWSER
+    coalesce_events: bool = False  # Hold progress events until process_callbacks
+
+# Character mapping (shared by every widget and session, read-only)
+CHARACTER_NAMES = MappingProxyType({
+    'james-blackwood': 'James Blackwood',
+    'marcus-reynolds': 'Marcus Reynolds',
+    'elena-rodriguez': 'Dr. Elena Rodriguez',
+    'lily-chen': 'Lily Chen',
+    'thompson-butler': 'Mr. Thompson'
+})
+
+# Room to character mapping
+ROOM_CHARACTERS = MappingProxyType({
+    'study': 'james-blackwood',
+    'office': 'marcus-reynolds',
+    'library': 'elena-rodriguez',
+    'art_studio': 'lily-chen',
+    'kitchen': 'thompson-butler',
+    'mansion_entrance': 'thompson-butler',
+    'dining_room': 'thompson-butler',
+    'bedroom': 'james-blackwood',
+    'basement': 'marcus-reynolds'
+})
@@ -0,0 +1,334 @@
+"""Per-player rate limits and character cooldowns, like lib/characterStatus.ts"""
+
+import collections
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any, Callable, Hashable, Tuple
+
+from .moderation import ModerationResult
+
+logger = logging.getLogger(__name__)
+
+# Same durations as CharacterStatusManager.shouldPutOffline
+OFFLINE_DURATIONS = {'high': 60.0, 'medium': 45.0}
+DEFAULT_OFFLINE_DURATION = 40.0
+DEFAULT_OFFLINE_MESSAGE = 'Character is offended and needs a moment.'
+
+class TimerWheel:
+    """Hierarchical timing wheel: O(1) schedule/cancel, amortised O(1) expiry.
+    
+    Level 0 has ``slots`` buckets of ``tick`` seconds; each level above
+    covers ``slots`` times the span of the one below and is cascaded down
+    as time reaches it. Deadlines are rounded up to a tick, so timers fire
+    up to one tick late but never early. Keys beyond the top level's range
+    park in its furthest slot and are re-placed when it cascades.
+    """
+    
+    def __init__(self, tick: float = 0.5, slots: int = 64, levels: int = 4,
+                 now: float = 0.0):
+        if tick <= 0 or slots < 2 or levels < 1:
+            raise ValueError("tick must be positive, slots >= 2 and levels >= 1")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._spans = [slots ** level for level in range(levels)]
+        self._wheels: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+        self._current = int(now // tick)
+    
+    def _place(self, key: Hashable, due: int) -> None:
+        delta = due - self._current
+        for level, span in enumerate(self._spans):
+            if delta < span * self.slots:
+                index = (due // span) % self.slots
+                break
+        else:
+            # Beyond the wheel: wait in the furthest top-level slot
+            span = self._spans[-1]
+            level = self.levels - 1
+            index = (self._current // span) % self.slots
+        self._wheels[level][index][key] = due
+        self._where[key] = (level, index)
+    
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """Fire key at deadline (a clock value); replaces any earlier timer for key"""
+        self.cancel(key)
+        self._place(key, max(math.ceil(deadline / self.tick), self._current + 1))
+    
+    def cancel(self, key: Hashable) -> bool:
+        where = self._where.pop(key, None)
+        if where is None:
+            return False
+        level, index = where
+        del self._wheels[level][index][key]
+        return True
+    
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel to now and return the keys whose deadline has passed"""
+        target = int(now // self.tick)
+        fired: List[Hashable] = []
+        while self._current < target and self._where:
+            self._current += 1
+            current = self._current
+            for level in range(self.levels - 1, 0, -1):
+                span = self._spans[level]
+                if current % span == 0:
+                    bucket = self._wheels[level][(current // span) % self.slots]
+                    if bucket:
+                        entries = list(bucket.items())
+                        bucket.clear()
+                        for key, due in entries:
+                            self._place(key, due)
+            bucket = self._wheels[0][current % self.slots]
+            if bucket:
+                fired.extend(bucket)
+                for key in bucket:
+                    del self._where[key]
+                bucket.clear()
+        # Nothing left to fire: jump straight to now and drop the grown table
+        if not self._where:
+            self._current = max(self._current, target)
+            self._where = {}
+        return fired
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+    
+    def __len__(self) -> int:
+        return len(self._where)
+
+@dataclass(frozen=True)
+class OfflineEvent:
+    """One character going offline for one player, like OfflineEvent in TS"""
+    session_id: str
+    character_id: str
+    timestamp: float  # time.time()
+    reason: str
+    duration: float  # seconds
+    message: str
+
+class _Bucket:
+    __slots__ = ('tokens', 'stamp')
+    
+    def __init__(self, tokens: float, stamp: float):
+        self.tokens = tokens
+        self.stamp = stamp
+
+class _Cooldown:
+    __slots__ = ('until', 'duration', 'reason', 'message')
+    
+    def __init__(self, until: float, duration: float, reason: str, message: str):
+        self.until = until
+        self.duration = duration
+        self.reason = reason
+        self.message = message
+
+class CooldownManager:
+    """Throttles players per session and sends characters offline per (session, character).
+    
+    Each session gets a token bucket of ``burst`` messages refilled at
+    ``rate`` per second. A character sent offline (by ``set_offline`` or
+    ``apply_moderation``) stays offline for that player only, for the same
+    40/45/60 second durations CharacterStatusManager uses. Expiries go
+    through one TimerWheel: ``poll()`` brings characters back online (and
+    calls the back-online listeners) and drops buckets that have refilled,
+    since a full bucket is the same as no bucket. Memory therefore tracks
+    the players active in the last ``burst / rate`` seconds plus current
+    cooldowns, not every player ever seen. The offline-event log is a ring
+    buffer of the last ``log_size`` events.
+    
+    Call ``poll()`` regularly (each frame, or from SessionManager.chat);
+    listeners run on the polling thread as ``listener(session_id, character_id)``.
+    """
+    
+    def __init__(self, rate: float = 0.5, burst: float = 5.0, log_size: int = 50,
+                 tick: float = 0.5, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._wheel = TimerWheel(tick=tick, now=clock())
+        self._buckets: Dict[str, _Bucket] = {}
+        self._offline: Dict[str, Dict[str, _Cooldown]] = {}
+        self._events: "collections.deque[OfflineEvent]" = collections.deque(maxlen=log_size)
+        self._listeners: Tuple[Callable[[str, str], None], ...] = ()
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.throttled = 0
+        self.expired = 0
+    
+    def add_listener(self, listener: Callable[[str, str], None]) -> Callable[[], None]:
+        """Call listener(session_id, character_id) when a character comes back online.
+        
+        Returns a function that removes the listener.
+        """
+        with self._lock:
+            self._listeners = self._listeners + (listener,)
+        
+        def remove() -> None:
+            with self._lock:
+                self._listeners = tuple(l for l in self._listeners if l is not listener)
+        return remove
+    
+    def allow(self, session_id: str, character_id: Optional[str] = None,
+              cost: float = 1.0) -> bool:
+        """Take cost tokens from the session's bucket; False if throttled or offline"""
+        now = self.clock()
+        with self._lock:
+            if character_id is not None:
+                cooldown = self._offline.get(session_id, {}).get(character_id)
+                if cooldown is not None and now < cooldown.until:
+                    self.throttled += 1
+                    return False
+            bucket = self._buckets.get(session_id)
+            if bucket is None:
+                bucket = self._buckets[session_id] = _Bucket(self.burst, now)
+            else:
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.stamp) * self.rate)
+                bucket.stamp = now
+            if bucket.tokens < cost:
+                self.throttled += 1
+                return False
+            bucket.tokens -= cost
+            # Forget the bucket once it would be full again
+            self._wheel.schedule((session_id, None), now + (self.burst - bucket.tokens) / self.rate)
+            return True
+    
+    def set_offline(self, session_id: str, character_id: str, reason: str = '',
+                    message: str = DEFAULT_OFFLINE_MESSAGE,
+                    duration: float = DEFAULT_OFFLINE_DURATION) -> None:
+        """Take character offline for this player for duration seconds"""
+        now = self.clock()
+        with self._lock:
+            self._offline.setdefault(session_id, {})[character_id] = _Cooldown(
+                now + duration, duration, reason, message
+            )
+            self._wheel.schedule((session_id, character_id), now + duration)
+            self._events.append(OfflineEvent(session_id, character_id, time.time(),
+                                             reason, duration, message))
+    
+    def apply_moderation(self, session_id: str, character_id: str,
+                         result: ModerationResult) -> bool:
+        """Send the character offline if result is abusive or irrelevant (shouldPutOffline)"""
+        if not (result.is_abusive or result.is_irrelevant):
+            return False
+        self.set_offline(session_id, character_id, result.reason,
+                         result.suggested_response or DEFAULT_OFFLINE_MESSAGE,
+                         OFFLINE_DURATIONS.get(result.severity, DEFAULT_OFFLINE_DURATION))
+        return True
+    
+    def set_online(self, session_id: str, character_id: str) -> bool:
+        """End a cooldown early; calls the back-online listeners"""
+        with self._lock:
+            if not self._drop_cooldown(session_id, character_id):
+                return False
+            self._wheel.cancel((session_id, character_id))
+            listeners = self._listeners
+        self._notify(listeners, [(session_id, character_id)])
+        return True
+    
+    def _drop_cooldown(self, session_id: str, character_id: str) -> bool:
+        characters = self._offline.get(session_id)
+        if characters is None or characters.pop(character_id, None) is None:
+            return False
+        if not characters:
+            del self._offline[session_id]
+        return True
+    
+    def poll(self) -> int:
+        """Expire due timers; returns how many characters came back online"""
+        now = self.clock()
+        online = []
+        with self._lock:
+            for session_id, character_id in self._wheel.advance(now):
+                if character_id is None:
+                    self._buckets.pop(session_id, None)
+                elif self._drop_cooldown(session_id, character_id):
+                    online.append((session_id, character_id))
+            self.expired += len(online)
+            # Deleting never shrinks a dict: start over once a burst has drained
+            if not self._buckets:
+                self._buckets = {}
+            if not self._offline:
+                self._offline = {}
+            listeners = self._listeners
+        self._notify(listeners, online)
+        return len(online)
+    
+    @staticmethod
+    def _notify(listeners, online: List[Tuple[str, str]]) -> None:
+        for session_id, character_id in online:
+            for listener in listeners:
+                try:
+                    listener(session_id, character_id)
+                except Exception as e:
+                    logger.error("Error in back-online listener: %s", e)
+    
+    def _cooldown(self, session_id: str, character_id: str) -> Optional[_Cooldown]:
+        cooldown = self._offline.get(session_id, {}).get(character_id)
+        if cooldown is None or self.clock() >= cooldown.until:
+            return None
+        return cooldown
+    
+    def is_online(self, session_id: str, character_id: str) -> bool:
+        with self._lock:
+            return self._cooldown(session_id, character_id) is None
+    
+    def time_until_online(self, session_id: str, character_id: str) -> int:
+        """Whole seconds until the character is back, like getTimeUntilOnline"""
+        with self._lock:
+            cooldown = self._cooldown(session_id, character_id)
+            if cooldown is None:
+                return 0
+            return math.ceil(cooldown.until - self.clock())
+    
+    def cooldown_progress(self, session_id: str, character_id: str) -> float:
+        """0-1 share of the cooldown elapsed, like getCooldownProgress"""
+        with self._lock:
+            cooldown = self._cooldown(session_id, character_id)
+            if cooldown is None or cooldown.duration <= 0:
+                return 0.0
+            elapsed = self.clock() - (cooldown.until - cooldown.duration)
+            return min(1.0, max(0.0, elapsed / cooldown.duration))
+    
+    def status(self, session_id: str, character_id: str) -> Dict[str, Any]:
+        """Offline details for UI display; empty when the character is online"""
+        with self._lock:
+            cooldown = self._cooldown(session_id, character_id)
+            if cooldown is None:
+                return {}
+            return {
+                'reason': cooldown.reason or 'Character is temporarily unavailable',
+                'message': cooldown.message,
+                'remaining': math.ceil(cooldown.until - self.clock()),
+                'duration': cooldown.duration
+            }
+    
+    def offline_events(self, character_id: Optional[str] = None,
+                       session_id: Optional[str] = None) -> List[OfflineEvent]:
+        """Recent offline events, oldest first, optionally filtered"""
+        with self._lock:
+            events = list(self._events)
+        return [event for event in events
+                if (character_id is None or event.character_id == character_id)
+                and (session_id is None or event.session_id == session_id)]
+    
+    def forget(self, session_id: str) -> None:
+        """Drop a player's bucket and cooldowns without calling listeners"""
+        with self._lock:
+            self._buckets.pop(session_id, None)
+            self._wheel.cancel((session_id, None))
+            for character_id in self._offline.pop(session_id, {}):
+                self._wheel.cancel((session_id, character_id))
+    
+    def __len__(self) -> int:
+        """Players currently holding a bucket or a cooldown"""
+        with self._lock:
+            return len(self._buckets.keys() | self._offline.keys())
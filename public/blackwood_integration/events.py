@@ -0,0 +1,112 @@
+"""Callback queue drained on the game thread and the investigation event bus"""
+
+import threading
+import logging
+import queue
+from typing import Optional, Dict, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+class CallbackQueue:
+    """Thread-safe callback queue drained on the game's own thread.
+
+    Worker threads only ever ``put`` here; the game loop calls ``drain`` once
+    per frame (pygame loop, Tk ``after()``, Kivy ``Clock``) and never blocks.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def put(self, callback: Callable, *args) -> None:
+        self._queue.put((callback, args))
+
+    def drain(self, max_items: Optional[int] = None) -> int:
+        """Run pending callbacks without blocking, returns how many ran"""
+        processed = 0
+        while max_items is None or processed < max_items:
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            processed += 1
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error("Callback error: %s", e)
+        return processed
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+def _invoke(callback: Callable, *args) -> None:
+    callback(*args)
+
+class EventBus:
+    """Publish/subscribe for investigation events, any number of listeners each.
+
+    Listeners run through ``dispatch`` (a direct call by default; the widget
+    routes them through its CallbackQueue in non-blocking mode). With
+    ``coalesce=True`` the events in COALESCED are held until ``flush`` and
+    only the latest arguments are delivered, so fifty progress bumps in one
+    frame cost the UI one redraw.
+    """
+
+    CHARACTER_SELECTED = 'character_selected'
+    EVIDENCE_FOUND = 'evidence_found'
+    EVIDENCE_BATCH = 'evidence_batch'  # one tuple of items from add_evidence_many
+    INVESTIGATION_PROGRESS = 'investigation_progress'
+
+    COALESCED = frozenset({INVESTIGATION_PROGRESS})
+
+    def __init__(self, coalesce: bool = False, dispatch: Optional[Callable] = None):
+        self.coalesce = coalesce
+        self._dispatch = dispatch or _invoke
+        # Copy-on-write tuples so publish never takes the lock
+        self._listeners: Dict[str, Tuple[Callable, ...]] = {}
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, event: str, listener: Callable) -> Callable[[], bool]:
+        """Add a listener, returns a callable that removes it again"""
+        with self._lock:
+            self._listeners[event] = self._listeners.get(event, ()) + (listener,)
+        return lambda: self.unsubscribe(event, listener)
+
+    def unsubscribe(self, event: str, listener: Callable) -> bool:
+        with self._lock:
+            listeners = self._listeners.get(event, ())
+            if listener not in listeners:
+                return False
+            index = listeners.index(listener)
+            self._listeners[event] = listeners[:index] + listeners[index + 1:]
+            return True
+
+    def has_listeners(self, event: str) -> bool:
+        return bool(self._listeners.get(event))
+
+    def publish(self, event: str, *args) -> None:
+        listeners = self._listeners.get(event)
+        if not listeners:
+            return
+        if self.coalesce and event in self.COALESCED:
+            with self._lock:
+                self._pending[event] = args
+            return
+        self._deliver(listeners, args)
+
+    def flush(self) -> int:
+        """Deliver the latest value of every coalesced event, returns how many"""
+        if not self._pending:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for event, args in pending.items():
+            self._deliver(self._listeners.get(event, ()), args)
+        return len(pending)
+
+    def _deliver(self, listeners: Tuple[Callable, ...], args: tuple) -> None:
+        for listener in listeners:
+            try:
+                self._dispatch(listener, *args)
+            except Exception as e:
+                logger.error("Event listener error: %s", e)
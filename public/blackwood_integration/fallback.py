@@ -0,0 +1,100 @@
+"""Offline character replies with the same tables as app/api/chat-fallback/route.ts"""
+
+import threading
+import json
+import os
+from typing import Optional, Dict, List, Any, Tuple
+
+from .config import DATA_DIR
+from .moderation import PhraseMatcher
+
+# Offline fallback: same reply tables and topic rules as app/api/chat-fallback/route.ts
+FALLBACK_RESPONSES_PATH = os.path.join(DATA_DIR, 'fallback-responses.json')
+
+class FallbackResponder:
+    """Local stand-in for /api/chat-fallback used while the backend is unreachable.
+    
+    Every (character, topic) reply is resolved once at load time, so a
+    lookup is one automaton pass over the message plus a dict hit. Messages
+    that match no topic cycle through the character's replies in order
+    rather than at random, so a player asking twice gets a different line.
+    """
+    
+    def __init__(self, characters: Dict[str, List[str]], default: List[str],
+                 topics: List[Dict[str, Any]]):
+        self.topics = [topic['name'] for topic in topics]
+        self.characters = {cid: list(replies) for cid, replies in characters.items() if replies}
+        self.default = list(default)
+        
+        triggers: List[str] = []
+        self._trigger_topic: List[int] = []
+        for index, topic in enumerate(topics):
+            for trigger in topic['triggers']:
+                triggers.append(trigger.lower())
+                self._trigger_topic.append(index)
+        self.matcher = PhraseMatcher(triggers)
+        
+        # character id -> reply chosen for each topic, in topic order
+        self._index: Dict[Optional[str], Tuple[str, ...]] = {
+            cid: self._resolve(replies, topics) for cid, replies in self.characters.items()
+        }
+        self._index[None] = self._resolve(self.default, topics)
+        self._rotation: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _resolve(replies: List[str], topics: List[Dict[str, Any]]) -> Tuple[str, ...]:
+        resolved = []
+        for topic in topics:
+            keywords = topic.get('replyKeywords', ())
+            reply = next((r for r in replies if any(k in r for k in keywords)), None)
+            if reply is None:
+                reply = replies[min(topic.get('defaultIndex', 0), len(replies) - 1)]
+            resolved.append(reply)
+        return tuple(resolved)
+    
+    @classmethod
+    def from_file(cls, path: str = FALLBACK_RESPONSES_PATH) -> 'FallbackResponder':
+        """Build from the JSON reply tables shared with the web app"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('characters', {}), data.get('default', []), data.get('topics', []))
+    
+    def topic(self, message: str) -> Optional[str]:
+        """Name of the first topic the message triggers, if any"""
+        index = self._topic_index(message.lower())
+        return None if index is None else self.topics[index]
+    
+    def _topic_index(self, text: str) -> Optional[int]:
+        best = None
+        for trigger, _ in self.matcher.finditer(text):
+            topic = self._trigger_topic[trigger]
+            if best is None or topic < best:
+                best = topic
+                if best == 0:
+                    break
+        return best
+    
+    def reply(self, character_id: str, message: str) -> str:
+        """In-character reply chosen without any network access"""
+        key = character_id if character_id in self._index else None
+        topic = self._topic_index(message.lower())
+        if topic is not None:
+            return self._index[key][topic]
+        replies = self.characters.get(character_id, self.default)
+        with self._lock:
+            turn = self._rotation.get(key, 0)
+            self._rotation[key] = turn + 1
+        return replies[turn % len(replies)]
+
+_default_fallback: Optional[FallbackResponder] = None
+_default_fallback_lock = threading.Lock()
+
+def default_fallback() -> FallbackResponder:
+    """Shared responder built from public/data/fallback-responses.json on first use"""
+    global _default_fallback
+    if _default_fallback is None:
+        with _default_fallback_lock:
+            if _default_fallback is None:
+                _default_fallback = FallbackResponder.from_file()
+    return _default_fallback
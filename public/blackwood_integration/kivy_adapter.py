@@ -0,0 +1,66 @@
+"""Example integration for Kivy games (requires kivy)"""
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+
+from .config import WidgetConfig
+from .widget import BlackwoodWidget
+
+class KivyGame(BoxLayout):
+    """Example integration for Kivy games"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.widget = BlackwoodWidget(WidgetConfig(non_blocking=True))
+        
+        # Drain widget callbacks on the Kivy main thread every frame
+        Clock.schedule_interval(lambda dt: self.widget.process_callbacks(), 0)
+        
+        # Add UI elements
+        self.add_widget(Label(text='Detective Game', size_hint_y=0.1))
+        
+        # Button container
+        button_container = BoxLayout(orientation='horizontal', size_hint_y=0.1)
+        
+        btn_show = Button(text='Show Widget')
+        btn_show.bind(on_press=self.show_widget)
+        button_container.add_widget(btn_show)
+        
+        btn_investigate = Button(text='Investigate Study')
+        btn_investigate.bind(on_press=lambda x: self.start_investigation('study'))
+        button_container.add_widget(btn_investigate)
+        
+        self.add_widget(button_container)
+        
+        # Status label
+        self.status_label = Label(text='Ready to investigate', size_hint_y=0.1)
+        self.add_widget(self.status_label)
+    
+    def show_widget(self, instance):
+        self.status_label.text = "Opening widget..."
+        self.widget.call_when_done(self.widget.show_widget(), self._on_widget_shown)
+    
+    def _on_widget_shown(self, success):
+        if success:
+            self.status_label.text = "Widget opened"
+        else:
+            self.status_label.text = "Failed to open widget"
+    
+    def start_investigation(self, room_id):
+        future = self.widget.start_room_investigation(room_id)
+        self.widget.call_when_done(
+            future, lambda success: self._on_investigation_started(room_id, success))
+    
+    def _on_investigation_started(self, room_id, success):
+        if success:
+            self.status_label.text = f"Investigating {room_id}"
+        else:
+            self.status_label.text = f"Failed to investigate {room_id}"
+
+class DetectiveGameApp(App):
+    def build(self):
+        return KivyGame()
@@ -0,0 +1,170 @@
+"""Local knowledge index over the investigation timeline shared with lib/timeline.ts"""
+
+import bisect
+import json
+import os
+import threading
+from typing import Optional, Dict, List, Any, Iterable, Tuple, FrozenSet
+
+from .config import DATA_DIR
+
+# Same events, phases and character constraints as lib/timeline.ts
+TIMELINE_PATH = os.path.join(DATA_DIR, 'timeline.json')
+
+class KnowledgeIndex:
+    """Who knows what, built once from the timeline so checks need no server.
+    
+    ``TimelineManager.canCharacterReveal`` scans every event's evidence and
+    secrets per query; here each evidence id or secret maps straight to its
+    events and to the trust each character needs to reveal it, forbidden
+    topics are one int bitset per character, and phases are found by
+    bisecting their progress thresholds. Lookups are dict hits and never
+    mutate, so one index is safe to share across threads.
+    """
+    
+    def __init__(self, events: List[Dict[str, Any]], phases: List[Dict[str, Any]],
+                 constraints: Dict[str, Dict[str, Any]]):
+        self.events = {event['id']: event for event in events}
+        
+        # evidence/secret -> event ids in timeline order
+        self._item_events: Dict[str, Tuple[str, ...]] = {}
+        self._evidence: set = set()
+        for event in events:
+            for key in ('evidence', 'secrets'):
+                for item in event.get(key) or ():
+                    ids = self._item_events.get(item, ())
+                    if event['id'] not in ids:
+                        self._item_events[item] = ids + (event['id'],)
+                    if key == 'evidence':
+                        self._evidence.add(item)
+        
+        # item -> character -> trust needed to reveal it (None: never).
+        # Like canCharacterReveal, only the first event mentioning an item counts.
+        self._reveal: Dict[str, Dict[str, Optional[float]]] = {}
+        self._knowers: Dict[str, FrozenSet[str]] = {}
+        for item, ids in self._item_events.items():
+            knowledge = self.events[ids[0]].get('characterKnowledge', {})
+            self._reveal[item] = {
+                cid: k.get('trustRequired') if k.get('canReveal') else None
+                for cid, k in knowledge.items()
+            }
+            self._knowers[item] = frozenset(
+                cid for event_id in ids
+                for cid, k in self.events[event_id].get('characterKnowledge', {}).items()
+                if k.get('knowsAbout')
+            )
+        
+        # topic -> bit; character -> OR of its forbidden topic bits
+        self.constraints = dict(constraints)
+        self._topic_bits: Dict[str, int] = {}
+        self._forbidden: Dict[str, int] = {}
+        for cid, constraint in self.constraints.items():
+            mask = 0
+            for topic in constraint.get('knowledgeLimits', {}).get('forbiddenTopics', ()):
+                bit = self._topic_bits.setdefault(topic, len(self._topic_bits))
+                mask |= 1 << bit
+            self._forbidden[cid] = mask
+        
+        self.phases = sorted(phases, key=lambda phase: phase['requiredProgress'])
+        self._thresholds = [phase['requiredProgress'] for phase in self.phases]
+        self._phase_characters = [frozenset(phase.get('availableCharacters', ()))
+                                  for phase in self.phases]
+        self._phase_locations = [frozenset(phase.get('availableLocations', ()))
+                                 for phase in self.phases]
+    
+    @classmethod
+    def from_file(cls, path: str = TIMELINE_PATH) -> 'KnowledgeIndex':
+        """Build from the JSON timeline shared with the web app"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('events', []), data.get('phases', []),
+                   data.get('characterConstraints', {}))
+    
+    def is_evidence(self, item: str) -> bool:
+        """True if item is physical evidence listed on any timeline event"""
+        return item in self._evidence
+    
+    def is_known(self, item: str) -> bool:
+        """True if item is evidence or a secret from the timeline"""
+        return item in self._item_events
+    
+    def events_for(self, item: str) -> Tuple[str, ...]:
+        """Ids of the events that mention item, in timeline order"""
+        return self._item_events.get(item, ())
+    
+    def characters_who_know(self, item: str) -> FrozenSet[str]:
+        """Characters who know about any event that mentions item"""
+        return self._knowers.get(item, frozenset())
+    
+    def can_reveal(self, character_id: str, information: str, trust_level: float) -> bool:
+        """Same answer as TimelineManager.canCharacterReveal"""
+        forbidden = self._forbidden.get(character_id)
+        if forbidden is None:
+            return False
+        bit = self._topic_bits.get(information)
+        if bit is not None and forbidden >> bit & 1:
+            return False
+        reveal = self._reveal.get(information)
+        if reveal is None:
+            return True
+        trust_required = reveal.get(character_id)
+        return trust_required is not None and trust_level >= trust_required
+    
+    def topic_mask(self, topics: Iterable[str]) -> int:
+        """Bitset of the given topics; topics nobody is forbidden from are ignored"""
+        mask = 0
+        for topic in topics:
+            bit = self._topic_bits.get(topic)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+    
+    def forbidden_mask(self, character_id: str) -> int:
+        """Bitset of the character's forbidden topics (0 for unknown characters)"""
+        return self._forbidden.get(character_id, 0)
+    
+    def is_forbidden(self, character_id: str, topic: str) -> bool:
+        """True if the character must not discuss topic"""
+        bit = self._topic_bits.get(topic)
+        return bit is not None and bool(self._forbidden.get(character_id, 0) >> bit & 1)
+    
+    def allows_all(self, character_id: str, topic_mask: int) -> bool:
+        """True if none of the topics in topic_mask are forbidden for the character"""
+        return not self._forbidden.get(character_id, 0) & topic_mask
+    
+    def _phase_index(self, progress: float) -> int:
+        return max(bisect.bisect_right(self._thresholds, progress) - 1, 0)
+    
+    def phase_for(self, progress: float) -> Optional[Dict[str, Any]]:
+        """Investigation phase reached at this progress"""
+        if not self.phases:
+            return None
+        return self.phases[self._phase_index(progress)]
+    
+    def available_characters(self, progress: float) -> FrozenSet[str]:
+        """Characters who can be questioned at this progress"""
+        if not self.phases:
+            return frozenset()
+        return self._phase_characters[self._phase_index(progress)]
+    
+    def available_locations(self, progress: float) -> FrozenSet[str]:
+        """Locations open at this progress"""
+        if not self.phases:
+            return frozenset()
+        return self._phase_locations[self._phase_index(progress)]
+    
+    def suspects_for(self, item: str, progress: float) -> Tuple[str, ...]:
+        """Characters who know about item and can be questioned now, sorted"""
+        return tuple(sorted(self.characters_who_know(item) & self.available_characters(progress)))
+
+_default_knowledge: Optional[KnowledgeIndex] = None
+_default_knowledge_lock = threading.Lock()
+
+def default_knowledge() -> KnowledgeIndex:
+    """Shared index built from public/data/timeline.json on first use"""
+    global _default_knowledge
+    if _default_knowledge is None:
+        with _default_knowledge_lock:
+            if _default_knowledge is None:
+                _default_knowledge = KnowledgeIndex.from_file()
+    return _default_knowledge
@@ -0,0 +1,196 @@
+"""Latency histograms, counters and Prometheus/cProfile helpers"""
+
+import threading
+import time
+import logging
+import collections
+import bisect
+import contextlib
+import io
+from typing import Optional, Dict, List, Any, Callable
+
+from .persistence import _atomic_write
+
+logger = logging.getLogger(__name__)
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds"""
+    
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+    
+    DEFAULT_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1,
+                      0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+    
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the q-th quantile (approximate)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+class Metrics:
+    """Counters and latency histograms for the widget and chat clients.
+    
+    Exporters are callables taking the Metrics object; export() runs them.
+    All components share DEFAULT_METRICS unless given their own instance.
+    """
+    
+    def __init__(self, prefix: str = "blackwood"):
+        self.prefix = prefix
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = collections.defaultdict(int)
+        self.exporters: List[Callable[["Metrics"], None]] = []
+        self._lock = threading.Lock()
+    
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+    
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+    
+    @contextlib.contextmanager
+    def timer(self, name: str):
+        """Time the with-block into histogram name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view: counters plus count/sum/p50/p95/p99 per histogram"""
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {
+                    name: {
+                        'count': h.count,
+                        'sum': h.sum,
+                        'p50': h.quantile(0.5),
+                        'p95': h.quantile(0.95),
+                        'p99': h.quantile(0.99)
+                    }
+                    for name, h in self.histograms.items()
+                }
+            }
+    
+    def to_prometheus(self) -> str:
+        """Render in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, h in sorted(self.histograms.items()):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, bucket in zip(h.bounds, h.counts):
+                    cumulative += bucket
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum {h.sum}")
+                lines.append(f"{metric}_count {h.count}")
+        return '\n'.join(lines) + '\n'
+    
+    def add_exporter(self, exporter: Callable[["Metrics"], None]) -> None:
+        self.exporters.append(exporter)
+    
+    def export(self) -> None:
+        for exporter in list(self.exporters):
+            try:
+                exporter(self)
+            except Exception as e:
+                logger.error("Metrics exporter error: %s", e)
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+DEFAULT_METRICS = Metrics()
+
+def prometheus_file_exporter(path: str) -> Callable[[Metrics], None]:
+    """Exporter that atomically rewrites path (e.g. for node_exporter's textfile collector)"""
+    def export(metrics: Metrics) -> None:
+        _atomic_write(path, metrics.to_prometheus().encode('utf-8'), fsync=False)
+    return export
+
+def serve_prometheus(metrics: Metrics = None, port: int = 9464, host: str = '127.0.0.1'):
+    """Serve metrics at http://host:port/metrics from a daemon thread; returns the server"""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    metrics = metrics or DEFAULT_METRICS
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            logger.debug("metrics: " + format, *args)
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="blackwood-metrics", daemon=True).start()
+    return server
+
+@contextlib.contextmanager
+def profile_session(output: Optional[str] = None, trace_memory: bool = True, limit: int = 25):
+    """cProfile (and optionally tracemalloc) everything inside the with-block.
+    
+    Yields a dict that is filled on exit with 'profile' (pstats text) and,
+    if trace_memory, 'memory' (top allocation sites). output, if given,
+    receives the raw cProfile stats for snakeviz/pstats.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+    
+    report: Dict[str, Any] = {}
+    started_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        report['profile'] = stream.getvalue()
+        if output:
+            profiler.dump_stats(output)
+        if trace_memory:
+            top = tracemalloc.take_snapshot().statistics('lineno')[:limit]
+            report['memory'] = [str(stat) for stat in top]
+            if started_tracemalloc:
+                tracemalloc.stop()
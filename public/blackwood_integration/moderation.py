@@ -0,0 +1,225 @@
+"""Local abuse pre-filter with the same phrase lists as lib/simpleAbuseDetection.ts"""
+
+import threading
+import json
+import os
+from types import MappingProxyType
+import collections
+from typing import Optional, Dict, List, Any, Iterator, Tuple
+from dataclasses import dataclass
+
+from .config import DATA_DIR
+from .metrics import DEFAULT_METRICS
+
+# Abuse pre-filter: same phrase lists and matching rules as lib/simpleAbuseDetection.ts
+ABUSE_PHRASES_PATH = os.path.join(DATA_DIR, 'abuse-phrases.json')
+
+# Phrases shorter than this must sit on a space or message edge (simpleAbuseDetection.ts)
+_SHORT_PHRASE_LENGTH = 10
+
+_SUGGESTED_RESPONSES = MappingProxyType({
+    'high': 'I must say, Detective Chen, such language is completely unacceptable. I shall not tolerate such disrespect.',
+    'medium': 'I must say, Detective Chen, such language is quite unacceptable. Please maintain proper decorum.',
+    'low': 'I should say, Detective Chen, that language is rather inappropriate.'
+})
+_IRRELEVANT_RESPONSE = 'I should say, Detective Chen, that question is not relevant to our investigation.'
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over a fixed phrase list.
+    
+    Failure links are folded into the transition tables at build time, so a
+    search is one dict lookup per character regardless of phrase count.
+    """
+    
+    __slots__ = ('phrases', '_delta', '_outputs')
+    
+    def __init__(self, phrases: List[str]):
+        self.phrases = list(phrases)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                state = nxt
+            outputs[state] += (index,)
+        
+        # Breadth-first: each state inherits its failure state's transitions
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        pending = collections.deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                outputs[child] += outputs[fail[child]]
+                pending.append(child)
+            delta[state] = dict(delta[fail[state]], **goto[state])
+        self._delta = delta
+        self._outputs = outputs
+    
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yields (phrase index, end offset) for every occurrence, overlaps included"""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for end, ch in enumerate(text, 1):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield index, end
+    
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+@dataclass
+class ModerationResult:
+    """Verdict for one player message, shaped like AbuseDetectionResult in TS"""
+    verdict: str  # 'abusive', 'irrelevant', 'clean' or 'ambiguous'
+    is_abusive: bool = False
+    is_irrelevant: bool = False
+    severity: str = 'low'
+    confidence: int = 95
+    reason: str = 'Message appears appropriate'
+    suggested_response: Optional[str] = None
+    detected_intent: str = 'Normal conversation'
+    source: str = 'local'
+    
+    @property
+    def escalate(self) -> bool:
+        """True when the local lists cannot decide and the server should"""
+        return self.verdict == 'ambiguous'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Same keys as /api/abuse-detection data"""
+        data = {
+            'isAbusive': self.is_abusive,
+            'isIrrelevant': self.is_irrelevant,
+            'severity': self.severity,
+            'confidence': self.confidence,
+            'reason': self.reason,
+            'detectedIntent': self.detected_intent
+        }
+        if self.suggested_response is not None:
+            data['suggestedResponse'] = self.suggested_response
+        return data
+
+class AbusePrefilter:
+    """Classifies player messages locally in one linear pass.
+    
+    Obvious hits and obvious passes are answered here with the same result
+    simpleAbuseDetection.ts would give. A message is 'ambiguous' only when a
+    short abusive phrase appears next to punctuation rather than a space
+    (e.g. "shut up!"), which the strict word-boundary rule misses; only those
+    need a round trip to /api/abuse-detection.
+    """
+    
+    ABUSIVE = 0
+    IRRELEVANT = 1
+    
+    def __init__(self, abusive_phrases: List[str], irrelevant_topics: List[str],
+                 high_severity: List[str] = (), medium_severity: List[str] = ()):
+        phrases = [p.lower() for p in abusive_phrases] + [t.lower() for t in irrelevant_topics]
+        self._abusive_count = len(abusive_phrases)
+        self._originals = list(abusive_phrases) + list(irrelevant_topics)
+        self._strict = [len(p) < _SHORT_PHRASE_LENGTH for p in phrases[:self._abusive_count]]
+        self._severity = [self._phrase_severity(p, high_severity, medium_severity)
+                          for p in abusive_phrases]
+        self.matcher = PhraseMatcher(phrases)
+        self.metrics = DEFAULT_METRICS
+    
+    @staticmethod
+    def _phrase_severity(phrase: str, high: List[str], medium: List[str]) -> str:
+        if any(h in phrase for h in high):
+            return 'high'
+        if any(m in phrase for m in medium):
+            return 'medium'
+        return 'low'
+    
+    @classmethod
+    def from_file(cls, path: str = ABUSE_PHRASES_PATH) -> 'AbusePrefilter':
+        """Build from the JSON phrase lists shared with the web app"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        def flatten(groups):
+            return [p for group in groups.values() for p in group] if isinstance(groups, dict) else list(groups)
+        return cls(flatten(data.get('abusivePhrases', {})),
+                   flatten(data.get('irrelevantTopics', {})),
+                   data.get('highSeverity', []),
+                   data.get('mediumSeverity', []))
+    
+    def classify(self, message: str) -> ModerationResult:
+        """Classify one message without touching the network"""
+        text = message.lower().strip()
+        last = len(text)
+        abusive_count = self._abusive_count
+        strict = self._strict
+        abusive_hit = None
+        irrelevant_hit = None
+        near_miss = False
+        
+        for index, end in self.matcher.finditer(text):
+            if index >= abusive_count:
+                if irrelevant_hit is None or index < irrelevant_hit:
+                    irrelevant_hit = index
+                continue
+            if abusive_hit is not None and index > abusive_hit:
+                continue
+            if strict[index]:
+                start = end - len(self.matcher.phrases[index])
+                before = text[start - 1] if start else ' '
+                after = text[end] if end < last else ' '
+                if before != ' ' or after != ' ':
+                    # Bounded by punctuation counts as a near miss, inside a word does not
+                    if not (before.isalnum() or after.isalnum()):
+                        near_miss = True
+                    continue
+            abusive_hit = index
+        
+        if abusive_hit is not None:
+            result = self._abusive(abusive_hit)
+        elif near_miss:
+            result = ModerationResult(verdict='ambiguous', confidence=50,
+                                      reason='Possible abusive language needs server review',
+                                      detected_intent='Unclear')
+        elif irrelevant_hit is not None:
+            result = ModerationResult(
+                verdict='irrelevant',
+                is_irrelevant=True,
+                confidence=85,
+                reason=f'Irrelevant topic detected: "{self._originals[irrelevant_hit]}"',
+                suggested_response=_IRRELEVANT_RESPONSE,
+                detected_intent='Asking irrelevant question'
+            )
+        else:
+            result = ModerationResult(verdict='clean')
+        self.metrics.increment(f'moderation_{result.verdict}_total')
+        return result
+    
+    def _abusive(self, index: int) -> ModerationResult:
+        severity = self._severity[index]
+        return ModerationResult(
+            verdict='abusive',
+            is_abusive=True,
+            severity=severity,
+            confidence=90,
+            reason=f'Abusive language detected: "{self._originals[index]}"',
+            suggested_response=_SUGGESTED_RESPONSES[severity],
+            detected_intent='Direct insult to character'
+        )
+
+_default_prefilter: Optional[AbusePrefilter] = None
+_default_prefilter_lock = threading.Lock()
+
+def default_prefilter() -> AbusePrefilter:
+    """Shared pre-filter built from public/data/abuse-phrases.json on first use"""
+    global _default_prefilter
+    if _default_prefilter is None:
+        with _default_prefilter_lock:
+            if _default_prefilter is None:
+                _default_prefilter = AbusePrefilter.from_file()
+    return _default_prefilter
@@ -0,0 +1,353 @@
+"""Binary snapshots and the append-only state journal"""
+
+import threading
+import time
+import json
+import os
+import logging
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Dict, Any, Callable
+from enum import IntEnum
+
+from .state import InvestigationState
+
+logger = logging.getLogger(__name__)
+
+# Compact binary snapshot and journal layout (little-endian)
+_SNAPSHOT_MAGIC = b'BWS1'
+_SNAPSHOT_HEADER = struct.Struct('<4sdiBB')  # magic, timestamp, progress, flags, retry_count
+_JOURNAL_RECORD = struct.Struct('<BdI')      # op, timestamp, payload length
+_U32 = struct.Struct('<I')
+_I32 = struct.Struct('<i')
+
+_FLAG_WIDGET_OPEN = 1
+_FLAG_IS_OPEN = 2
+_FLAG_INVESTIGATION_ACTIVE = 4
+
+class JournalOp(IntEnum):
+    EVIDENCE = 1
+    SUSPECT = 2
+    ROOM = 3
+    PROGRESS = 4
+    CHARACTER = 5
+    WIDGET_OPEN = 6
+    RESET = 7
+
+def _atomic_write(path: str, data: bytes, fsync: bool = True) -> None:
+    """Write data to a temp file next to path, then rename it into place"""
+    import tempfile
+    
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _pack_str(value: Optional[str]) -> bytes:
+    # 0xFFFFFFFF length marks None
+    if value is None:
+        return _U32.pack(0xFFFFFFFF)
+    encoded = value.encode('utf-8')
+    return _U32.pack(len(encoded)) + encoded
+
+def _unpack_str(data: bytes, offset: int):
+    (length,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    if length == 0xFFFFFFFF:
+        return None, offset
+    end = offset + length
+    if end > len(data):
+        raise ValueError("Truncated string in snapshot")
+    return data[offset:end].decode('utf-8'), end
+
+def _pack_str_list(items) -> bytes:
+    items = list(items)
+    return _U32.pack(len(items)) + b''.join(_pack_str(item) for item in items)
+
+def _unpack_str_list(data: bytes, offset: int):
+    (count,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    items = []
+    for _ in range(count):
+        item, offset = _unpack_str(data, offset)
+        items.append(item)
+    return items, offset
+
+def encode_state_snapshot(state_data: Dict[str, Any]) -> bytes:
+    """Pack save_state-shaped data into the compact binary snapshot format"""
+    inv = state_data.get('investigation_state', {})
+    widget = state_data.get('widget_state', {})
+    flags = ((_FLAG_WIDGET_OPEN if inv.get('widget_open') else 0) |
+             (_FLAG_IS_OPEN if widget.get('is_open') else 0) |
+             (_FLAG_INVESTIGATION_ACTIVE if widget.get('investigation_active') else 0))
+    return b''.join((
+        _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, state_data.get('timestamp', 0.0),
+                              inv.get('progress', 0), flags,
+                              min(widget.get('retry_count', 0), 255)),
+        _pack_str(inv.get('current_character')),
+        _pack_str(widget.get('current_character')),
+        _pack_str_list(inv.get('suspects_interviewed', ())),
+        _pack_str_list(inv.get('rooms_investigated', ())),
+        _pack_str_list(inv.get('evidence_collected', ()))
+    ))
+
+def decode_state_snapshot(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_state_snapshot"""
+    magic, timestamp, progress, flags, retry_count = _SNAPSHOT_HEADER.unpack_from(data, 0)
+    if magic != _SNAPSHOT_MAGIC:
+        raise ValueError("Not a Blackwood state snapshot")
+    offset = _SNAPSHOT_HEADER.size
+    inv_character, offset = _unpack_str(data, offset)
+    widget_character, offset = _unpack_str(data, offset)
+    suspects, offset = _unpack_str_list(data, offset)
+    rooms, offset = _unpack_str_list(data, offset)
+    evidence, offset = _unpack_str_list(data, offset)
+    return {
+        'investigation_state': {
+            'progress': progress,
+            'suspects_interviewed': suspects,
+            'rooms_investigated': rooms,
+            'evidence_collected': evidence,
+            'current_character': inv_character,
+            'widget_open': bool(flags & _FLAG_WIDGET_OPEN)
+        },
+        'widget_state': {
+            'is_open': bool(flags & _FLAG_IS_OPEN),
+            'current_character': widget_character,
+            'investigation_active': bool(flags & _FLAG_INVESTIGATION_ACTIVE),
+            'retry_count': retry_count
+        },
+        'timestamp': timestamp
+    }
+
+class StatePersistence:
+    """Snapshot + append-only journal persistence for one save file.
+    
+    Files for ``filename``:
+      filename                 JSON snapshot (same shape as before)
+      filename.bin             compact binary snapshot, preferred on load
+      filename.journal         deltas appended since the last snapshot
+      filename.journal.old     journal being compacted; replayed if a crash interrupted it
+    
+    Snapshots are written atomically (temp file + rename). A torn record at
+    the journal tail is ignored on replay.
+    """
+    
+    def __init__(self, filename: str = "investigation_state.json",
+                 compact_after: int = 500, fsync: bool = False):
+        self.filename = filename
+        self.binary_path = filename + '.bin'
+        self.journal_path = filename + '.journal'
+        self.rotated_path = self.journal_path + '.old'
+        self.compact_after = compact_after
+        self.fsync = fsync
+        
+        self._journal = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._compaction: Optional[Future] = None
+        
+        # Counters
+        self.records_since_snapshot = 0
+        self.compactions = 0
+    
+    # Writing
+    
+    def append(self, op: JournalOp, payload: bytes = b'') -> bool:
+        """Append one delta record, returns True once compaction is due"""
+        record = _JOURNAL_RECORD.pack(op, time.time(), len(payload)) + payload
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'ab')
+            self._journal.write(record)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self.records_since_snapshot += 1
+            return self.records_since_snapshot >= self.compact_after
+    
+    @staticmethod
+    def write_snapshot(filename: str, state_data: Dict[str, Any], fsync: bool = True) -> None:
+        """Atomically write the JSON snapshot and its binary twin"""
+        _atomic_write(filename, json.dumps(state_data).encode('utf-8'), fsync)
+        _atomic_write(filename + '.bin', encode_state_snapshot(state_data), fsync)
+    
+    @staticmethod
+    def drop_journals(filename: str) -> None:
+        """Delete filename's journals, e.g. once a plain snapshot supersedes them"""
+        for path in (filename + '.journal', filename + '.journal.old'):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+    
+    def _rotate_journal(self) -> None:
+        # Caller holds self._lock
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if not os.path.exists(self.journal_path):
+            return
+        if os.path.exists(self.rotated_path):
+            # An earlier compaction never finished: keep its records too
+            with open(self.journal_path, 'rb') as src, open(self.rotated_path, 'ab') as dst:
+                dst.write(src.read())
+            os.unlink(self.journal_path)
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+    
+    def _write_and_drop_rotated(self, state_data: Dict[str, Any]) -> None:
+        self.write_snapshot(self.filename, state_data, self.fsync)
+        try:
+            os.unlink(self.rotated_path)
+        except FileNotFoundError:
+            pass
+        self.compactions += 1
+    
+    def compact(self, state_data: Dict[str, Any], background: bool = True) -> Optional[Future]:
+        """Fold the journal into a fresh snapshot of state_data.
+        
+        state_data must already reflect every journaled delta; the caller
+        captures it under its own state lock before calling. A background
+        compaction already running is returned as is; a foreground one waits
+        for it and then writes state_data, so it is on disk on return.
+        """
+        while True:
+            with self._lock:
+                pending = self._compaction
+                if pending is None or pending.done():
+                    self._rotate_journal()
+                    self.records_since_snapshot = 0
+                    if not background:
+                        self._compaction = None
+                        self._write_and_drop_rotated(state_data)
+                        return None
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(max_workers=1,
+                                                            thread_name_prefix="blackwood-compact")
+                    self._compaction = self._executor.submit(self._write_and_drop_rotated, state_data)
+                    return self._compaction
+                if background:
+                    return pending
+            wait((pending,))
+    
+    def close(self) -> None:
+        """Wait for a pending compaction and close the journal"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+    
+    # Reading
+    
+    @staticmethod
+    def _iter_journal(path: str):
+        """Yield (op, timestamp, payload) records, stopping at a torn tail"""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            while True:
+                header = f.read(_JOURNAL_RECORD.size)
+                if len(header) < _JOURNAL_RECORD.size:
+                    return
+                op, timestamp, length = _JOURNAL_RECORD.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    logger.warning("Ignoring torn journal record in %s", path)
+                    return
+                yield op, timestamp, payload
+    
+    @staticmethod
+    def _read_snapshot(filename: str) -> Optional[Dict[str, Any]]:
+        binary_path = filename + '.bin'
+        has_json = os.path.exists(filename)
+        if os.path.exists(binary_path) and (
+                not has_json or os.path.getmtime(binary_path) >= os.path.getmtime(filename)):
+            try:
+                with open(binary_path, 'rb') as f:
+                    return decode_state_snapshot(f.read())
+            except (ValueError, struct.error) as e:
+                logger.warning("Binary snapshot unreadable, using JSON: %s", e)
+        if has_json:
+            with open(filename, 'r') as f:
+                return json.load(f)
+        return None
+    
+    @classmethod
+    def exists(cls, filename: str) -> bool:
+        return any(os.path.exists(path) for path in (
+            filename, filename + '.bin', filename + '.journal', filename + '.journal.old'))
+    
+    @classmethod
+    def read(cls, filename: str,
+             on_record: Optional[Callable[[int, float, bytes], None]] = None) -> Dict[str, Any]:
+        """Snapshot plus replayed journal, in save_state's dict shape.
+        
+        Journal records are streamed one at a time rather than read whole;
+        on_record(op, timestamp, payload) sees each one as it is replayed.
+        """
+        state_data = cls._read_snapshot(filename) or {'timestamp': 0}
+        inv = state_data.setdefault('investigation_state', {})
+        widget = state_data.setdefault('widget_state', {})
+        state = InvestigationState(
+            progress=inv.get('progress', 0),
+            suspects_interviewed=inv.get('suspects_interviewed'),
+            rooms_investigated=inv.get('rooms_investigated'),
+            evidence_collected=inv.get('evidence_collected'),
+            current_character=inv.get('current_character'),
+            widget_open=inv.get('widget_open', False)
+        )
+        timestamp = state_data.get('timestamp', 0)
+        
+        for path in (filename + '.journal.old', filename + '.journal'):
+            for op, record_time, payload in cls._iter_journal(path):
+                timestamp = max(timestamp, record_time)
+                if on_record is not None:
+                    on_record(op, record_time, payload)
+                if op == JournalOp.EVIDENCE:
+                    state.evidence_collected.add(payload.decode('utf-8'))
+                elif op == JournalOp.SUSPECT:
+                    state.suspects_interviewed.add(payload.decode('utf-8'))
+                elif op == JournalOp.ROOM:
+                    state.rooms_investigated.add(payload.decode('utf-8'))
+                elif op == JournalOp.PROGRESS:
+                    (state.progress,) = _I32.unpack(payload)
+                elif op == JournalOp.CHARACTER:
+                    character = payload.decode('utf-8') or None
+                    state.current_character = character
+                    widget['current_character'] = character
+                elif op == JournalOp.WIDGET_OPEN:
+                    is_open = payload == b'\x01'
+                    state.widget_open = is_open
+                    widget['is_open'] = is_open
+                    widget['investigation_active'] = is_open
+                elif op == JournalOp.RESET:
+                    state = InvestigationState()
+                    widget.clear()
+        
+        state_data['investigation_state'] = {
+            'progress': state.progress,
+            'suspects_interviewed': state.suspects_interviewed,
+            'rooms_investigated': state.rooms_investigated,
+            'evidence_collected': state.evidence_collected,
+            'current_character': state.current_character,
+            'widget_open': state.widget_open
+        }
+        state_data['timestamp'] = timestamp
+        return state_data
@@ -0,0 +1,172 @@
+"""Speculative prefetch of likely suspect replies into the chat response cache"""
+
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterable
+
+from .config import CHARACTER_NAMES, ROOM_CHARACTERS
+from .state import InvestigationState
+from .chat import BlackwoodChatClient
+
+logger = logging.getLogger(__name__)
+
+# Speculative prefetch: what a detective asks first, in priority order
+PREFETCH_QUESTIONS = (
+    "Hello, I'm Detective Chen. May I ask you a few questions?",
+    "Where were you on the night Victoria died?",
+    "What was your relationship with Victoria?",
+    "Did anyone have a reason to want Victoria dead?",
+    "Did you see or hear anything unusual that night?",
+)
+
+_LABEL_PREFIXES = ('room_', 'investigate_', 'interview_', 'question_', 'talk_to_')
+
+class Prefetcher:
+    """Warms a client's ResponseCache with a suspect's likely first replies.
+    
+    Entering a room (BlackwoodWidget.enable_prefetch and SessionManager's
+    prefetch_budget call on_room_enter) or a scene named like a label such
+    as ``investigate_study`` or ``interview_butler`` (``on_label``) queues
+    that character's opening line and common follow-ups on a single
+    background thread, so foreground chat keeps the rest of the connection
+    pool. The client must already have a ResponseCache: turning one on
+    would change what its foreground chat returns. Keys are computed against the state the
+    player will have once the suspect is interviewed, which is the state
+    the first real question is asked with. Each session may send at most
+    ``budget`` prefetch requests; moving on to another character drops the
+    session's queued work for the previous one and refunds it.
+    """
+    
+    def __init__(self, client: BlackwoodChatClient, questions: Iterable[str] = PREFETCH_QUESTIONS,
+                 budget: int = 25, room_characters: Dict[str, str] = ROOM_CHARACTERS,
+                 timeout: Optional[float] = None):
+        if client.cache is None:
+            raise ValueError("Prefetcher needs a client with a ResponseCache "
+                             "(BlackwoodChatClient(cache=ResponseCache()))")
+        self.client = client
+        self.questions = tuple(questions)
+        self.budget = budget
+        self.timeout = timeout
+        self._remaining: Dict[str, int] = {}
+        self._generation: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Label suffixes understood by character_for_label: room ids, character
+        # ids and each part of a character id ('butler', 'lily', ...)
+        aliases: Dict[str, str] = {}
+        for character_id in CHARACTER_NAMES:
+            aliases[character_id] = character_id
+            for part in character_id.split('-'):
+                aliases.setdefault(part, character_id)
+        aliases.update(room_characters)
+        self._aliases = aliases
+        
+        # Counters
+        self.queued = 0
+        self.sent = 0
+        self.skipped = 0
+        self.superseded = 0
+    
+    def character_for_label(self, label: str) -> Optional[str]:
+        """Character a Ren'Py label leads to, or None"""
+        name = label.rsplit('.', 1)[-1].lower()
+        for prefix in _LABEL_PREFIXES:
+            if name.startswith(prefix):
+                name = name[len(prefix):]
+                break
+        return self._aliases.get(name) or self._aliases.get(name.replace('_', '-'))
+    
+    def on_room_enter(self, room_id: str, state: Optional[InvestigationState] = None,
+                      session_id: str = '') -> int:
+        character_id = self._aliases.get(room_id)
+        return self.prefetch(character_id, state, session_id) if character_id else 0
+    
+    def on_label(self, label: str, state: Optional[InvestigationState] = None,
+                 session_id: str = '') -> int:
+        character_id = self.character_for_label(label)
+        return self.prefetch(character_id, state, session_id) if character_id else 0
+    
+    def prefetch(self, character_id: str, state: Optional[InvestigationState] = None,
+                 session_id: str = '') -> int:
+        """Queue replies for character_id not already cached, returns how many were queued.
+        
+        Call on the thread that owns state: cache keys are taken here, the
+        background thread never reads it.
+        """
+        if character_id not in CHARACTER_NAMES or self.client._offline():
+            return 0
+        projected = None
+        if state is not None:
+            projected = InvestigationState(progress=state.progress,
+                                           suspects_interviewed=state.suspects_interviewed,
+                                           evidence_collected=state.evidence_collected)
+            projected.add_suspect(character_id)
+        cache = self.client.cache
+        keys = [(question, key) for question, key in
+                ((q, cache.make_key(character_id, q, projected)) for q in self.questions)
+                if key not in cache]
+        
+        with self._lock:
+            generation = self._generation.get(session_id, 0) + 1
+            self._generation[session_id] = generation
+            remaining = self._remaining.get(session_id, self.budget)
+            keys = keys[:max(remaining, 0)]
+            self._remaining[session_id] = remaining - len(keys)
+            if not keys:
+                return 0
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1,
+                                                    thread_name_prefix="blackwood-prefetch")
+            executor = self._executor
+        
+        for question, key in keys:
+            executor.submit(self._fetch, session_id, generation, character_id, question, key)
+        self.queued += len(keys)
+        self.client.metrics.increment('prefetch_queued_total', len(keys))
+        return len(keys)
+    
+    def _fetch(self, session_id: str, generation: int, character_id: str,
+               question: str, key: str) -> None:
+        cache = self.client.cache
+        with self._lock:
+            stale = self._generation.get(session_id) != generation
+        if stale or key in cache or self.client._offline():
+            self._refund(session_id)
+            if stale:
+                self.superseded += 1
+            else:
+                self.skipped += 1
+            return
+        try:
+            result, _, _ = self.client._send_chat(character_id, question, b'[]', self.timeout)
+        except Exception as e:
+            logger.warning("Prefetch failed for %s: %s", character_id, e)
+            return
+        self.sent += 1
+        self.client.metrics.increment('prefetch_sent_total')
+        if result.success and result.response is not None and not result.fallback:
+            cache.put(key, result.response)
+    
+    def _refund(self, session_id: str) -> None:
+        with self._lock:
+            if session_id in self._remaining:
+                self._remaining[session_id] += 1
+    
+    def remaining(self, session_id: str = '') -> int:
+        """Prefetch requests session_id may still send"""
+        with self._lock:
+            return self._remaining.get(session_id, self.budget)
+    
+    def forget(self, session_id: str) -> None:
+        """Drop a session's budget and cancel its queued work"""
+        with self._lock:
+            self._remaining.pop(session_id, None)
+            self._generation.pop(session_id, None)
+    
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
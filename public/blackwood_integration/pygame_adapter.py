@@ -0,0 +1,60 @@
+"""Example integration for Pygame games"""
+
+from .config import WidgetConfig
+from .widget import BlackwoodWidget
+
+class PygameGame:
+    """Example integration for Pygame games"""
+    
+    def __init__(self):
+        # Non-blocking so a failed browser launch never stalls the frame loop;
+        # coalesced so a burst of evidence redraws the progress bar once per frame
+        self.widget = BlackwoodWidget(WidgetConfig(non_blocking=True, coalesce_events=True))
+        self.investigation_active = False
+        
+        # Set up callbacks
+        self.widget.on_character_selected = self.on_character_selected
+        self.widget.on_evidence_found = self.on_evidence_found
+        self.widget.on_investigation_progress = self.on_investigation_progress
+    
+    def on_character_selected(self, character_id: str):
+        """Called when a character is selected"""
+        print(f"Character selected: {character_id}")
+        # Update your game state here
+    
+    def on_evidence_found(self, evidence: str):
+        """Called when evidence is found"""
+        print(f"Evidence found: {evidence}")
+        # Update your inventory system
+    
+    def on_investigation_progress(self, progress: int):
+        """Called when investigation progress changes"""
+        print(f"Investigation progress: {progress}%")
+        # Update your UI
+    
+    def update(self):
+        """Call once per frame from your main loop to deliver widget callbacks"""
+        self.widget.process_callbacks()
+    
+    def handle_room_enter(self, room_id: str):
+        """Called when player enters a room"""
+        if room_id in self.widget.room_characters:
+            future = self.widget.start_room_investigation(room_id)
+            self.widget.call_when_done(future, self._on_investigation_started)
+    
+    def _on_investigation_started(self, success: bool):
+        if success:
+            self.investigation_active = True
+    
+    def handle_evidence_found(self, evidence: str):
+        """Called when player finds evidence"""
+        self.widget.add_evidence(evidence)
+    
+    def toggle_widget(self):
+        """Toggle widget visibility"""
+        if self.investigation_active:
+            self.widget.hide_widget()
+            self.investigation_active = False
+        else:
+            self.widget.show_widget()
+            self.investigation_active = True
@@ -0,0 +1,287 @@
+"""Retry scheduling and circuit breakers shared by browser launches and HTTP calls"""
+
+import threading
+import time
+import logging
+import random
+from typing import Optional, Dict, Any, Callable, Tuple
+from dataclasses import dataclass
+from enum import Enum
+
+from .config import WidgetConfig
+from .metrics import DEFAULT_METRICS, Metrics
+
+logger = logging.getLogger(__name__)
+
+# Resilience: retry scheduling and circuit breakers shared by browser launches and HTTP calls
+HEALTH_PATH = "/api/health"
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of making a call while its circuit is open"""
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one endpoint.
+    
+    After failure_threshold failures in a row the breaker opens and callers
+    skip the network for reset_timeout seconds. It then lets a single probe
+    through (half-open): success closes it, failure opens it again.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.times_opened = 0
+        self.rejected = 0
+    
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            if (self._state is BreakerState.OPEN and
+                    time.monotonic() - self._opened_at >= self.reset_timeout):
+                self._state = BreakerState.HALF_OPEN
+                self._probing = False
+            return self._state
+    
+    @property
+    def failures(self) -> int:
+        return self._failures
+    
+    def allow(self) -> bool:
+        """True if a call may go out now; claims the probe slot when half-open"""
+        state = self.state
+        with self._lock:
+            if state is BreakerState.CLOSED:
+                return True
+            if state is BreakerState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+    
+    def release_probe(self) -> None:
+        """Give back the half-open probe slot without recording an outcome"""
+        with self._lock:
+            self._probing = False
+    
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state is not BreakerState.CLOSED:
+                logger.info("Circuit '%s' closed", self.name)
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._probing = False
+    
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if this one opened the circuit"""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if (self._state is BreakerState.OPEN or
+                    (self._state is BreakerState.CLOSED and self._failures < self.failure_threshold)):
+                return False
+            logger.warning("Circuit '%s' opened after %s failures", self.name, self._failures)
+            self._state = BreakerState.OPEN
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+            return True
+    
+    def __repr__(self) -> str:
+        return f"CircuitBreaker({self.name!r}, {self.state.value})"
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential back-off with full jitter: attempt n sleeps U(0, min(max_delay, base * 2**(n-1)))"""
+    max_retries: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    jitter: bool = True
+    
+    @classmethod
+    def from_config(cls, config: WidgetConfig) -> 'RetryPolicy':
+        return cls(max_retries=config.max_retries, base_delay=config.retry_delay)
+    
+    def delay(self, attempt: int) -> float:
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+class Resilience:
+    """Per-endpoint circuit breakers and a process-wide retry budget.
+    
+    Endpoints are full URLs (or any stable name). Each backend base URL also
+    gets a health breaker fed by /api/health probes; while it is open every
+    endpoint under that base URL is refused without a network attempt. At
+    most max_concurrent_retries calls may be backing off at once, so an
+    outage does not turn into a retry storm from every thread.
+    """
+    
+    # HTTP callers add http.client.HTTPException; kept out of here so the
+    # widget core does not import http.client
+    RETRY_ON = (OSError, ValueError)
+    
+    def __init__(self, max_concurrent_retries: int = 8, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, metrics: Optional[Metrics] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = metrics or DEFAULT_METRICS
+        self.max_concurrent_retries = max_concurrent_retries
+        self._retry_slots = threading.BoundedSemaphore(max_concurrent_retries)
+        self._retries_in_flight = 0
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._probes: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+    
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Breaker for endpoint, created on first use"""
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    endpoint, self.failure_threshold, self.reset_timeout)
+            return breaker
+    
+    def health_breaker(self, base_url: str) -> CircuitBreaker:
+        return self.breaker(base_url + HEALTH_PATH)
+    
+    def is_down(self, endpoint: str, base_url: Optional[str] = None) -> bool:
+        """True if calls to endpoint would be refused right now (claims nothing)"""
+        if base_url is not None and self.health_breaker(base_url).state is BreakerState.OPEN:
+            return True
+        return self.breaker(endpoint).state is BreakerState.OPEN
+    
+    def _record_failure(self, breaker: CircuitBreaker) -> None:
+        if breaker.record_failure():
+            self.metrics.increment('circuit_opened_total')
+    
+    def call(self, endpoint: str, fn: Callable[[], Any], policy: RetryPolicy,
+             failed: Optional[Callable[[Any], bool]] = None,
+             discard: Optional[Callable[[Any], None]] = None,
+             base_url: Optional[str] = None, metric: str = 'request',
+             retry_on: Optional[Tuple[type, ...]] = None) -> Any:
+        """Run fn with retries and back-off under endpoint's breaker.
+        
+        fn is retried when it raises one of retry_on (default RETRY_ON) or when failed(result)
+        is true; discard(result) is called on failed results that are
+        dropped for a retry. Retries stop early once the breaker opens or the
+        retry budget is exhausted. Returns the last result or re-raises the
+        last error; raises CircuitOpenError if the call is refused outright.
+        Other exceptions propagate without counting as a failure.
+        """
+        retry_on = retry_on or self.RETRY_ON
+        breaker = self.breaker(endpoint)
+        if self.is_down(endpoint, base_url) or not breaker.allow():
+            self.metrics.increment('circuit_rejected_total')
+            raise CircuitOpenError(f"Circuit open for {endpoint}")
+        
+        attempt = 0
+        holding = False
+        try:
+            while True:
+                error = None
+                result = None
+                try:
+                    result = fn()
+                except retry_on as e:
+                    error = e
+                else:
+                    if failed is None or not failed(result):
+                        breaker.record_success()
+                        return result
+                self._record_failure(breaker)
+                
+                if attempt >= policy.max_retries or self.is_down(endpoint, base_url):
+                    break
+                if not holding:
+                    holding = self._retry_slots.acquire(blocking=False)
+                    if not holding:
+                        self.metrics.increment('retry_budget_exhausted_total')
+                        break
+                    with self._lock:
+                        self._retries_in_flight += 1
+                if error is None and discard is not None:
+                    discard(result)
+                attempt += 1
+                self.metrics.increment(f'{metric}_retries_total')
+                logger.info("Retrying %s... (%s/%s)", metric, attempt, policy.max_retries)
+                time.sleep(policy.delay(attempt))
+        except BaseException:
+            # Not an endpoint failure (closed pool, bad payload, interrupt), but a
+            # half-open probe must not stay claimed or the breaker never closes
+            breaker.release_probe()
+            raise
+        finally:
+            if holding:
+                with self._lock:
+                    self._retries_in_flight -= 1
+                self._retry_slots.release()
+        
+        if error is not None:
+            raise error
+        return result
+    
+    def report_health(self, base_url: str, healthy: bool) -> None:
+        breaker = self.health_breaker(base_url)
+        if healthy:
+            breaker.record_success()
+        else:
+            self._record_failure(breaker)
+    
+    def start_health_probe(self, base_url: str, probe: Callable[[], bool],
+                           interval: float = 15.0) -> None:
+        """Call probe() every interval seconds on a daemon thread and report the result"""
+        with self._lock:
+            if base_url in self._probes:
+                return
+            stop = self._probes[base_url] = threading.Event()
+        
+        def run():
+            while True:
+                try:
+                    healthy = probe()
+                except Exception as e:
+                    logger.warning("Health probe error: %s", e)
+                    healthy = False
+                self.report_health(base_url, healthy)
+                if stop.wait(interval):
+                    return
+        
+        threading.Thread(target=run, name="blackwood-health", daemon=True).start()
+    
+    def stop_health_probe(self, base_url: str) -> None:
+        with self._lock:
+            stop = self._probes.pop(base_url, None)
+        if stop is not None:
+            stop.set()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker states and counters per endpoint, for metrics and dashboards"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+            in_flight = self._retries_in_flight
+        return {
+            'retries_in_flight': in_flight,
+            'max_concurrent_retries': self.max_concurrent_retries,
+            'endpoints': {
+                b.name: {
+                    'state': b.state.value,
+                    'failures': b.failures,
+                    'times_opened': b.times_opened,
+                    'rejected': b.rejected
+                }
+                for b in breakers
+            }
+        }
+
+DEFAULT_RESILIENCE = Resilience()
@@ -0,0 +1,381 @@
+"""SessionManager: many players' investigations hosted in one process"""
+
+import threading
+import time
+import os
+import sys
+import logging
+import hashlib
+import json
+import struct
+import asyncio
+import collections
+import itertools
+from typing import Optional, Dict, Any, Callable, Iterable
+
+from .config import CHARACTER_NAMES, ROOM_CHARACTERS, WidgetConfig
+from .state import InvestigationState
+from .persistence import _atomic_write, decode_state_snapshot, encode_state_snapshot
+from .widget import WidgetUrlBuilder
+from .chat import BlackwoodChatClient, ChatResponse, ConversationHistory, HistoryPolicy, ResponseCache
+from .prefetch import Prefetcher
+from .cooldowns import CooldownManager
+
+logger = logging.getLogger(__name__)
+
+class InvestigationSession:
+    """One player's investigation inside a SessionManager"""
+    
+    __slots__ = ('player_id', 'state', 'last_active', 'histories')
+    
+    def __init__(self, player_id: str, state: InvestigationState = None):
+        self.player_id = player_id
+        self.state = state or InvestigationState()
+        self.last_active = time.monotonic()
+        self.histories: Optional[Dict[str, ConversationHistory]] = None
+    
+    def history(self, character_id: str, policy: HistoryPolicy) -> ConversationHistory:
+        if self.histories is None:
+            self.histories = {}
+        history = self.histories.get(character_id)
+        if history is None:
+            history = self.histories[character_id] = ConversationHistory(character_id, policy)
+        return history
+
+class SessionManager:
+    """Hosts many players' investigations in one process.
+    
+    Sessions are compact __slots__ objects that share the module-level
+    CHARACTER_NAMES/ROOM_CHARACTERS tables and interned ids. All chat calls
+    go through one BlackwoodChatClient, so they share its connection pool
+    and executor. Idle sessions can be parked on disk as binary snapshots,
+    with their per-character chat histories alongside, and are reloaded
+    transparently on next access. With prefetch_budget set, room entry and
+    suspect selection prefetch likely replies into the client's response
+    cache (one is created for the manager's own client).
+    """
+    
+    def __init__(self, config: WidgetConfig = None, storage_dir: Optional[str] = None,
+                 idle_timeout: float = 900.0, max_resident: Optional[int] = None,
+                 chat_client: Optional[BlackwoodChatClient] = None, max_connections: int = 8,
+                 prefetch_budget: Optional[int] = None,
+                 cooldowns: Optional[CooldownManager] = None):
+        self.config = config or WidgetConfig()
+        self.storage_dir = storage_dir
+        self.idle_timeout = idle_timeout
+        self.max_resident = max_resident
+        self._chat_client = chat_client
+        self._max_connections = max_connections
+        self._prefetch_budget = prefetch_budget
+        self._prefetcher: Optional[Prefetcher] = None
+        self._sessions: "collections.OrderedDict[str, InvestigationSession]" = collections.OrderedDict()
+        self._lock = threading.RLock()
+        
+        # Per-player throttling and character cooldowns applied in chat()
+        self.cooldowns = cooldowns
+        
+        # Called as on_investigation_progress(player_id, progress)
+        self.on_investigation_progress: Optional[Callable[[str, int], None]] = None
+        
+        # Counters
+        self.sessions_evicted = 0
+        self.sessions_restored = 0
+        
+        if prefetch_budget is not None and chat_client is not None and chat_client.cache is None:
+            raise ValueError("prefetch_budget needs a chat_client with a ResponseCache")
+        if storage_dir:
+            os.makedirs(storage_dir, exist_ok=True)
+    
+    @property
+    def chat_client(self) -> BlackwoodChatClient:
+        """Shared chat client, created on first use"""
+        with self._lock:
+            if self._chat_client is None:
+                # Prefetched replies are served from the cache, so prefetch_budget turns it on
+                cache = ResponseCache() if self._prefetch_budget is not None else None
+                self._chat_client = BlackwoodChatClient(self.config, self._max_connections,
+                                                        cache=cache)
+            return self._chat_client
+    
+    @property
+    def prefetcher(self) -> Optional[Prefetcher]:
+        """Shared prefetcher when prefetch_budget is set, created on first use"""
+        if self._prefetch_budget is None:
+            return None
+        with self._lock:
+            if self._prefetcher is None:
+                self._prefetcher = Prefetcher(self.chat_client, budget=self._prefetch_budget)
+            return self._prefetcher
+    
+    def _session_path(self, player_id: str) -> str:
+        digest = hashlib.sha1(player_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.storage_dir, f"{digest}.bin")
+    
+    def _history_path(self, player_id: str) -> str:
+        return self._session_path(player_id)[:-len('.bin')] + '.history.json'
+    
+    def _restore(self, player_id: str) -> Optional[InvestigationSession]:
+        if not self.storage_dir:
+            return None
+        path = self._session_path(player_id)
+        try:
+            with open(path, 'rb') as f:
+                data = decode_state_snapshot(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logger.error("Could not restore session %s: %s", player_id, e)
+            return None
+        os.unlink(path)
+        inv = data['investigation_state']
+        self.sessions_restored += 1
+        session = InvestigationSession(player_id, InvestigationState(
+            progress=inv['progress'],
+            suspects_interviewed=inv['suspects_interviewed'],
+            rooms_investigated=inv['rooms_investigated'],
+            evidence_collected=[sys.intern(e) for e in inv['evidence_collected']],
+            current_character=inv['current_character'],
+            widget_open=inv['widget_open']
+        ))
+        self._restore_histories(session)
+        return session
+    
+    def _restore_histories(self, session: InvestigationSession) -> None:
+        path = self._history_path(session.player_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                histories = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error("Could not restore chat history for %s: %s", session.player_id, e)
+            histories = {}
+        os.unlink(path)
+        policy = self.chat_client.history_policy
+        for character_id, data in histories.items():
+            try:
+                session.history(character_id, policy).restore(data)
+            except (KeyError, TypeError, AttributeError) as e:
+                logger.error("Bad chat history for %s/%s: %s", session.player_id, character_id, e)
+    
+    def get(self, player_id: str, create: bool = True) -> Optional[InvestigationSession]:
+        """Resident session for player_id, restoring or creating it as needed"""
+        with self._lock:
+            session = self._sessions.get(player_id)
+            if session is None:
+                session = self._restore(player_id)
+                if session is None:
+                    if not create:
+                        return None
+                    session = InvestigationSession(player_id)
+                self._sessions[player_id] = session
+                if self.max_resident is not None and len(self._sessions) > self.max_resident:
+                    self._evict_oldest(len(self._sessions) - self.max_resident, keep=player_id)
+            else:
+                self._sessions.move_to_end(player_id)
+            session.last_active = time.monotonic()
+            return session
+    
+    def _notify_progress(self, session: InvestigationSession, old_progress: int) -> None:
+        if self.on_investigation_progress and session.state.progress != old_progress:
+            self.on_investigation_progress(session.player_id, session.state.progress)
+    
+    def add_evidence(self, player_id: str, evidence: str) -> bool:
+        with self._lock:
+            session = self.get(player_id)
+            old_progress = session.state.progress
+            if not session.state.add_evidence(sys.intern(evidence)):
+                return False
+            self._notify_progress(session, old_progress)
+            return True
+    
+    def select_suspect(self, player_id: str, character_id: str) -> bool:
+        """Mark a suspect interviewed; False for unknown or already-interviewed suspects"""
+        if character_id not in CHARACTER_NAMES:
+            return False
+        with self._lock:
+            session = self.get(player_id)
+            old_progress = session.state.progress
+            if not session.state.add_suspect(character_id):
+                return False
+            session.state.current_character = character_id
+            self._notify_progress(session, old_progress)
+            if self._prefetch_budget is not None:
+                self.prefetcher.prefetch(character_id, session.state, player_id)
+            return True
+    
+    def start_room_investigation(self, player_id: str, room_id: str) -> bool:
+        """Mark a room investigated; False for unknown or already-investigated rooms"""
+        character_id = ROOM_CHARACTERS.get(room_id)
+        if character_id is None:
+            return False
+        with self._lock:
+            session = self.get(player_id)
+            old_progress = session.state.progress
+            if not session.state.add_room(room_id):
+                return False
+            session.state.current_character = character_id
+            self._notify_progress(session, old_progress)
+            if self._prefetch_budget is not None:
+                self.prefetcher.on_room_enter(room_id, session.state, player_id)
+            return True
+    
+    def get_investigation_summary(self, player_id: str) -> Dict[str, Any]:
+        with self._lock:
+            session = self.get(player_id, create=False)
+            return session.state.to_dict() if session else {}
+    
+    def deep_links(self, player_ids: Optional[Iterable[str]] = None,
+                   interrogation: bool = False) -> Dict[str, str]:
+        """Widget URLs for many players at once (e.g. for emailed or QR-code links).
+        
+        Defaults to every resident session; listed players that were parked
+        are restored first. Each link opens on the player's current character.
+        """
+        builder = WidgetUrlBuilder.for_config(self.config)
+        with self._lock:
+            if player_ids is None:
+                sessions = list(self._sessions.values())
+            else:
+                sessions = [s for s in (self.get(p, create=False) for p in player_ids) if s]
+            urls = builder.build_many(((s.state.current_character, s.state) for s in sessions),
+                                      interrogation)
+        return {session.player_id: url for session, url in zip(sessions, urls)}
+    
+    def end_session(self, player_id: str) -> bool:
+        """Drop a session from memory and disk"""
+        with self._lock:
+            if self._prefetcher is not None:
+                self._prefetcher.forget(player_id)
+            if self.cooldowns is not None:
+                self.cooldowns.forget(player_id)
+            removed = self._sessions.pop(player_id, None) is not None
+            if self.storage_dir:
+                for path in (self._session_path(player_id), self._history_path(player_id)):
+                    try:
+                        os.unlink(path)
+                        removed = True
+                    except FileNotFoundError:
+                        pass
+            return removed
+    
+    def _park(self, session: InvestigationSession) -> None:
+        if not self.storage_dir:
+            return
+        data = {
+            'investigation_state': session.state.to_dict(),
+            'widget_state': {},
+            'timestamp': time.time()
+        }
+        histories = {character_id: history.to_dict()
+                     for character_id, history in (session.histories or {}).items()}
+        histories = {character_id: history for character_id, history in histories.items()
+                     if history['messages'] or history['summary'] is not None}
+        # Histories first: a snapshot found without them restores fresh conversations
+        if histories:
+            _atomic_write(self._history_path(session.player_id),
+                          json.dumps(histories, ensure_ascii=False).encode('utf-8'), fsync=False)
+        else:
+            try:
+                os.unlink(self._history_path(session.player_id))
+            except FileNotFoundError:
+                pass
+        _atomic_write(self._session_path(session.player_id), encode_state_snapshot(data), fsync=False)
+    
+    def _evict_oldest(self, count: int, keep: Optional[str] = None) -> int:
+        evicted = 0
+        for player_id in list(itertools.islice(self._sessions, count + 1)):
+            if evicted >= count:
+                break
+            if player_id == keep:
+                continue
+            session = self._sessions.pop(player_id)
+            try:
+                self._park(session)
+            except OSError as e:
+                logger.error("Could not park session %s: %s", player_id, e)
+            evicted += 1
+        self.sessions_evicted += evicted
+        return evicted
+    
+    def evict_idle(self, idle_timeout: Optional[float] = None) -> int:
+        """Park (or drop, without storage_dir) sessions idle longer than idle_timeout"""
+        cutoff = time.monotonic() - (self.idle_timeout if idle_timeout is None else idle_timeout)
+        evicted = 0
+        with self._lock:
+            # Sessions are kept in access order, so idle ones are at the front
+            while self._sessions:
+                player_id, session = next(iter(self._sessions.items()))
+                if session.last_active > cutoff:
+                    break
+                del self._sessions[player_id]
+                try:
+                    self._park(session)
+                except OSError as e:
+                    logger.error("Could not park session %s: %s", player_id, e)
+                evicted += 1
+        self.sessions_evicted += evicted
+        return evicted
+    
+    def chat(self, player_id: str, character_id: str, message: str,
+             timeout: Optional[float] = None) -> ChatResponse:
+        """Chat on behalf of a player through the shared client and pool.
+        
+        With cooldowns set, a throttled player or a character still offline
+        for this player gets a failed response without a request, and an
+        abusive or irrelevant message sends the character offline instead
+        of reaching /api/chat. The offline message is in ``response``.
+        """
+        if self.cooldowns is not None:
+            blocked = self._check_cooldowns(player_id, character_id, message, timeout)
+            if blocked is not None:
+                return blocked
+        with self._lock:
+            session = self.get(player_id)
+            client = self.chat_client
+            history = session.history(character_id, client.history_policy)
+        return client.chat(character_id, message, timeout, session.state, history)
+    
+    def _check_cooldowns(self, player_id: str, character_id: str, message: str,
+                         timeout: Optional[float]) -> Optional[ChatResponse]:
+        cooldowns = self.cooldowns
+        cooldowns.poll()
+        if not cooldowns.allow(player_id, character_id):
+            status = cooldowns.status(player_id, character_id)
+            if status:
+                return ChatResponse(success=False, response=status['message'],
+                                    error=f"Character offline ({status['remaining']}s)", status=429)
+            return ChatResponse(success=False, error='Too many messages', status=429)
+        verdict = self.chat_client.moderate(message, CHARACTER_NAMES.get(character_id), timeout)
+        if cooldowns.apply_moderation(player_id, character_id, verdict):
+            status = cooldowns.status(player_id, character_id)
+            return ChatResponse(success=False, response=status.get('message'),
+                                error=verdict.reason, status=403)
+        return None
+    
+    async def chat_async(self, player_id: str, character_id: str, message: str,
+                         timeout: Optional[float] = None) -> ChatResponse:
+        """asyncio variant of chat, run on the shared client's executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.chat_client._get_executor(),
+            lambda: self.chat(player_id, character_id, message, timeout)
+        )
+    
+    def close(self, park: bool = True) -> None:
+        """Park every resident session (if storage_dir is set) and close the client"""
+        with self._lock:
+            if park:
+                for session in self._sessions.values():
+                    self._park(session)
+            self._sessions.clear()
+            if self._prefetcher is not None:
+                self._prefetcher.close()
+            if self._chat_client is not None:
+                self._chat_client.close()
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._sessions
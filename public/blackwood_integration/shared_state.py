@@ -0,0 +1,272 @@
+"""Investigation state published to shared memory for other processes"""
+
+import threading
+import time
+import logging
+import struct
+import contextlib
+import mmap
+from typing import Optional, Dict, Any, Callable
+
+from .persistence import JournalOp, _FLAG_INVESTIGATION_ACTIVE, _FLAG_IS_OPEN, _FLAG_WIDGET_OPEN, _I32
+
+logger = logging.getLogger(__name__)
+
+# Shared-memory state: fixed header + append-only string table, guarded by a seqlock
+_SHARED_MAGIC = b'BWM1'
+_SHARED_LAYOUT = 1
+# magic, layout, flags, retry_count, seq, timestamp, progress,
+# suspects, rooms, evidence, table bytes used, current_character (length-prefixed)
+_SHARED_HEADER = struct.Struct('<4sHBBQdiIIIIB63s')
+_SHARED_SEQ_OFFSET = 8
+_SHARED_TABLE_OFFSET = 128
+_SHARED_RECORD = struct.Struct('<BI')  # JournalOp, utf-8 length
+_U64 = struct.Struct('<Q')
+
+class SharedStateStore:
+    """InvestigationState published to shared memory for other processes.
+    
+    One writer (the game) applies the same deltas it journals; any number
+    of readers (overlay, stats, moderation worker) attach by name and read
+    progress, current character and counts straight out of the fixed
+    header, with no locks and no JSON. Suspects, rooms and evidence live
+    in an append-only table after the header, read only by ``read``.
+    
+    Consistency is a seqlock: the writer makes the sequence number odd
+    before touching the buffer and even again afterwards; readers retry
+    until they see the same even number before and after copying.
+    ``version`` doubles as a cheap "anything changed?" check for pollers.
+    
+    Backed by ``multiprocessing.shared_memory``, or by an mmap'd file when
+    ``path`` is given (survives the writer, visible to non-Python tools).
+    """
+    
+    READ_ATTEMPTS = 10000
+    
+    def __init__(self, name: str = "blackwood-investigation", create: bool = False,
+                 capacity: int = 1 << 20, path: Optional[str] = None):
+        self.name = name
+        self.path = path
+        self.writer = create
+        self._shm = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        size = _SHARED_TABLE_OFFSET + capacity
+        
+        if path is not None:
+            with open(path, 'w+b' if create else 'r+b') as f:
+                if create:
+                    f.truncate(size)
+                self._mmap = mmap.mmap(f.fileno(), 0)
+            self._buf = memoryview(self._mmap)
+        else:
+            from multiprocessing import shared_memory
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+            except FileExistsError:
+                # Left behind by a writer that crashed: take it over
+                self._shm = shared_memory.SharedMemory(name=name)
+                if self._shm.size < size:
+                    self._shm.close()
+                    raise ValueError(f"Shared state {name!r} exists and is smaller than requested")
+            if not create:
+                self._untrack()
+            self._buf = self._shm.buf
+        
+        if create:
+            self._seq = 0
+            self.write({})
+        else:
+            if bytes(self._buf[:4]) != _SHARED_MAGIC:
+                self.close()
+                raise ValueError(f"Not a Blackwood shared state store: {path or name}")
+            (self._seq,) = _U64.unpack_from(self._buf, _SHARED_SEQ_OFFSET)
+    
+    def _untrack(self) -> None:
+        # Before 3.13 attaching registers the segment with this process's
+        # resource tracker, which would unlink it when a reader exits
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self._shm._name, 'shared_memory')
+        except Exception:
+            pass
+    
+    @classmethod
+    def attach(cls, name: str = "blackwood-investigation", path: Optional[str] = None) -> "SharedStateStore":
+        """Open an existing store read-only in spirit: never call write/apply on it"""
+        return cls(name, create=False, path=path)
+    
+    @property
+    def capacity(self) -> int:
+        return len(self._buf) - _SHARED_TABLE_OFFSET
+    
+    # Writing (single writer process; the lock covers its threads)
+    
+    def _pack_header(self) -> None:
+        character = (self._character or '').encode('utf-8')[:63]
+        _SHARED_HEADER.pack_into(
+            self._buf, 0, _SHARED_MAGIC, _SHARED_LAYOUT, self._flags, min(self._retry_count, 255),
+            self._seq, time.time(), self._progress, self._counts[JournalOp.SUSPECT],
+            self._counts[JournalOp.ROOM], self._counts[JournalOp.EVIDENCE], self._used,
+            len(character), character
+        )
+    
+    @contextlib.contextmanager
+    def _writing(self):
+        with self._lock:
+            self._seq += 1
+            _U64.pack_into(self._buf, _SHARED_SEQ_OFFSET, self._seq)
+            try:
+                yield
+                self._pack_header()
+            finally:
+                self._seq += 1
+                _U64.pack_into(self._buf, _SHARED_SEQ_OFFSET, self._seq)
+    
+    def _append(self, op: JournalOp, payload: bytes) -> bool:
+        end = _SHARED_TABLE_OFFSET + self._used + _SHARED_RECORD.size + len(payload)
+        if end > len(self._buf):
+            logger.error("Shared state store full, %s not published", op.name.lower())
+            return False
+        offset = _SHARED_TABLE_OFFSET + self._used
+        _SHARED_RECORD.pack_into(self._buf, offset, op, len(payload))
+        self._buf[offset + _SHARED_RECORD.size:end] = payload
+        self._used = end - _SHARED_TABLE_OFFSET
+        self._counts[op] += 1
+        return True
+    
+    def write(self, state_data: Dict[str, Any]) -> bool:
+        """Replace the whole store with save_state-shaped data"""
+        inv = state_data.get('investigation_state', {})
+        widget = state_data.get('widget_state', {})
+        ok = True
+        with self._writing():
+            self._progress = inv.get('progress', 0)
+            self._character = widget.get('current_character', inv.get('current_character'))
+            self._retry_count = widget.get('retry_count', 0)
+            self._flags = ((_FLAG_WIDGET_OPEN if inv.get('widget_open') else 0) |
+                           (_FLAG_IS_OPEN if widget.get('is_open') else 0) |
+                           (_FLAG_INVESTIGATION_ACTIVE if widget.get('investigation_active') else 0))
+            self._used = 0
+            self._counts = {JournalOp.SUSPECT: 0, JournalOp.ROOM: 0, JournalOp.EVIDENCE: 0}
+            for op, key in ((JournalOp.SUSPECT, 'suspects_interviewed'),
+                            (JournalOp.ROOM, 'rooms_investigated'),
+                            (JournalOp.EVIDENCE, 'evidence_collected')):
+                for item in inv.get(key, ()):
+                    ok = self._append(op, item.encode('utf-8')) and ok
+        return ok
+    
+    def apply(self, op: JournalOp, payload: bytes = b'') -> bool:
+        """Apply one journal delta (same ops and payloads as StatePersistence.append)"""
+        if op == JournalOp.RESET:
+            return self.write({})
+        with self._writing():
+            if op in self._counts:
+                return self._append(op, payload)
+            if op == JournalOp.PROGRESS:
+                (self._progress,) = _I32.unpack(payload)
+            elif op == JournalOp.CHARACTER:
+                self._character = payload.decode('utf-8') or None
+            elif op == JournalOp.WIDGET_OPEN:
+                mask = _FLAG_WIDGET_OPEN | _FLAG_IS_OPEN | _FLAG_INVESTIGATION_ACTIVE
+                self._flags = self._flags | mask if payload == b'\x01' else self._flags & ~mask
+        return True
+    
+    # Reading (any process, lock-free)
+    
+    def _consistent(self, read: Callable[[], Any]):
+        buf = self._buf
+        for attempt in range(self.READ_ATTEMPTS):
+            (before,) = _U64.unpack_from(buf, _SHARED_SEQ_OFFSET)
+            if not before & 1:
+                value = read()
+                (after,) = _U64.unpack_from(buf, _SHARED_SEQ_OFFSET)
+                if before == after:
+                    return value
+            if attempt & 63 == 63:
+                time.sleep(0)
+        raise TimeoutError("Shared state writer did not finish an update")
+    
+    @property
+    def version(self) -> int:
+        """Even sequence number, bumped by every update"""
+        (seq,) = _U64.unpack_from(self._buf, _SHARED_SEQ_OFFSET)
+        return seq & ~1
+    
+    def header(self) -> Dict[str, Any]:
+        """Progress, current character, counts and flags without touching the table"""
+        (_, _, flags, retry_count, seq, timestamp, progress, suspects, rooms, evidence,
+         _, length, character) = self._consistent(lambda: _SHARED_HEADER.unpack_from(self._buf, 0))
+        return {
+            'version': seq,
+            'timestamp': timestamp,
+            'progress': progress,
+            'current_character': character[:length].decode('utf-8') or None,
+            'suspects_count': suspects,
+            'rooms_count': rooms,
+            'evidence_count': evidence,
+            'widget_open': bool(flags & _FLAG_WIDGET_OPEN),
+            'is_open': bool(flags & _FLAG_IS_OPEN),
+            'investigation_active': bool(flags & _FLAG_INVESTIGATION_ACTIVE),
+            'retry_count': retry_count
+        }
+    
+    @property
+    def progress(self) -> int:
+        return self._consistent(lambda: _I32.unpack_from(self._buf, 24)[0])
+    
+    def read(self) -> Dict[str, Any]:
+        """Full state in save_state's dict shape, from one consistent copy"""
+        def copy():
+            header = _SHARED_HEADER.unpack_from(self._buf, 0)
+            used = header[10]
+            return header, bytes(self._buf[_SHARED_TABLE_OFFSET:_SHARED_TABLE_OFFSET + used])
+        header, table = self._consistent(copy)
+        (_, _, flags, retry_count, _, timestamp, progress, _, _, _, _, length, character) = header
+        items = {JournalOp.SUSPECT: [], JournalOp.ROOM: [], JournalOp.EVIDENCE: []}
+        offset = 0
+        while offset < len(table):
+            op, size = _SHARED_RECORD.unpack_from(table, offset)
+            offset += _SHARED_RECORD.size
+            items[op].append(table[offset:offset + size].decode('utf-8'))
+            offset += size
+        character = character[:length].decode('utf-8') or None
+        return {
+            'investigation_state': {
+                'progress': progress,
+                'suspects_interviewed': items[JournalOp.SUSPECT],
+                'rooms_investigated': items[JournalOp.ROOM],
+                'evidence_collected': items[JournalOp.EVIDENCE],
+                'current_character': character,
+                'widget_open': bool(flags & _FLAG_WIDGET_OPEN)
+            },
+            'widget_state': {
+                'is_open': bool(flags & _FLAG_IS_OPEN),
+                'current_character': character,
+                'investigation_active': bool(flags & _FLAG_INVESTIGATION_ACTIVE),
+                'retry_count': retry_count
+            },
+            'timestamp': timestamp
+        }
+    
+    def close(self) -> None:
+        """Detach; the writer also removes the shared memory segment"""
+        if self._mmap is not None:
+            self._buf.release()
+            self._mmap.close()
+            self._mmap = None
+        elif self._shm is not None:
+            self._buf = None
+            self._shm.close()
+            if self.writer:
+                try:
+                    self._shm.unlink()
+                except FileNotFoundError:
+                    pass
+            self._shm = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
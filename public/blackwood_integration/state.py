@@ -0,0 +1,183 @@
+"""Investigation state: progress and the ordered sets of suspects, rooms and evidence"""
+
+import itertools
+from typing import Optional, Dict, Any
+
+class OrderedSet:
+    """Insertion-ordered set with O(1) membership and dedupe, backed by dict keys"""
+    
+    __slots__ = ('_items',)
+    
+    def __init__(self, items=()):
+        self._items = dict.fromkeys(items)
+    
+    def add(self, item) -> bool:
+        """Add item, returns False if it was already present"""
+        if item in self._items:
+            return False
+        self._items[item] = None
+        return True
+    
+    # List-style alias for callers written against the old list fields
+    append = add
+    
+    def discard(self, item) -> bool:
+        return self._items.pop(item, False) is None
+    
+    def copy(self) -> "OrderedSet":
+        return OrderedSet(self._items)
+    
+    def __contains__(self, item) -> bool:
+        return item in self._items
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, OrderedSet):
+            return list(self._items) == list(other._items)
+        if isinstance(other, list):
+            return list(self._items) == other
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"OrderedSet({list(self._items)!r})"
+
+def _item_hash(item, blake2b) -> int:
+    """Stable 64-bit hash (unlike hash(), the same in every process)"""
+    return int.from_bytes(blake2b(str(item).encode('utf-8'), digest_size=8).digest(), 'big')
+
+class FingerprintedSet(OrderedSet):
+    """OrderedSet with an order-independent digest of its items.
+    
+    The digest is the XOR of each item's 64-bit hash. Items are folded in
+    lazily from the insertion-ordered tail when the digest is read, so
+    add() costs nothing extra and a read after k adds costs O(k). A discard
+    starts the digest over.
+    """
+    
+    __slots__ = ('_digest', '_folded')
+    
+    def __init__(self, items=()):
+        super().__init__(items)
+        self._digest = 0
+        self._folded = 0
+    
+    def discard(self, item) -> bool:
+        if not super().discard(item):
+            return False
+        self._digest = 0
+        self._folded = 0
+        return True
+    
+    def copy(self) -> "FingerprintedSet":
+        return FingerprintedSet(self._items)
+    
+    @property
+    def digest(self) -> int:
+        pending = len(self._items) - self._folded
+        if pending:
+            # Imported here: only the response cache reads digests, keep hashlib off the core import
+            from hashlib import blake2b
+            digest = self._digest
+            for item in itertools.islice(reversed(self._items), pending):
+                digest ^= _item_hash(item, blake2b)
+            self._digest = digest
+            self._folded += pending
+        return self._digest
+
+class InvestigationState:
+    """Tracks investigation progress.
+    
+    Suspects, rooms and evidence are insertion-ordered sets, so membership
+    checks and dedupe are O(1) and progress is updated in O(1) per event.
+    """
+    
+    __slots__ = ('progress', 'current_character', 'widget_open',
+                 '_suspects', '_rooms', '_evidence')
+    
+    SUSPECT_WEIGHT = 15
+    ROOM_WEIGHT = 10
+    EVIDENCE_WEIGHT = 5
+    MAX_PROGRESS = 100
+    
+    def __init__(self, progress: int = 0, suspects_interviewed=None, rooms_investigated=None,
+                 evidence_collected=None, current_character: Optional[str] = None,
+                 widget_open: bool = False):
+        self.progress = progress
+        self.suspects_interviewed = suspects_interviewed or ()
+        self.rooms_investigated = rooms_investigated or ()
+        self.evidence_collected = evidence_collected or ()
+        self.current_character = current_character
+        self.widget_open = widget_open
+    
+    @property
+    def suspects_interviewed(self) -> OrderedSet:
+        return self._suspects
+    
+    @suspects_interviewed.setter
+    def suspects_interviewed(self, items) -> None:
+        self._suspects = OrderedSet(items)
+    
+    @property
+    def rooms_investigated(self) -> OrderedSet:
+        return self._rooms
+    
+    @rooms_investigated.setter
+    def rooms_investigated(self, items) -> None:
+        self._rooms = OrderedSet(items)
+    
+    @property
+    def evidence_collected(self) -> OrderedSet:
+        return self._evidence
+    
+    @evidence_collected.setter
+    def evidence_collected(self, items) -> None:
+        self._evidence = FingerprintedSet(items)
+    
+    @property
+    def fingerprint(self) -> str:
+        """Progress plus a digest of the evidence; reading it only hashes items added since the last read"""
+        return f"{self.progress}:{self._evidence.digest:016x}"
+    
+    def computed_progress(self) -> int:
+        """Progress implied by the collected items, capped at MAX_PROGRESS"""
+        score = (len(self._suspects) * self.SUSPECT_WEIGHT +
+                 len(self._rooms) * self.ROOM_WEIGHT +
+                 len(self._evidence) * self.EVIDENCE_WEIGHT)
+        return min(score, self.MAX_PROGRESS)
+    
+    def _add(self, items: OrderedSet, item: str, weight: int) -> bool:
+        if not items.add(item):
+            return False
+        if self.progress < self.MAX_PROGRESS:
+            self.progress = min(self.progress + weight, self.MAX_PROGRESS)
+        return True
+    
+    def add_suspect(self, character_id: str) -> bool:
+        return self._add(self._suspects, character_id, self.SUSPECT_WEIGHT)
+    
+    def add_room(self, room_id: str) -> bool:
+        return self._add(self._rooms, room_id, self.ROOM_WEIGHT)
+    
+    def add_evidence(self, evidence: str) -> bool:
+        return self._add(self._evidence, evidence, self.EVIDENCE_WEIGHT)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-list form used by get_investigation_summary and save_state"""
+        return {
+            'progress': self.progress,
+            'suspects_interviewed': list(self._suspects),
+            'rooms_investigated': list(self._rooms),
+            'evidence_collected': list(self._evidence),
+            'widget_open': self.widget_open,
+            'current_character': self.current_character
+        }
+    
+    def __repr__(self) -> str:
+        return (f"InvestigationState(progress={self.progress}, "
+                f"suspects={len(self._suspects)}, rooms={len(self._rooms)}, "
+                f"evidence={len(self._evidence)}, current_character={self.current_character!r})")
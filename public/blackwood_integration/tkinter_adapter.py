@@ -0,0 +1,88 @@
+"""Example integration for Tkinter games (requires tkinter)"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from .config import WidgetConfig
+from .events import EventBus
+from .widget import BlackwoodWidget
+
+class TkinterGame:
+    """Example integration for Tkinter games"""
+    
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Detective Game")
+        self.widget = BlackwoodWidget(WidgetConfig(non_blocking=True, coalesce_events=True))
+        
+        self.setup_ui()
+        self.widget.events.subscribe(EventBus.INVESTIGATION_PROGRESS, self.update_progress)
+        self._pump_callbacks()
+    
+    def _pump_callbacks(self):
+        """Drain widget callbacks on the Tk thread, then reschedule"""
+        self.widget.process_callbacks()
+        self.root.after(16, self._pump_callbacks)
+    
+    def setup_ui(self):
+        """Set up the user interface"""
+        # Main frame
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        # Title
+        title_label = ttk.Label(main_frame, text="Blackwood Manor Investigation", 
+                              font=('Arial', 16, 'bold'))
+        title_label.grid(row=0, column=0, columnspan=2, pady=(0, 20))
+        
+        # Buttons
+        ttk.Button(main_frame, text="Show Widget", 
+                  command=self.show_widget).grid(row=1, column=0, padx=5, pady=5)
+        
+        ttk.Button(main_frame, text="Investigate Study", 
+                  command=lambda: self.start_investigation('study')).grid(row=1, column=1, padx=5, pady=5)
+        
+        ttk.Button(main_frame, text="Investigate Office", 
+                  command=lambda: self.start_investigation('office')).grid(row=2, column=0, padx=5, pady=5)
+        
+        ttk.Button(main_frame, text="Investigate Library", 
+                  command=lambda: self.start_investigation('library')).grid(row=2, column=1, padx=5, pady=5)
+        
+        # Status label
+        self.status_label = ttk.Label(main_frame, text="Ready to investigate")
+        self.status_label.grid(row=3, column=0, columnspan=2, pady=10)
+        
+        # Progress bar
+        self.progress_var = tk.DoubleVar()
+        self.progress_bar = ttk.Progressbar(main_frame, variable=self.progress_var, 
+                                          maximum=100)
+        self.progress_bar.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+    
+    def show_widget(self):
+        self.status_label.config(text="Opening widget...")
+        self.widget.call_when_done(self.widget.show_widget(), self._on_widget_shown)
+    
+    def _on_widget_shown(self, success):
+        if success:
+            self.status_label.config(text="Widget opened successfully")
+        else:
+            messagebox.showerror("Error", "Failed to open widget")
+    
+    def start_investigation(self, room_id):
+        future = self.widget.start_room_investigation(room_id)
+        self.widget.call_when_done(
+            future, lambda success: self._on_investigation_started(room_id, success))
+    
+    def _on_investigation_started(self, room_id, success):
+        if success:
+            self.status_label.config(text=f"Investigating {room_id}")
+        else:
+            messagebox.showerror("Error", f"Failed to investigate {room_id}")
+    
+    def update_progress(self, progress: int):
+        """Progress listener; coalesced, so called at most once per pump"""
+        self.progress_var.set(progress)
+        self.status_label.config(text=f"Investigation progress: {progress}%")
+    
+    def run(self):
+        self.root.mainloop()
@@ -0,0 +1,200 @@
+"""Embedded webview host: one long-lived widget window in a helper process"""
+
+import threading
+import json
+import urllib.parse
+import os
+import sys
+import logging
+from typing import Optional, Dict, List, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# The helper runs ``python -m blackwood_integration --webview-host`` from here
+_PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Embedded webview host: one long-lived window in a helper process, driven over a pipe
+class WebviewHost:
+    """Keeps a single widget window alive across show_widget calls.
+    
+    The window runs in a helper process (``python -m blackwood_integration
+    --webview-host``, which needs pywebview) so its GUI loop never competes
+    with the game's. Commands and events are JSON lines over the helper's
+    stdin/stdout. Navigating to another suspect is one message; the page
+    swaps state in place when it exposes window.blackwoodHostNavigate and
+    otherwise replaces its URL inside the same view.
+    """
+    
+    def __init__(self, title: str = "Blackwood Manor", width: int = 400, height: int = 600,
+                 command: Optional[List[str]] = None, start_timeout: float = 15.0):
+        self.title = title
+        self.width = width
+        self.height = height
+        self.command = command or [sys.executable, '-m', __package__, '--webview-host']
+        self.start_timeout = start_timeout
+        self.on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._process = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        
+        # Set when the helper cannot start (e.g. pywebview missing); navigate() then fails fast
+        self.unavailable = False
+    
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+    
+    def _start(self, url: str) -> bool:
+        import subprocess
+        
+        self._ready.clear()
+        try:
+            self._process = subprocess.Popen(
+                self.command + ['--title', self.title, '--width', str(self.width),
+                                '--height', str(self.height), '--url', url],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                text=True, encoding='utf-8', bufsize=1, cwd=_PACKAGE_PARENT
+            )
+        except OSError as e:
+            logger.error("Could not start webview host: %s", e)
+            self._process = None
+            self.unavailable = True
+            return False
+        threading.Thread(target=self._read_events, args=(self._process,),
+                         name="blackwood-webview", daemon=True).start()
+        if not self._ready.wait(self.start_timeout) or not self.alive:
+            logger.error("Webview host did not become ready")
+            self.close()
+            self.unavailable = True
+            return False
+        return True
+    
+    def _read_events(self, process) -> None:
+        for line in process.stdout:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get('event') == 'ready':
+                self._ready.set()
+            elif event.get('event') == 'error':
+                logger.error("Webview host error: %s", event.get('error'))
+            if self.on_event:
+                try:
+                    self.on_event(event)
+                except Exception as e:
+                    logger.error("Webview event callback error: %s", e)
+        # Helper exited: reap it so alive is accurate before waking _start
+        process.wait()
+        self._ready.set()
+    
+    def _send(self, message: Dict[str, Any]) -> bool:
+        try:
+            self._process.stdin.write(json.dumps(message) + '\n')
+            self._process.stdin.flush()
+            return True
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error("Webview host unreachable: %s", e)
+            return False
+    
+    def navigate(self, url: str, state: Optional[Dict[str, Any]] = None) -> bool:
+        """Show url in the host window, starting the helper on first use"""
+        with self._lock:
+            if self.unavailable:
+                return False
+            if not self.alive:
+                return self._start(url)
+            if state is None:
+                state = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+            return self._send({'op': 'navigate', 'url': url, 'state': state})
+    
+    def show(self) -> bool:
+        with self._lock:
+            return self.alive and self._send({'op': 'show'})
+    
+    def hide(self) -> bool:
+        with self._lock:
+            return self.alive and self._send({'op': 'hide'})
+    
+    def close(self, timeout: float = 5.0) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            try:
+                process.stdin.write(json.dumps({'op': 'quit'}) + '\n')
+                process.stdin.flush()
+                process.wait(timeout)
+            except Exception:
+                process.kill()
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+# Runs inside the page: swap state in place if the widget supports it, else reload this view
+_HOST_NAVIGATE_JS = """
+(function (url, state) {
+  if (typeof window.blackwoodHostNavigate === 'function') {
+    history.replaceState(null, '', url);
+    window.blackwoodHostNavigate(state);
+  } else if (location.href !== url) {
+    location.replace(url);
+  }
+})(%s, %s);
+"""
+
+def _pixels(value: str, default: int) -> int:
+    """'400px' -> 400"""
+    try:
+        return int(str(value).strip().rstrip('px'))
+    except ValueError:
+        return default
+
+def run_webview_host(argv: List[str]) -> int:
+    """Helper process entry point for WebviewHost"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='blackwood-webview-host')
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--title', default='Blackwood Manor')
+    parser.add_argument('--width', type=int, default=400)
+    parser.add_argument('--height', type=int, default=600)
+    args = parser.parse_args(argv)
+    
+    def emit(event: Dict[str, Any]) -> None:
+        sys.stdout.write(json.dumps(event) + '\n')
+        sys.stdout.flush()
+    
+    try:
+        import webview
+    except ImportError:
+        emit({'event': 'error', 'error': 'pywebview is not installed'})
+        return 2
+    
+    window = webview.create_window(args.title, args.url, width=args.width, height=args.height)
+    
+    def serve():
+        emit({'event': 'ready'})
+        for line in sys.stdin:
+            try:
+                message = json.loads(line)
+                op = message.get('op')
+                if op == 'navigate':
+                    window.evaluate_js(_HOST_NAVIGATE_JS % (json.dumps(message['url']),
+                                                            json.dumps(message.get('state', {}))))
+                    window.show()
+                elif op == 'show':
+                    window.show()
+                elif op == 'hide':
+                    window.hide()
+                elif op == 'quit':
+                    break
+            except Exception as e:
+                emit({'event': 'error', 'error': str(e)})
+        window.destroy()
+    
+    window.events.closed += lambda: emit({'event': 'closed'})
+    webview.start(serve)
+    return 0
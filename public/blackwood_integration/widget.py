@@ -0,0 +1,765 @@
+"""BlackwoodWidget: the browser/webview widget and its investigation state"""
+
+import threading
+import time
+import urllib.parse
+import os
+import sys
+import logging
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Callable, Union, Iterable, Tuple
+
+from .config import CHARACTER_NAMES, ROOM_CHARACTERS, WidgetConfig, WidgetHost
+from .state import InvestigationState
+from .events import CallbackQueue, EventBus
+from .metrics import DEFAULT_METRICS
+from .persistence import JournalOp, StatePersistence, _I32
+from .resilience import CircuitOpenError, DEFAULT_RESILIENCE, RetryPolicy
+
+# Loaded on first use: only needed for enable_shared_state / enable_evidence_validation
+# / WidgetHost.WEBVIEW
+if TYPE_CHECKING:
+    from .chat import BlackwoodChatClient
+    from .knowledge import KnowledgeIndex
+    from .prefetch import Prefetcher
+    from .shared_state import SharedStateStore
+    from .webview import WebviewHost
+
+logger = logging.getLogger(__name__)
+
+class WidgetUrlBuilder:
+    """Widget URLs compiled once per config.
+    
+    Theme, position, width and height never change after WidgetConfig is
+    created, so the query prefix is encoded up front (one variant per
+    interrogation flag) along with a '&character=...' fragment for every
+    known character and room. A URL is then one join of cached fragments
+    and three integers. Output matches urlencode over the same parameters.
+    """
+    
+    __slots__ = ('widget_url', '_prefixes', '_characters', '_rooms')
+    
+    def __init__(self, widget_url: str, theme: str, position: str, width: str, height: str,
+                 character_names: Dict[str, str] = CHARACTER_NAMES,
+                 room_characters: Dict[str, str] = ROOM_CHARACTERS):
+        self.widget_url = widget_url
+        self._prefixes = {
+            interrogation: sys.intern(f"{widget_url}?" + urllib.parse.urlencode({
+                'embed': 'true',
+                'theme': theme,
+                'position': position,
+                'interrogation': str(interrogation).lower(),
+                'width': width,
+                'height': height
+            }))
+            for interrogation in (False, True)
+        }
+        self._characters = {
+            character_id: sys.intern('&' + urllib.parse.urlencode({'character': character_id}))
+            for character_id in character_names
+        }
+        self._rooms = {
+            room_id: self._characters.get(character_id) or
+            '&' + urllib.parse.urlencode({'character': character_id})
+            for room_id, character_id in room_characters.items()
+        }
+    
+    @classmethod
+    def for_config(cls, config: WidgetConfig, widget_url: Optional[str] = None) -> 'WidgetUrlBuilder':
+        """Shared builder for config's current theme/position/size"""
+        return _url_builder(widget_url or f"{config.api_url}/widget-demo", config.theme.value,
+                            config.position.value, config.width, config.height)
+    
+    def _character(self, character_id: str) -> str:
+        fragment = self._characters.get(character_id)
+        if fragment is None:
+            fragment = '&' + urllib.parse.urlencode({'character': character_id})
+        return fragment
+    
+    def build(self, character_id: Optional[str] = None, progress: int = 0,
+              evidence_count: int = 0, suspects_count: int = 0,
+              interrogation: bool = False) -> str:
+        return ''.join((
+            self._prefixes[bool(interrogation)],
+            self._character(character_id) if character_id else '',
+            '&progress=', str(progress),
+            '&evidence_count=', str(evidence_count),
+            '&suspects_count=', str(suspects_count)
+        ))
+    
+    def for_room(self, room_id: str, progress: int = 0, evidence_count: int = 0,
+                 suspects_count: int = 0, interrogation: bool = False) -> str:
+        """URL for the character found in room_id; KeyError for unknown rooms"""
+        return ''.join((
+            self._prefixes[bool(interrogation)],
+            self._rooms[room_id],
+            '&progress=', str(progress),
+            '&evidence_count=', str(evidence_count),
+            '&suspects_count=', str(suspects_count)
+        ))
+    
+    def for_state(self, character_id: Optional[str], state: Optional[InvestigationState],
+                  interrogation: bool = False) -> str:
+        if state is None:
+            return self.build(character_id, interrogation=interrogation)
+        return self.build(character_id, state.progress, len(state.evidence_collected),
+                          len(state.suspects_interviewed), interrogation)
+    
+    def build_many(self, items: Iterable[Tuple[Optional[str], Optional[InvestigationState]]],
+                   interrogation: bool = False) -> List[str]:
+        """Deep links for many (character_id, state) pairs, e.g. a whole event's players"""
+        prefix = self._prefixes[bool(interrogation)]
+        character = self._character
+        urls = []
+        append = urls.append
+        for character_id, state in items:
+            head = prefix + character(character_id) if character_id else prefix
+            if state is None:
+                append(head + '&progress=0&evidence_count=0&suspects_count=0')
+            else:
+                append(f"{head}&progress={state.progress}"
+                       f"&evidence_count={len(state.evidence_collected)}"
+                       f"&suspects_count={len(state.suspects_interviewed)}")
+        return urls
+
+@functools.lru_cache(maxsize=32)
+def _url_builder(widget_url: str, theme: str, position: str, width: str, height: str) -> WidgetUrlBuilder:
+    return WidgetUrlBuilder(widget_url, theme, position, width, height)
+
+WidgetResult = Union[bool, "Future[bool]"]
+
+class BlackwoodWidget:
+    """Main widget integration class with comprehensive error handling"""
+    
+    def __init__(self, config: WidgetConfig = None, game_window=None):
+        self.config = config or WidgetConfig()
+        self.game_window = game_window
+        self.widget_url = f"{self.config.api_url}/widget-demo"
+        self.is_open = False
+        self.current_character = None
+        self.investigation_active = False
+        self.retry_count = 0
+        self.widget_window = None
+        
+        # Shared, read-only lookup tables
+        self.character_names = CHARACTER_NAMES
+        self.room_characters = ROOM_CHARACTERS
+        
+        # Investigation state
+        self.investigation_state = InvestigationState()
+        
+        # Event callbacks
+        self.on_character_selected = None
+        self.on_message_sent = None
+        self.on_evidence_found = None
+        self.on_investigation_progress = None
+        
+        # Non-blocking mode: one worker thread for launches and back-off,
+        # callbacks handed back to the caller's thread via callback_queue
+        self.callback_queue = CallbackQueue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._state_lock = threading.RLock()
+        
+        # Optional journaled persistence (see enable_journal)
+        self.persistence: Optional[StatePersistence] = None
+        
+        # Optional cross-process view of the state (see enable_shared_state)
+        self.shared_state: Optional["SharedStateStore"] = None
+        
+        # Optional timeline index that rejects unknown evidence (see enable_evidence_validation)
+        self.knowledge: Optional["KnowledgeIndex"] = None
+        
+        # Optional warm-up of a chat client's reply cache (see enable_prefetch)
+        self.prefetcher: Optional["Prefetcher"] = None
+        
+        # Latency histograms and counters
+        self.metrics = DEFAULT_METRICS
+        
+        # Subscribers beyond the single on_* attributes; those stay wired
+        # in as listeners so existing integrations keep working
+        self.events = EventBus(coalesce=self.config.coalesce_events, dispatch=self._emit)
+        self.events.subscribe(EventBus.CHARACTER_SELECTED,
+                              functools.partial(self._call_attribute, 'on_character_selected'))
+        self.events.subscribe(EventBus.EVIDENCE_FOUND,
+                              functools.partial(self._call_attribute, 'on_evidence_found'))
+        self.events.subscribe(EventBus.EVIDENCE_BATCH, self._evidence_batch_to_attribute)
+        self.events.subscribe(EventBus.INVESTIGATION_PROGRESS,
+                              functools.partial(self._call_attribute, 'on_investigation_progress'))
+        
+        # Single reused window when config.host is WidgetHost.WEBVIEW
+        self.webview_host: Optional["WebviewHost"] = None
+        
+        # Launch retries share the process-wide breakers and retry budget
+        self.resilience = DEFAULT_RESILIENCE
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        
+        logger.info("Blackwood Widget initialized")
+    
+    @property
+    def url_builder(self) -> WidgetUrlBuilder:
+        """Builder for the current config; rebuilt only if theme/position/size change"""
+        return WidgetUrlBuilder.for_config(self.config, self.widget_url)
+    
+    def enable_journal(self, filename: str = "investigation_state.json",
+                       compact_after: int = 500, fsync: bool = False) -> StatePersistence:
+        """Journal every state change to filename.journal and compact in the background"""
+        if self.persistence is not None:
+            self.persistence.close()
+        self.persistence = StatePersistence(filename, compact_after, fsync)
+        return self.persistence
+    
+    def enable_shared_state(self, name: str = "blackwood-investigation",
+                            capacity: int = 1 << 20,
+                            path: Optional[str] = None) -> Optional["SharedStateStore"]:
+        """Publish every state change to shared memory for other processes to read.
+        
+        Readers use ``SharedStateStore.attach(name)`` (or ``path``) and poll
+        ``header()`` or ``version`` instead of re-reading the save file.
+        """
+        from .shared_state import SharedStateStore
+        
+        try:
+            store = SharedStateStore(name, create=True, capacity=capacity, path=path)
+        except (OSError, ValueError) as e:
+            logger.error("Shared state unavailable: %s", e)
+            return None
+        with self._state_lock:
+            if self.shared_state is not None:
+                self.shared_state.close()
+            store.write(self._state_data())
+            self.shared_state = store
+        return store
+    
+    def enable_evidence_validation(self, index: Optional["KnowledgeIndex"] = None) -> "KnowledgeIndex":
+        """Only accept evidence and secrets that appear in the investigation timeline.
+        
+        Checks run against a local index of public/data/timeline.json, so
+        add_evidence stays a dict lookup with no server round trip.
+        """
+        if index is None:
+            from .knowledge import default_knowledge
+            index = default_knowledge()
+        self.knowledge = index
+        return index
+    
+    def enable_prefetch(self, client: "BlackwoodChatClient", budget: int = 25) -> "Prefetcher":
+        """Prefetch a suspect's likely replies into client's cache on room entry and selection.
+        
+        Only useful when the game also chats through client (the widget page
+        talks to the server itself); client must have a ResponseCache.
+        """
+        from .prefetch import Prefetcher
+        
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+        self.prefetcher = Prefetcher(client, budget=budget)
+        return self.prefetcher
+    
+    def _journal(self, op: JournalOp, payload: bytes = b'') -> None:
+        """Record a delta; schedules background compaction when the journal grows"""
+        if self.shared_state is not None:
+            self.shared_state.apply(op, payload)
+        if self.persistence is None:
+            return
+        try:
+            if self.persistence.append(op, payload):
+                # Capture and rotate together so no delta lands in between and is lost
+                with self._state_lock:
+                    self.persistence.compact(self._state_data())
+        except Exception as e:
+            logger.error("Journal error: %s", e)
+    
+    def _emit(self, callback: Optional[Callable], *args) -> None:
+        """Invoke a user callback, deferring it to the caller's thread in non-blocking mode"""
+        if callback is None:
+            return
+        if self.config.non_blocking:
+            self.callback_queue.put(callback, *args)
+        else:
+            callback(*args)
+    
+    def _call_attribute(self, name: str, *args) -> None:
+        callback = getattr(self, name)
+        if callback is not None:
+            callback(*args)
+    
+    def _evidence_batch_to_attribute(self, items: Tuple[str, ...]) -> None:
+        """on_evidence_found predates batches, so it still sees one item per call"""
+        callback = self.on_evidence_found
+        if callback is not None:
+            for evidence in items:
+                callback(evidence)
+    
+    def _submit(self, fn: Callable[..., bool], *args) -> "Future[bool]":
+        """Run fn on the widget worker thread and return its Future"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix="blackwood-widget")
+        return self._executor.submit(fn, *args)
+    
+    def process_callbacks(self, max_items: Optional[int] = None) -> int:
+        """Deliver queued callbacks on the calling thread; call once per frame"""
+        self.events.flush()
+        return self.callback_queue.drain(max_items)
+    
+    def call_when_done(self, future: "Future[bool]", callback: Callable[[bool], None]) -> None:
+        """Deliver a Future's result to callback on the thread that drains callback_queue"""
+        def _enqueue(done: "Future[bool]"):
+            try:
+                result = done.result()
+            except Exception as e:
+                logger.error("Background widget task failed: %s", e)
+                result = False
+            self.callback_queue.put(callback, result)
+        future.add_done_callback(_enqueue)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the background worker and close the webview host, shared state and prefetcher, if any"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        if self.webview_host is not None:
+            self.webview_host.close()
+        if self.shared_state is not None:
+            self.shared_state.close()
+            self.shared_state = None
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+            self.prefetcher = None
+    
+    def _try_open_url(self, url: str) -> bool:
+        """Single browser launch attempt, trying each webbrowser method in turn"""
+        with self.metrics.timer('widget_browser_launch_seconds'):
+            return self._launch_browser(url)
+    
+    def _launch_browser(self, url: str) -> bool:
+        if self.config.host is WidgetHost.WEBVIEW:
+            if self.webview_host is None:
+                from .webview import WebviewHost, _pixels
+                self.webview_host = WebviewHost(width=_pixels(self.config.width, 400),
+                                                height=_pixels(self.config.height, 600))
+            if self.webview_host.navigate(url):
+                return True
+            logger.warning("Webview host unavailable, falling back to the system browser")
+        import webbrowser
+        try:
+            # Try different browser opening methods
+            try:
+                # Primary method
+                webbrowser.open(url)
+                success = True
+            except Exception as e1:
+                logger.warning("Primary browser method failed: %s", e1)
+                try:
+                    # Fallback method
+                    webbrowser.open_new(url)
+                    success = True
+                except Exception as e2:
+                    logger.warning("Fallback browser method failed: %s", e2)
+                    try:
+                        # Last resort
+                        webbrowser.open_new_tab(url)
+                        success = True
+                    except Exception as e3:
+                        logger.error("All browser methods failed: %s", e3)
+                        success = False
+            
+            if not success:
+                raise Exception("All browser opening methods failed")
+            return True
+        except Exception as e:
+            logger.error("Error opening widget: %s", e)
+            return False
+    
+    def _safe_open_url(self, url: str, retry: bool = True) -> bool:
+        """Safely open URL with error handling and retry logic.
+        
+        Retries use jittered exponential back-off through self.resilience and
+        are skipped while the backend's health circuit is open. Back-off
+        sleeps happen on the calling thread, which in non-blocking mode is
+        the widget worker rather than the game loop.
+        """
+        logger.info("Opening widget URL: %s", url)
+        
+        # Check if we're in a headless environment
+        if os.environ.get('DISPLAY') is None and sys.platform.startswith('linux'):
+            logger.warning("No display available, cannot open browser")
+            return False
+        
+        attempts = 0
+        def attempt() -> bool:
+            nonlocal attempts
+            self.retry_count = attempts
+            attempts += 1
+            return self._try_open_url(url)
+        
+        policy = self.retry_policy if retry else RetryPolicy(max_retries=0)
+        try:
+            opened = self.resilience.call(self.widget_url, attempt, policy,
+                                          failed=lambda ok: not ok,
+                                          base_url=self.config.api_url, metric='widget_launch')
+        except CircuitOpenError as e:
+            logger.warning("Not opening widget: %s", e)
+            opened = False
+        
+        if opened:
+            self.is_open = True
+            self.retry_count = 0
+            logger.info("Widget opened successfully")
+            return True
+        logger.error("Max retries exceeded")
+        self.metrics.increment('widget_launch_failures_total')
+        return False
+    
+    def show_widget(self, character_id: str = None, room_id: str = None, 
+                   interrogation: bool = False, force_new: bool = False) -> WidgetResult:
+        """Show detective widget with comprehensive error handling.
+        
+        Returns a bool, or a Future[bool] right away when config.non_blocking is set.
+        """
+        if self.config.non_blocking:
+            return self._submit(self._show_widget, character_id, room_id,
+                                interrogation, force_new)
+        return self._show_widget(character_id, room_id, interrogation, force_new)
+    
+    def _show_widget(self, character_id: str = None, room_id: str = None,
+                     interrogation: bool = False, force_new: bool = False) -> bool:
+        try:
+            logger.info("Showing widget - Character: %s, Room: %s", character_id, room_id)
+            build_start = time.perf_counter()
+            
+            # Handle character selection
+            if character_id and character_id not in self.character_names:
+                logger.error("Unknown character: %s", character_id)
+                return False
+            
+            # Handle room-based character selection
+            if room_id:
+                if room_id in self.room_characters:
+                    character_id = self.room_characters[room_id]
+                else:
+                    logger.error("No character found for room: %s", room_id)
+                    return False
+            
+            # Runs on the executor in non-blocking mode: select and read the
+            # state under the lock the game thread's updates take
+            with self._state_lock:
+                if character_id:
+                    self.current_character = character_id
+                    self.investigation_state.current_character = character_id
+                
+                # Build final URL with game context
+                url = self.url_builder.for_state(character_id, self.investigation_state, interrogation)
+            self.metrics.observe('widget_url_build_seconds', time.perf_counter() - build_start)
+            
+            # Open widget
+            success = self._safe_open_url(url)
+            
+            if success:
+                with self._state_lock:
+                    self.investigation_active = True
+                    self.investigation_state.widget_open = True
+                    self._journal(JournalOp.CHARACTER, (self.current_character or '').encode('utf-8'))
+                    self._journal(JournalOp.WIDGET_OPEN, b'\x01')
+                
+                # Trigger callback
+                if self.current_character:
+                    self.events.publish(EventBus.CHARACTER_SELECTED, self.current_character)
+                
+                character_name = self.character_names.get(self.current_character, "Unknown")
+                logger.info("Widget opened successfully - Interviewing %s", character_name)
+                return True
+            else:
+                return False
+                
+        except Exception as e:
+            logger.error("Widget error: %s", e)
+            return False
+    
+    def hide_widget(self) -> bool:
+        """Hide widget (the webview host window is hidden; a system browser cannot be closed)"""
+        try:
+            with self._state_lock:
+                self.is_open = False
+                self.investigation_active = False
+                self.investigation_state.widget_open = False
+                self._journal(JournalOp.WIDGET_OPEN, b'\x00')
+            if self.webview_host is not None:
+                self.webview_host.hide()
+            logger.info("Widget hidden")
+            return True
+        except Exception as e:
+            logger.error("Error hiding widget: %s", e)
+            return False
+    
+    def start_room_investigation(self, room_id: str, interrogation: bool = True) -> WidgetResult:
+        """Start investigation when entering a room"""
+        if self.config.non_blocking:
+            return self._submit(self._start_room_investigation, room_id, interrogation)
+        return self._start_room_investigation(room_id, interrogation)
+    
+    def _start_room_investigation(self, room_id: str, interrogation: bool = True) -> bool:
+        try:
+            logger.info("Starting room investigation: %s", room_id)
+            
+            if room_id not in self.room_characters:
+                logger.error("Unknown room: %s", room_id)
+                return False
+            
+            # Check if already investigated
+            if room_id in self.investigation_state.rooms_investigated:
+                logger.info("Room %s already investigated", room_id)
+                return False
+            
+            character_id = self.room_characters[room_id]
+            character_name = self.character_names.get(character_id, "Unknown")
+            
+            # Show widget
+            success = self._show_widget(character_id=character_id, interrogation=interrogation)
+            
+            if success:
+                with self._state_lock:
+                    # Mark room as investigated and update progress
+                    old_progress = self.investigation_state.progress
+                    if self.investigation_state.add_room(room_id):
+                        self._journal(JournalOp.ROOM, room_id.encode('utf-8'))
+                    self._notify_progress(old_progress)
+                    if self.prefetcher is not None:
+                        self.prefetcher.on_room_enter(room_id, self.investigation_state)
+                
+                logger.info("Room investigation started: %s", room_id)
+                return True
+            else:
+                return False
+                
+        except Exception as e:
+            logger.error("Room investigation error: %s", e)
+            return False
+    
+    def select_suspect(self, character_id: str, interrogation: bool = True) -> WidgetResult:
+        """Select specific suspect to interview"""
+        if self.config.non_blocking:
+            return self._submit(self._select_suspect, character_id, interrogation)
+        return self._select_suspect(character_id, interrogation)
+    
+    def _select_suspect(self, character_id: str, interrogation: bool = True) -> bool:
+        try:
+            logger.info("Selecting suspect: %s", character_id)
+            
+            if character_id not in self.character_names:
+                logger.error("Unknown suspect: %s", character_id)
+                return False
+            
+            # Check if already interviewed
+            if character_id in self.investigation_state.suspects_interviewed:
+                logger.info("Suspect %s already interviewed", character_id)
+                return False
+            
+            character_name = self.character_names.get(character_id, "Unknown")
+            
+            # Show widget
+            success = self._show_widget(character_id=character_id, interrogation=interrogation)
+            
+            if success:
+                with self._state_lock:
+                    # Mark suspect as interviewed and update progress
+                    old_progress = self.investigation_state.progress
+                    if self.investigation_state.add_suspect(character_id):
+                        self._journal(JournalOp.SUSPECT, character_id.encode('utf-8'))
+                    self._notify_progress(old_progress)
+                    if self.prefetcher is not None:
+                        self.prefetcher.prefetch(character_id, self.investigation_state)
+                
+                logger.info("Suspect selected: %s", character_name)
+                return True
+            else:
+                return False
+                
+        except Exception as e:
+            logger.error("Suspect selection error: %s", e)
+            return False
+    
+    def add_evidence(self, evidence: str) -> bool:
+        """Add evidence to investigation"""
+        try:
+            if self.knowledge is not None and not self.knowledge.is_known(evidence):
+                logger.warning("Unknown evidence rejected: %s", evidence)
+                return False
+            with self._state_lock:
+                old_progress = self.investigation_state.progress
+                if not self.investigation_state.add_evidence(evidence):
+                    return False
+                self._journal(JournalOp.EVIDENCE, evidence.encode('utf-8'))
+                self._notify_progress(old_progress)
+            
+            # Trigger callback
+            self.events.publish(EventBus.EVIDENCE_FOUND, evidence)
+
+            logger.debug("Evidence added: %s", evidence)
+            return True
+        except Exception as e:
+            logger.error("Error adding evidence: %s", e)
+            return False
+    
+    def add_evidence_many(self, items: Iterable[str]) -> int:
+        """Add several pieces of evidence with one progress update and one event.
+
+        Listeners get a single EVIDENCE_BATCH of the new items (duplicates
+        dropped) and at most one INVESTIGATION_PROGRESS; returns how many
+        items were new. With enable_evidence_validation, unknown items are
+        skipped.
+        """
+        try:
+            if self.knowledge is not None:
+                known = self.knowledge.is_known
+                items = [evidence for evidence in items if known(evidence)]
+            with self._state_lock:
+                old_progress = self.investigation_state.progress
+                added = tuple(evidence for evidence in items
+                              if self.investigation_state.add_evidence(evidence))
+                for evidence in added:
+                    self._journal(JournalOp.EVIDENCE, evidence.encode('utf-8'))
+                self._notify_progress(old_progress)
+            
+            if added:
+                self.events.publish(EventBus.EVIDENCE_BATCH, added)
+                logger.debug("Evidence added: %d items", len(added))
+            return len(added)
+        except Exception as e:
+            logger.error("Error adding evidence: %s", e)
+            return 0
+    
+    def _update_investigation_progress(self):
+        """Recompute progress from the collected items (e.g. after direct edits)"""
+        try:
+            old_progress = self.investigation_state.progress
+            self.investigation_state.progress = self.investigation_state.computed_progress()
+            self._notify_progress(old_progress)
+        except Exception as e:
+            logger.error("Progress update error: %s", e)
+    
+    def _notify_progress(self, old_progress: int):
+        """Fire progress callback/completion log if progress moved"""
+        progress = self.investigation_state.progress
+        if progress == old_progress:
+            return
+        
+        self._journal(JournalOp.PROGRESS, _I32.pack(progress))
+        
+        # Trigger callback if progress changed
+        self.events.publish(EventBus.INVESTIGATION_PROGRESS, progress)
+        
+        # Check for completion
+        if progress >= 100:
+            logger.info("Investigation complete!")
+    
+    def get_investigation_summary(self) -> Dict[str, Any]:
+        """Get current investigation summary"""
+        try:
+            with self._state_lock:
+                return self.investigation_state.to_dict()
+        except Exception as e:
+            logger.error("Summary error: %s", e)
+            return {}
+    
+    def reset_investigation(self) -> bool:
+        """Reset all investigation progress"""
+        try:
+            with self._state_lock:
+                self.investigation_state = InvestigationState()
+                self.is_open = False
+                self.investigation_active = False
+                self.current_character = None
+                self.retry_count = 0
+                self._journal(JournalOp.RESET)
+            
+            logger.info("Investigation reset")
+            return True
+        except Exception as e:
+            logger.error("Reset error: %s", e)
+            return False
+    
+    def _state_data(self) -> Dict[str, Any]:
+        """Snapshot of investigation and widget state in the save file shape"""
+        return {
+            'investigation_state': {
+                'progress': self.investigation_state.progress,
+                'suspects_interviewed': list(self.investigation_state.suspects_interviewed),
+                'rooms_investigated': list(self.investigation_state.rooms_investigated),
+                'evidence_collected': list(self.investigation_state.evidence_collected),
+                'current_character': self.investigation_state.current_character,
+                'widget_open': self.investigation_state.widget_open
+            },
+            'widget_state': {
+                'is_open': self.is_open,
+                'current_character': self.current_character,
+                'investigation_active': self.investigation_active,
+                'retry_count': self.retry_count
+            },
+            'timestamp': time.time()
+        }
+    
+    def save_state(self, filename: str = "investigation_state.json") -> bool:
+        """Atomically save investigation state (JSON plus compact .bin snapshot)"""
+        try:
+            if self.persistence is not None and self.persistence.filename == filename:
+                # Also folds the journal into the new snapshot; waits out a background compaction
+                with self._state_lock:
+                    self.persistence.compact(self._state_data(), background=False)
+            else:
+                with self._state_lock:
+                    state_data = self._state_data()
+                StatePersistence.write_snapshot(filename, state_data)
+                # Older deltas for this file would be replayed over the new snapshot on load
+                StatePersistence.drop_journals(filename)
+            
+            logger.info("State saved to %s", filename)
+            return True
+        except Exception as e:
+            logger.error("Save error: %s", e)
+            return False
+    
+    def load_state(self, filename: str = "investigation_state.json") -> bool:
+        """Load investigation state from snapshot plus journal"""
+        try:
+            if not StatePersistence.exists(filename):
+                logger.warning("State file %s not found", filename)
+                return False
+            
+            state_data = StatePersistence.read(filename)
+            
+            # One step under the lock, so a concurrent save never sees a half-restored state
+            with self._state_lock:
+                # Restore investigation state
+                if 'investigation_state' in state_data:
+                    inv_state = state_data['investigation_state']
+                    self.investigation_state.progress = inv_state.get('progress', 0)
+                    self.investigation_state.suspects_interviewed = inv_state.get('suspects_interviewed', [])
+                    self.investigation_state.rooms_investigated = inv_state.get('rooms_investigated', [])
+                    self.investigation_state.evidence_collected = inv_state.get('evidence_collected', [])
+                    self.investigation_state.current_character = inv_state.get('current_character', None)
+                    self.investigation_state.widget_open = inv_state.get('widget_open', False)
+                
+                # Restore widget state
+                if 'widget_state' in state_data:
+                    widget_state = state_data['widget_state']
+                    self.is_open = widget_state.get('is_open', False)
+                    self.current_character = widget_state.get('current_character', None)
+                    self.investigation_active = widget_state.get('investigation_active', False)
+                    self.retry_count = widget_state.get('retry_count', 0)
+                
+                if self.shared_state is not None:
+                    self.shared_state.write(self._state_data())
+            
+            # Check if state is stale (older than 1 hour)
+            timestamp = state_data.get('timestamp', 0)
+            if time.time() - timestamp > 3600:  # 1 hour
+                logger.info("State is stale, resetting")
+                self.reset_investigation()
+            
+            logger.info("State loaded from %s", filename)
+            return True
+        except Exception as e:
+            logger.error("Load error: %s", e)
+            return False